@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Offline throughput benchmark: sequential vs concurrent crawl against the mock FlareSolverr"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from mock_flaresolverr import MockFlareSolverr
+from rate_limiter import HostRateLimiter
+from structured_logging import setup_logging, stop_logging
+import ultimate_football_scraper_render as scraper
+
+
+def run_crawl(api_urls, clubs, workers: int, rate: float, work_dir: str) -> dict:
+    """Crawl `clubs` through a fresh balancer, session pool, rate limiter, job store and HTML cache"""
+    scraper.FLARESOLVERR_URLS = api_urls
+    scraper.CRAWL_WORKERS = workers
+    scraper.OUTPUT_DIR = os.path.join(work_dir, f"output_{workers}")
+    scraper.JOB_DB_FILE = os.path.join(work_dir, f"jobs_{workers}.sqlite3")
+    scraper.HTML_CACHE_DIR = os.path.join(work_dir, f"html_cache_{workers}")
+    scraper.RESULTS_DB_FILE = os.path.join(work_dir, f"results_{workers}.sqlite3")
+    scraper.ARCHIVE_DIR = os.path.join(work_dir, f"page_archive_{workers}")
+    scraper.FLARESOLVERR_MAX_IN_FLIGHT = workers
+    scraper._balancer = None
+    scraper._session_pool = None
+    scraper._job_store = None
+    scraper._html_cache = None
+    scraper._output_sink = None
+    scraper._page_archive = None
+    scraper._pipeline = None
+    scraper._coalescer = None
+    scraper.RATE_LIMITER = HostRateLimiter({'www.footballwebpages.co.uk': rate}, burst=workers)
+
+    scheduler = scraper.CrawlScheduler(
+        discover=scraper.discover_club,
+        scrape=scraper.scrape_season_job,
+        workers=workers
+    )
+    scraper.get_pipeline().start()
+    stats = scheduler.run(scraper.get_job_store().clubs_with_work(clubs))
+    scraper.get_pipeline().close()
+    scraper.get_output_sink().close()
+    scraper.get_session_pool().close()
+    stats['connections'] = sum(backend.client.connections_opened for backend in scraper.get_balancer().backends)
+    stats['fetch_attempts'] = sum(backend.requests for backend in scraper.get_balancer().backends)
+    stats['pages'] = sum(1 for _ in scraper.get_html_cache().iter_entries())
+    scraper.get_balancer().close()
+    scraper.get_page_archive().close()
+    scraper.get_job_store().close()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clubs', type=int, default=6)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.3, help='mock seconds per page')
+    parser.add_argument('--rate', type=float, default=20.0, help='requests/second cap')
+    parser.add_argument('--pages', type=int, default=1, help='pagination pages per season')
+    parser.add_argument('--backends', type=int, default=1, help='mock FlareSolverr instances to balance over')
+    parser.add_argument('--log-level', default='WARNING', help='crawler log level')
+    args = parser.parse_args()
+    setup_logging(args.log_level, 'text', stream=sys.stderr)
+
+    mocks = [MockFlareSolverr(latency=args.latency, pages=args.pages) for _ in range(args.backends)]
+    api_urls = [mock.start() for mock in mocks]
+    work_dir = tempfile.mkdtemp(prefix="football_bench_")
+    clubs = [f"bench-club-{i}" for i in range(args.clubs)]
+
+    results = {}
+    try:
+        for workers in (1, args.workers):
+            started = time.time()
+            stats = run_crawl(api_urls, clubs, workers, args.rate, work_dir)
+            elapsed = time.time() - started
+            results[workers] = (stats, elapsed)
+    finally:
+        for mock in mocks:
+            mock.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+        stop_logging()
+
+    print(f"\n{'='*60}")
+    print(f"📊 {args.clubs} clubs, {args.pages} page(s) per season, {args.latency}s mock latency, "
+          f"{args.rate} req/s cap, {args.backends} backend(s)")
+    for url, mock in zip(api_urls, mocks):
+        print(f"🧪 Mock commands on {url}: {mock.counts}")
+    for workers, (stats, elapsed) in results.items():
+        print(f"   {workers} worker(s): {stats['completed']} club-seasons in {elapsed:.1f}s "
+              f"({stats['completed'] / elapsed * 60:.0f}/min, {stats['connections']} FlareSolverr connections)")
+    baseline = results[1][1]
+    print(f"🚀 Speed-up with {args.workers} workers: {baseline / results[args.workers][1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Parsing benchmark on the fixtures: old three-tree path vs one AppearancesPage, plus every extractor backend
+
+    python benchmark_parsing.py           # timings and peak memory per page
+    python benchmark_parsing.py --check   # every backend must match fixtures/*.expected.json
+
+Player pages (fixtures/player_*.html) have one parser, parse_player_page(); --check
+compares its output with their .expected.json too. Timings cover appearances pages only.
+
+The fixtures are synthetic: hand-built pages shaped like Football Web Pages, not
+captures of the live site. The appearances goldens were generated with the bs4
+backend; tests/test_extractors.py also checks them with an html.parser oracle.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from extractors import EXTRACTORS
+from page_parser import AppearancesPage, PARSER_FEATURES
+from player_index import parse_player_page
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def legacy_parse(html_content: str):
+    """What one appearances page used to cost: players, pagination and seasons each built their own tree"""
+    html_content.lower()
+    AppearancesPage(html_content, 'html.parser').extract_players()
+    AppearancesPage(html_content, 'html.parser').pagination_pages
+    AppearancesPage(html_content, 'html.parser').seasons
+
+
+def single_parse(html_content: str):
+    page = AppearancesPage(html_content)
+    page.extract_players()
+    page.pagination_pages
+    page.seasons
+
+
+def measure(func, html_content: str, rounds: int):
+    """(CPU seconds per page, peak traced bytes for one page)"""
+    started = time.process_time()
+    for _ in range(rounds):
+        func(html_content)
+    cpu = (time.process_time() - started) / rounds
+
+    tracemalloc.start()
+    func(html_content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu, peak
+
+
+def check_golden(fixtures) -> bool:
+    """Compare every extractor backend (parse_player_page for player pages) with the golden records"""
+    ok = True
+    for path in fixtures:
+        expected_path = path[:-len('.html')] + '.expected.json'
+        if not os.path.exists(expected_path):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            html_content = f.read()
+        with open(expected_path, 'r', encoding='utf-8') as f:
+            expected = json.load(f)
+
+        if os.path.basename(path).startswith('player_'):
+            parsed = parse_player_page(html_content)
+            if parsed == expected:
+                print(f"✅ {'player':12} {os.path.basename(path)} ({len(parsed['career'])} career rows)")
+            else:
+                ok = False
+                print(f"❌ {'player':12} {os.path.basename(path)}: {len(parsed['career'])} career rows, "
+                      f"expected {len(expected['career'])}")
+            continue
+
+        for name, extractor in EXTRACTORS.items():
+            players = extractor(html_content)
+            if players == expected:
+                print(f"✅ {name:12} {os.path.basename(path)} ({len(players)} players)")
+            else:
+                ok = False
+                print(f"❌ {name:12} {os.path.basename(path)}: {len(players)} players, expected {len(expected)}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--check', action='store_true', help='verify backends against golden fixtures')
+    parser.add_argument('fixtures', nargs='*', help='HTML files (default: fixtures/*.html)')
+    args = parser.parse_args()
+
+    if args.check:
+        fixtures = args.fixtures or sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html")))
+        sys.exit(0 if check_golden(fixtures) else 1)
+
+    fixtures = args.fixtures or sorted(glob.glob(os.path.join(FIXTURES_DIR, "*_appearances*.html")))
+
+    print(f"🧪 Tree parser: {PARSER_FEATURES}, {args.rounds} rounds per page (CPU ms / peak KB)")
+    columns = [('old', legacy_parse), ('page', single_parse)] + list(EXTRACTORS.items())
+    print(f"{'fixture':40}" + "".join(f"{name:>22}" for name, _ in columns))
+
+    for path in fixtures:
+        with open(path, 'r', encoding='utf-8') as f:
+            html_content = f.read()
+        row = f"{os.path.basename(path)[:40]:40}"
+        for _, func in columns:
+            cpu, peak = measure(func, html_content, args.rounds)
+            row += f"{cpu * 1000:13.1f} / {peak / 1024:6.0f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
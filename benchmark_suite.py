@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""Offline benchmark suite: the full crawl pipeline against mock FlareSolverr servers replaying fixtures
+
+Reports pages/minute, parse time per page (the crawl's own page_parse_seconds
+metric), the crawler's peak RSS and the parser processes' peak RSS, and fails
+when a result regresses past a saved baseline:
+
+    python benchmark_suite.py --save-baseline benchmark_baseline.json
+    python benchmark_suite.py --baseline benchmark_baseline.json   # exit 1 on regression
+"""
+
+import argparse
+import json
+import os
+import re
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+import benchmark_crawl
+import benchmark_parsing
+import ultimate_football_scraper_render as scraper
+from metrics import REGISTRY, SOLVE_SECONDS, PARSE_SECONDS, WRITE_SECONDS, FETCH_RETRIES
+from structured_logging import setup_logging, stop_logging
+
+# metric -> True when higher is better
+METRICS = {'pages_per_min': True, 'parse_ms_per_page': False, 'peak_rss_mb': False, 'parser_peak_rss_mb': False}
+
+
+def start_mock(args) -> tuple:
+    """Run one mock FlareSolverr in its own process (keeps it out of the crawler's RSS)"""
+    command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "mock_flaresolverr.py"),
+               '--port', '0', '--latency', str(args.latency), '--jitter', str(args.jitter),
+               '--fixtures', args.fixtures, '--failure-rate', str(args.failure_rate),
+               '--failures', args.failures, '--seed', str(args.seed)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    match = re.search(r'(http://\S+)', line)
+    if not match:
+        process.kill()
+        raise RuntimeError(f"mock FlareSolverr did not start: {line!r}")
+    return process, match.group(1)
+
+
+def parse_ms_per_page() -> float:
+    """Mean milliseconds a parser process spent per page during the crawl (PARSE_SECONDS, every step)"""
+    series = PARSE_SECONDS.snapshot()
+    pages = sum(entry['count'] for entry in series)
+    return sum(entry['sum'] for entry in series) / pages * 1000 if pages else 0.0
+
+
+def peak_rss_mb(who: int = resource.RUSAGE_SELF) -> float:
+    """Peak resident set size of this process, or of its largest reaped child with RUSAGE_CHILDREN
+
+    ru_maxrss is KB on Linux, bytes on macOS.
+    """
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def process_peak_mb(pid: int) -> Optional[float]:
+    """Peak RSS (VmHWM) of a live process from /proc, None where that is not available"""
+    try:
+        with open(f"/proc/{pid}/status", 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+class ParserMemorySampler:
+    """Polls the crawl pipeline's parser processes for their peak RSS while the crawl runs
+
+    The parsers are separate processes, so RUSAGE_SELF never sees them; their
+    high-water marks are read from /proc until the pool shuts down.
+    """
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peaks: Dict[int, float] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="parser-memory-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            pipeline = scraper._pipeline
+            for pid in pipeline.parser_pids() if pipeline is not None else []:
+                peak = process_peak_mb(pid)
+                if peak is not None:
+                    self.peaks[pid] = max(peak, self.peaks.get(pid, 0.0))
+            self._stop.wait(self.interval)
+
+    def total_mb(self) -> float:
+        """Sum of the parser processes' peaks; the largest reaped child's peak when /proc gave nothing"""
+        if self.peaks:
+            return sum(self.peaks.values())
+        return peak_rss_mb(resource.RUSAGE_CHILDREN)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> bool:
+    """Print each metric against the baseline; False if any regressed by more than `tolerance`"""
+    ok = True
+    for metric, higher_is_better in METRICS.items():
+        if metric not in baseline:
+            continue
+        old, new = baseline[metric], results[metric]
+        change = (new - old) / old if old else 0.0
+        regressed = change < -tolerance if higher_is_better else change > tolerance
+        ok = ok and not regressed
+        print(f"{'❌' if regressed else '✅'} {metric:18} {new:10.2f} (baseline {old:.2f}, {change:+.0%})")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clubs', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--backends', type=int, default=1, help='mock FlareSolverr processes')
+    parser.add_argument('--latency', type=float, default=0.2, help='mock seconds per page')
+    parser.add_argument('--jitter', type=float, default=0.1, help='extra random mock seconds per page')
+    parser.add_argument('--failure-rate', type=float, default=0.02, help='share of injected fetch failures')
+    parser.add_argument('--failures', default='timeout,challenge,http500,not_found')
+    parser.add_argument('--rate', type=float, default=50.0, help='requests/second cap')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--fixtures', default=benchmark_parsing.FIXTURES_DIR)
+    parser.add_argument('--baseline', help='JSON results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed relative regression')
+    parser.add_argument('--save-baseline', help='write these results as the new baseline')
+    parser.add_argument('--metrics', help='write the crawl\'s metrics snapshot (JSON) to this file')
+    parser.add_argument('--log-level', default='WARNING', help='crawler log level')
+    args = parser.parse_args()
+    setup_logging(args.log_level, 'text', stream=sys.stderr)
+
+    scraper.RETRY_DELAY_SCALE = 0.01  # Injected failures should cost retries, not minutes of sleep
+    mocks = [start_mock(args) for _ in range(args.backends)]
+    work_dir = tempfile.mkdtemp(prefix="football_suite_")
+    clubs = [f"bench-club-{i}" for i in range(args.clubs)]
+    sampler = ParserMemorySampler()
+    REGISTRY.reset()
+    try:
+        sampler.start()
+        started = time.time()
+        stats = benchmark_crawl.run_crawl([url for _, url in mocks], clubs, args.workers, args.rate, work_dir)
+        elapsed = time.time() - started
+    finally:
+        sampler.stop()
+        for process, _ in mocks:
+            process.terminate()
+            process.wait()
+        shutil.rmtree(work_dir, ignore_errors=True)
+        stop_logging()
+
+    results = {
+        'pages_per_min': stats['pages'] / elapsed * 60,
+        'parse_ms_per_page': parse_ms_per_page(),
+        'peak_rss_mb': peak_rss_mb(),
+        'parser_peak_rss_mb': sampler.total_mb(),
+    }
+
+    print(f"\n{'='*60}")
+    print(f"📊 {args.clubs} clubs, {args.workers} workers, {args.backends} backend(s), "
+          f"{args.latency}s+{args.jitter}s mock latency, {args.failure_rate:.0%} injected failures")
+    print(f"   {stats['pages']} pages in {elapsed:.1f}s ({stats['fetch_attempts']} fetch attempts), "
+          f"{stats['successful']}/{stats['completed']} club-seasons succeeded")
+    retries = {entry['labels']['kind']: entry['value'] for entry in FETCH_RETRIES.snapshot()}
+    print(f"   time spent: {SOLVE_SECONDS.total():.1f}s solving, {PARSE_SECONDS.total():.2f}s parsing, "
+          f"{WRITE_SECONDS.total():.2f}s writing; retries {retries}")
+    for metric in METRICS:
+        print(f"   {metric:18} {results[metric]:10.2f}")
+    if args.metrics:
+        with open(args.metrics, 'w') as f:
+            json.dump(REGISTRY.snapshot(), f, indent=2)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Baseline saved to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        if not compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
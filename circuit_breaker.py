@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+CIRCUIT BREAKER
+===============
+Infers a FlareSolverr backend's health from the outcomes of real requests
+instead of polling it.
+
+- closed:    requests flow; the last `window` outcomes are tracked and the
+             breaker opens once at least `min_requests` of them have a failure
+             rate >= `failure_rate` (a call slower than `slow_call_seconds`
+             counts as a failure)
+- open:      no requests are routed to the backend; its owner restarts it
+- half-open: after the restart up to `half_open_probes` real requests are let
+             through; if all succeed the breaker closes, any failure re-opens it
+
+Not thread-safe on its own: BackendBalancer calls it under its lock.
+"""
+
+from collections import deque
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitBreaker:
+    """Sliding-window error-rate breaker for one backend"""
+
+    def __init__(self, window: int = 20, failure_rate: float = 0.5, min_requests: int = 5,
+                 slow_call_seconds: float = 150.0, half_open_probes: int = 2):
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.slow_call_seconds = slow_call_seconds
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self.trips = 0
+        self._outcomes = deque(maxlen=window)  # True = failed
+        self._probes_in_flight = 0
+        self._probes_passed = 0
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self._outcomes) / len(self._outcomes) if self._outcomes else 0.0
+
+    def allows_request(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN:
+            return self._probes_in_flight < self.half_open_probes
+        return False
+
+    def on_dispatch(self):
+        if self.state == HALF_OPEN:
+            self._probes_in_flight += 1
+
+    def on_release(self):
+        if self._probes_in_flight:
+            self._probes_in_flight -= 1
+
+    def record(self, success: bool, latency: float = 0.0) -> bool:
+        """Record one finished request; True when this outcome trips the breaker open"""
+        failed = not success or latency > self.slow_call_seconds
+
+        if self.state == OPEN:
+            return False  # Late result of a request dispatched before the trip
+        if self.state == HALF_OPEN:
+            if failed:
+                self.trip()
+                return True
+            self._probes_passed += 1
+            if self._probes_passed >= self.half_open_probes:
+                self.state = CLOSED
+            return False
+
+        self._outcomes.append(failed)
+        if len(self._outcomes) >= self.min_requests and self.error_rate >= self.failure_rate:
+            self.trip()
+            return True
+        return False
+
+    def trip(self):
+        """Open the breaker"""
+        self.state = OPEN
+        self.trips += 1
+        self._outcomes.clear()
+
+    def half_open(self):
+        """Let a few probe requests through (after the backend has been restarted)"""
+        self.state = HALF_OPEN
+        self._probes_passed = 0
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+CLUB REGISTRY
+=============
+One place that turns the hand-kept club lists into Football Web Pages slugs:
+
+- every club list file is read, and a name listed more than once (in one file
+  or across files, ignoring case) is kept once, in first-seen order
+- names are resolved against an index of the site's club links (anchor text and
+  slug -> slug), built from the club listing pages and cached with a TTL; only
+  links of the crawler's own /<slug>/appearances shape are indexed
+- resolved slugs are persisted, so a name is looked up once; names the index
+  does not know fall back to a local slugify and are retried after the next
+  index refresh
+- the crawl reports back: a slug whose club page was fetched is confirmed
+  (verified from then on), a slug whose club page 404s is rejected and skipped
+  until the index maps its name to a different slug
+
+Two different names only become one club when they resolve to the same slug:
+"Barnet" and "Barnet FC" stay two clubs unless the index maps both to one page.
+
+A wrong slug costs a full Cloudflare solve ending in a 404, so the crawler only
+ever builds URLs from slugs that come out of this registry.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from bs4 import BeautifulSoup
+
+from page_parser import PARSER_FEATURES
+
+log = logging.getLogger(__name__)
+
+CLUB_LINK_PATTERN = re.compile(r'^/([a-z0-9]+(?:-[a-z0-9]+)*)/appearances(?:/(\d{4}-\d{4}))?/?$')
+
+
+def slugify(name: str) -> str:
+    """Local best guess at a club's slug: "Dagenham & Redbridge" -> "dagenham-and-redbridge\""""
+    name = name.lower().replace('&', ' and ').replace("'", '')
+    return re.sub(r'[^a-z0-9]+', '-', name).strip('-')
+
+
+def club_key(name: str) -> str:
+    """Case- and punctuation-independent form of a club name or slug, for index lookups"""
+    return ' '.join(word for word in slugify(name).split('-') if word)
+
+
+def read_club_list(path: str) -> List[str]:
+    """Club names of one list file, skipping blank lines, comments and trailing "# ..." notes"""
+    names = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#')[0].strip()
+            if line:
+                names.append(line)
+    return names
+
+
+def index_links(html_content: str, host: str) -> Dict[str, str]:
+    """club_key -> slug for every club link (/<slug>/appearances[/<season>]) on a club listing page"""
+    index = {}
+    soup = BeautifulSoup(html_content, PARSER_FEATURES)
+    for link in soup.find_all('a', href=True):
+        parts = urlsplit(link['href'])
+        if parts.netloc and parts.netloc != host:
+            continue
+        match = CLUB_LINK_PATTERN.match(parts.path)
+        if not match:
+            continue  # News, login, player and other non-club links
+        slug = match.group(1)
+        index.setdefault(club_key(slug), slug)
+        text = link.get_text(strip=True)
+        if text:
+            index.setdefault(club_key(text), slug)
+    return index
+
+
+class ClubRegistry:
+    """Thread-safe club name -> slug mapping, persisted as JSON next to the club index"""
+
+    def __init__(self, path: str, index_ttl: float = 30 * 24 * 3600):
+        self.path = path
+        self.index_ttl = index_ttl
+        self.slugs: Dict[str, dict] = {}  # club_key -> {'name', 'slug', 'verified'[, 'bad']}
+        self.index: Dict[str, str] = {}
+        self.index_fetched_at = 0.0
+        self.duplicates = 0
+        self.lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.slugs = state.get('slugs', {})
+            self.index = state.get('index', {})
+            self.index_fetched_at = state.get('index_fetched_at', 0.0)
+
+    # ── Club lists ──────────────────────────────────────────────────────────────
+
+    def load_lists(self, paths: Iterable[str]) -> List[str]:
+        """Club names of every existing list file, each club once"""
+        names = []
+        seen = set()
+        for path in paths:
+            if not os.path.exists(path):
+                log.warning("Club list not found", extra={'file': path})
+                continue
+            listed = read_club_list(path)
+            for name in listed:
+                key = name.lower()
+                if key in seen:
+                    self.duplicates += 1
+                    continue
+                seen.add(key)
+                names.append(name)
+            log.info("Loaded club list", extra={'file': path, 'clubs': len(listed)})
+        return names
+
+    # ── Club index ──────────────────────────────────────────────────────────────
+
+    def index_stale(self) -> bool:
+        return not self.index or time.time() - self.index_fetched_at > self.index_ttl
+
+    def update_index(self, pages: Iterable[str], host: str) -> int:
+        """Rebuild the club index from the HTML of the club listing pages; returns the clubs indexed"""
+        index: Dict[str, str] = {}
+        for html_content in pages:
+            for key, slug in index_links(html_content, host).items():
+                index.setdefault(key, slug)
+        if not index:
+            return 0
+        with self.lock:
+            self.index = index
+            self.index_fetched_at = time.time()
+        return len(index)
+
+    # ── Resolution ──────────────────────────────────────────────────────────────
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Slug of a club name: a verified earlier answer, the club index, or slugify as a last resort
+
+        None for a name whose slug was rejected, until the index offers another one.
+        """
+        key = club_key(name)
+        with self.lock:
+            known = self.slugs.get(key)
+            if known and known['verified']:
+                return known['slug']
+            slug = self.index.get(key)
+            if known and known.get('bad') and slug in (None, known['slug']):
+                return None
+            verified = slug is not None
+            if not verified:
+                slug = slugify(name)
+                if self.index:
+                    log.warning("Club not in the club index, guessing its slug",
+                                extra={'club': name, 'slug': slug})
+            self.slugs[key] = {'name': name, 'slug': slug, 'verified': verified}
+            return slug
+
+    def resolve_all(self, names: Iterable[str]) -> List[str]:
+        """Slugs of `names` in order, each slug once (names sharing a slug are one page on the site)"""
+        slugs = []
+        for name in names:
+            slug = self.resolve(name)
+            if slug is None:
+                log.info("Club slug 404ed before, skipping the club", extra={'club': name})
+            elif slug not in slugs:
+                slugs.append(slug)
+            elif not self.slugs[club_key(name)]['verified']:
+                log.warning("Two club names guess the same slug, crawling it once",
+                            extra={'club': name, 'slug': slug})
+        return slugs
+
+    def confirm(self, slug: str) -> bool:
+        """The club page of `slug` was fetched: every name resolving to it is verified; False if already so"""
+        return self._mark(slug, verified=True, bad=False)
+
+    def reject(self, slug: str) -> bool:
+        """The club page of `slug` 404s: names resolving to it are skipped from now on; False if already so"""
+        return self._mark(slug, verified=False, bad=True)
+
+    def _mark(self, slug: str, verified: bool, bad: bool) -> bool:
+        changed = False
+        with self.lock:
+            for entry in self.slugs.values():
+                if entry['slug'] == slug and (entry['verified'], entry.get('bad', False)) != (verified, bad):
+                    entry['verified'] = verified
+                    entry['bad'] = bad
+                    changed = True
+        return changed
+
+    def unverified(self) -> List[str]:
+        with self.lock:
+            return sorted(entry['name'] for entry in self.slugs.values()
+                          if not entry['verified'] and not entry.get('bad'))
+
+    def rejected(self) -> List[str]:
+        with self.lock:
+            return sorted(entry['name'] for entry in self.slugs.values() if entry.get('bad'))
+
+    def save(self):
+        """Write the mapping and the index atomically"""
+        with self.lock:
+            state = {'slugs': self.slugs, 'index': self.index, 'index_fetched_at': self.index_fetched_at}
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
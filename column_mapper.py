@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+PLAYERS TABLE COLUMN MAPPER
+===========================
+Maps the header row of an appearances table to typed player fields, so one
+fetch yields every stat the site shows instead of a single guessed number:
+
+    Player | Pos      | Apps        | Sub Apps | Goals | Yellow Cards | Red Cards
+    name   | position | appearances | sub_apps | goals | yellow_cards | red_cards
+
+Headers are matched case- and punctuation-insensitively through HEADER_FIELDS;
+any other column is kept under its snake_cased header. Numeric cells become
+ints, blank or "-" cells None. Tables whose headers name no appearances column
+fall back to the old heuristic (first value in 1-50, else any positive value).
+
+Shared by both extractor backends (page_parser.py and extractors.py), which
+only differ in how they get the cell texts out of the HTML, and by the career
+tables of player pages (player_index.py).
+"""
+
+import re
+from typing import Dict, List, Optional
+
+# Typed stat fields every player record carries (None when the page has no such column)
+STAT_FIELDS = ['position', 'sub_apps', 'goals', 'yellow_cards', 'red_cards']
+
+HEADER_FIELDS: Dict[str, str] = {
+    'player': 'name', 'name': 'name',
+    'season': 'season', 'club': 'club', 'team': 'club',
+    'pos': 'position', 'position': 'position',
+    'apps': 'appearances', 'app': 'appearances', 'appearances': 'appearances',
+    'sub apps': 'sub_apps', 'sub app': 'sub_apps', 'subs': 'sub_apps', 'sub': 'sub_apps',
+    'sub appearances': 'sub_apps',
+    'goals': 'goals', 'gls': 'goals',
+    'yellow cards': 'yellow_cards', 'yellow card': 'yellow_cards', 'yellows': 'yellow_cards', 'yc': 'yellow_cards',
+    'red cards': 'red_cards', 'red card': 'red_cards', 'reds': 'red_cards', 'rc': 'red_cards',
+}
+TEXT_FIELDS = {'name', 'position', 'season', 'club'}
+
+
+def _normalize(header: str) -> str:
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', header.lower()).split())
+
+
+def map_columns(headers: List[str]) -> Optional[List[str]]:
+    """Field name of every column, or None when no column holds appearances"""
+    columns = []
+    for header in headers:
+        normalized = _normalize(header)
+        columns.append(HEADER_FIELDS.get(normalized) or normalized.replace(' ', '_'))
+    return columns if 'appearances' in columns else None
+
+
+def _value(field: str, text: str):
+    if field in TEXT_FIELDS:
+        return text or None
+    if text.isdigit():
+        return int(text)
+    return None  # Blank or "-"
+
+
+def cell_values(columns: List[str], cell_texts: List[str]) -> dict:
+    """Typed value of every mapped cell of one row (the name column excluded)"""
+    return {field: _value(field, text) for field, text in zip(columns, cell_texts) if field and field != 'name'}
+
+
+def _guess_appearances(cell_texts: List[str]) -> int:
+    """Old heuristic: the first value in a reasonable range (1-50), otherwise any positive number"""
+    numbers = [int(text) for text in cell_texts[1:] if text.isdigit()]
+    for value in numbers:
+        if 1 <= value <= 50:
+            return value
+    for value in numbers:
+        if value > 0:
+            return value
+    return 0
+
+
+def build_player(name: str, player_url: str, cell_texts: List[str],
+                 columns: Optional[List[str]]) -> Optional[dict]:
+    """Player record of one table row, or None when the player has no appearances at all"""
+    player = {
+        'name': name,
+        'appearances': 0,
+        'player_url': player_url,
+        'player_id': player_url.split('/')[-1]
+    }
+    player.update(dict.fromkeys(STAT_FIELDS))
+
+    if columns is None:
+        player['appearances'] = _guess_appearances(cell_texts)
+    else:
+        player.update(cell_values(columns, cell_texts))
+        player['appearances'] = player['appearances'] or 0
+
+    if not name or not (player['appearances'] or player['sub_apps']):
+        return None
+    return player
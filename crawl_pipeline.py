@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+CRAWL PIPELINE
+==============
+Splits a club-season into three stages so the network, the CPU and the disk
+overlap instead of taking turns on one thread:
+
+- fetch: the crawl workers (CrawlScheduler, plus PAGE_FETCH_WORKERS for
+         pagination) wait on FlareSolverr and hand raw HTML to the parsers
+- parse: a ProcessPoolExecutor turns HTML into player records, pagination and
+         seasons (and player pages into career rows). At most `parse_queue`
+         pages are queued or being parsed; a fetcher with another page blocks
+         until a slot frees (backpressure), so raw HTML never piles up in memory
+- write: one writer thread drains a bounded queue in batches into the output
+         sink and flushes it once per batch; only after the flush returns does
+         it run each club-season's completion callbacks (fingerprint, job
+         store), so a job only counts as done once its rows are on disk
+
+Every stage keeps its own counters (items, busy seconds, seconds blocked on
+backpressure, queue high-water mark), reported at the end of a run and exported
+through metrics.py.
+"""
+
+import logging
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from extractors import get_extractor
+from metrics import PIPELINE_ITEMS, PIPELINE_BLOCKED_SECONDS, PARSE_SECONDS, PLAYERS_EXTRACTED, WRITE_SECONDS
+from page_parser import AppearancesPage
+from player_index import parse_player_page
+from structured_logging import setup_worker_logging
+
+log = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+def init_parser_process():
+    """Pool initializer: log through the parent's output handler and die on SIGTERM
+
+    The parent may have a SIGTERM handler that drains the pipeline; a parser
+    process has nothing to drain, so it takes the default action instead.
+    """
+    setup_worker_logging()
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+def parse_html(html_content: str, extractor: str, full: bool = True) -> dict:
+    """Parser process: players (and for a first page its pagination and seasons) of one page"""
+    started = time.perf_counter()
+    if full:
+        page = AppearancesPage(html_content)
+        result = {
+            'players': page.extract_players(),
+            'pagination': page.pagination_pages,
+            'seasons': page.seasons,
+            'has_table': page.has_table,
+            'player_links': page.players_table is not None,
+            'headers': page.headers,
+        }
+    else:
+        result = {'players': get_extractor(extractor)(html_content), 'pagination': [], 'seasons': []}
+    result['html_length'] = len(html_content)
+    result['parse_seconds'] = time.perf_counter() - started
+    return result
+
+
+def parse_player_html(html_content: str) -> dict:
+    """Parser process: name and career rows of a player page"""
+    started = time.perf_counter()
+    result = parse_player_page(html_content)
+    result['parse_seconds'] = time.perf_counter() - started
+    return result
+
+
+class StageStats:
+    """Throughput counters of one pipeline stage"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.busy = 0.0
+        self.blocked = 0.0
+        self.queue_high_water = 0
+        self.lock = threading.Lock()
+
+    def record(self, busy: float = 0.0, blocked: float = 0.0, items: int = 1):
+        with self.lock:
+            self.items += items
+            self.busy += busy
+            self.blocked += blocked
+        PIPELINE_ITEMS.inc(items, stage=self.name)
+        if blocked:
+            PIPELINE_BLOCKED_SECONDS.inc(blocked, stage=self.name)
+
+    def observe_queue(self, depth: int):
+        with self.lock:
+            self.queue_high_water = max(self.queue_high_water, depth)
+
+    def summary(self, elapsed: float) -> dict:
+        return {'stage': self.name, 'items': self.items, 'per_minute': round(self.items / elapsed * 60, 1),
+                'busy_seconds': round(self.busy, 1), 'blocked_seconds': round(self.blocked, 1),
+                'queue_high_water': self.queue_high_water}
+
+
+class CrawlPipeline:
+    """Parse stage (process pool behind a bounded slot count) and write stage (one batching writer thread)"""
+
+    def __init__(self, write: Callable[[str, str, List[dict], int], bool],
+                 flush: Optional[Callable[[], None]] = None, parse_workers: int = 2,
+                 parse_queue: int = 8, write_queue: int = 32, write_batch: int = 16,
+                 extractor: str = 'bs4'):
+        self.write_fn = write
+        self.flush_fn = flush
+        self.parse_workers = parse_workers
+        self.parse_queue = max(parse_queue, 1)
+        self.write_batch = max(write_batch, 1)
+        self.extractor = extractor
+        self.stats = {name: StageStats(name) for name in ('fetch', 'parse', 'write')}
+        self.started_at = time.time()
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._parse_slots = threading.BoundedSemaphore(self.parse_queue)
+        self._parse_depth = 0
+        self._writes: "queue.Queue" = queue.Queue(maxsize=max(write_queue, 1))
+        self._pending: Dict[Tuple[str, str], List[Callable[[], None]]] = {}
+        self._pending_lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
+
+    def start(self):
+        """Start the writer and the parser processes
+
+        The parser processes are forked here, so call this as early as possible:
+        main() does it before FlareSolverr's client loop, the metrics exporter and
+        the crawl workers start. The logging listener thread already runs by then;
+        the children do not use it (see init_parser_process).
+        """
+        if self._writer is not None:
+            return
+        if self.parse_workers > 0:
+            self._pool = self._new_pool()
+        self._writer = threading.Thread(target=self._write_loop, name="pipeline-writer", daemon=True)
+        self._writer.start()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        pool = ProcessPoolExecutor(max_workers=self.parse_workers, initializer=init_parser_process)
+        pool.submit(time.time).result()
+        return pool
+
+    def parser_pids(self) -> List[int]:
+        """Process ids of the live parser processes (benchmark_suite.py samples their memory)"""
+        pool = self._pool
+        return list(pool._processes or {}) if pool is not None else []
+
+    # ── Fetch stage ─────────────────────────────────────────────────────────────
+
+    @contextmanager
+    def fetching(self):
+        """Count one network fetch (a FlareSolverr round trip) in the fetch stage, failed or not"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stats['fetch'].record(busy=time.perf_counter() - started)
+
+    # ── Parse stage ─────────────────────────────────────────────────────────────
+
+    def parse(self, html_content: str, full: bool = True) -> dict:
+        """Parse one page in a parser process, blocking while `parse_queue` pages are already in the stage
+
+        `full` also returns pagination and seasons (a first page); otherwise only the players.
+        """
+        try:
+            result = self._run_parser(parse_html, html_content, self.extractor, full)
+        except Exception:
+            log.exception("Error parsing page", extra={'chars': len(html_content)})
+            result = {'players': [], 'pagination': [], 'seasons': [], 'has_table': False, 'player_links': False,
+                      'headers': [], 'html_length': len(html_content), 'parse_seconds': 0.0}
+
+        PARSE_SECONDS.observe(result['parse_seconds'], step='page' if full else 'players')
+        PLAYERS_EXTRACTED.observe(len(result['players']))
+        return result
+
+    def parse_player(self, html_content: str) -> dict:
+        """Name and career rows of a player page, parsed like any other page (raises on a parser error)"""
+        result = self._run_parser(parse_player_html, html_content)
+        PARSE_SECONDS.observe(result['parse_seconds'], step='player')
+        return result
+
+    def _run_parser(self, parser: Callable[..., dict], html_content: str, *args) -> dict:
+        stats = self.stats['parse']
+        waited = time.perf_counter()
+        self._parse_slots.acquire()
+        blocked = time.perf_counter() - waited
+        with stats.lock:
+            self._parse_depth += 1
+        stats.observe_queue(self._parse_depth)
+        try:
+            result = self._parse_in_pool(parser, html_content, *args)
+        finally:
+            with stats.lock:
+                self._parse_depth -= 1
+            self._parse_slots.release()
+        stats.record(busy=result['parse_seconds'], blocked=blocked)
+        return result
+
+    def _parse_in_pool(self, parser: Callable[..., dict], html_content: str, *args) -> dict:
+        pool = self._pool
+        if pool is None:
+            return parser(html_content, *args)
+        try:
+            return pool.submit(parser, html_content, *args).result()
+        except BrokenProcessPool:
+            # A parser process died (e.g. killed for memory): replace the pool once for everyone
+            with self._pool_lock:
+                if self._pool is pool:
+                    log.warning("Parser process died, restarting the parse pool")
+                    pool.shutdown(wait=False)
+                    self._pool = self._new_pool()
+            return parser(html_content, *args)
+
+    # ── Write stage ─────────────────────────────────────────────────────────────
+
+    def write(self, club: str, season: str, players: List[dict], html_length: int,
+              on_written: Optional[Callable[[], None]] = None):
+        """Queue a club-season for the writer, blocking while the write queue is full
+
+        After close() (an interrupted run) the rows are dropped: the job stays
+        "running" and is re-queued by the next run.
+        """
+        if self._closed:
+            log.warning("Pipeline closed, dropping a late write", extra={'club': club, 'season': season})
+            return
+        with self._pending_lock:
+            callbacks = self._pending.setdefault((club, season), [])
+            if on_written:
+                callbacks.append(on_written)
+        waited = time.perf_counter()
+        self._writes.put((club, season, players, html_length))
+        self.stats['write'].observe_queue(self._writes.qsize())
+        blocked = time.perf_counter() - waited
+        if blocked > 0.001:
+            self.stats['write'].record(blocked=blocked, items=0)
+
+    def _write_loop(self):
+        while True:
+            batch = [self._writes.get()]
+            while len(batch) < self.write_batch:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+
+            items = [item for item in batch if item is not _STOP]
+            written = [item[:2] for item in items if self._write_one(*item)]
+            flushed = not items or self._flush()
+            for club, season in written:
+                self._run_callbacks(club, season, run=flushed)
+            if len(items) < len(batch):
+                return
+
+    def _write_one(self, club: str, season: str, players: List[dict], html_length: int) -> bool:
+        started = time.perf_counter()
+        try:
+            self.write_fn(club, season, players, html_length)
+            written = True
+        except Exception:
+            log.exception("Output write failed", extra={'club': club, 'season': season})
+            written = False
+        elapsed = time.perf_counter() - started
+        WRITE_SECONDS.observe(elapsed)
+        self.stats['write'].record(busy=elapsed)
+        if not written:
+            self._run_callbacks(club, season, run=False)
+        return written
+
+    def _flush(self) -> bool:
+        """Make the batch's rows durable (buffering sinks) before any of its jobs counts as done"""
+        if self.flush_fn is None:
+            return True
+        started = time.perf_counter()
+        try:
+            self.flush_fn()
+            flushed = True
+        except Exception:
+            log.exception("Output flush failed, the batch's jobs are re-queued by the next run")
+            flushed = False
+        self.stats['write'].record(busy=time.perf_counter() - started, items=0)
+        return flushed
+
+    def _run_callbacks(self, club: str, season: str, run: bool = True):
+        with self._pending_lock:
+            callbacks = self._pending.pop((club, season), [])
+        if not run:
+            return  # Not durable: the job stays "running" and is re-queued by the next run
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                log.exception("Write completion callback failed", extra={'club': club, 'season': season})
+
+    # ── Shutdown and reporting ──────────────────────────────────────────────────
+
+    def close(self):
+        """Drain the write queue, then stop the writer and the parser processes"""
+        self._closed = True
+        if self._writer is not None:
+            self._writes.put(_STOP)
+            self._writer.join()
+            self._writer = None
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def report(self):
+        """Log one line per stage"""
+        elapsed = max(time.time() - self.started_at, 1e-9)
+        for stats in self.stats.values():
+            log.info("Pipeline stage summary", extra=stats.summary(elapsed))
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+CONCURRENT CRAWL SCHEDULER
+==========================
+Runs club-season jobs through a bounded pool of worker threads. Each club first
+gets a season-discovery job; the season jobs it yields are queued behind it.
+Pacing is left to the shared per-host rate limiter in the fetch layer, so
+workers never sleep idle between jobs.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Iterable, List, Dict
+
+log = logging.getLogger(__name__)
+
+
+class CrawlScheduler:
+    """Bounded worker pool for discovery and club-season scrape jobs"""
+
+    def __init__(self, discover: Callable[[str], List[str]], scrape: Callable[[str, str], bool],
+                 workers: int = 3):
+        self.discover = discover
+        self.scrape = scrape
+        self.workers = max(workers, 1)
+        self.stats = {
+            'clubs': 0,
+            'completed': 0,
+            'successful': 0,
+            'failed_jobs': [],
+            'elapsed': 0.0
+        }
+
+    def run(self, clubs: Iterable[str]) -> Dict:
+        """Crawl every club and return completion statistics"""
+        clubs = iter(clubs)
+        pending = {}
+        start_time = time.time()
+
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="crawl")
+        try:
+            while True:
+                # Keep the queue short so season jobs of discovered clubs run before
+                # discovery of clubs further down the list
+                while len(pending) < self.workers * 2:
+                    club = next(clubs, None)
+                    if club is None:
+                        break
+                    self.stats['clubs'] += 1
+                    pending[pool.submit(self.discover, club)] = ('discover', club, None)
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, club, season = pending.pop(future)
+                    if kind == 'discover':
+                        self._queue_seasons(pool, pending, club, future)
+                    else:
+                        self._record_season(club, season, future)
+        except KeyboardInterrupt:
+            log.warning("Interrupted by user, cancelling queued jobs", extra={'queued': len(pending)})
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        else:
+            pool.shutdown(wait=True)
+        finally:
+            self.stats['elapsed'] = time.time() - start_time
+
+        return self.stats
+
+    def _queue_seasons(self, pool: ThreadPoolExecutor, pending: dict, club: str, future):
+        try:
+            seasons = future.result()
+        except Exception as e:
+            log.error("Error processing club", extra={'club': club, 'error': str(e)})
+            return
+
+        if not seasons:
+            log.info("No seasons to scrape, skipping club", extra={'club': club})
+            return
+
+        log.info("Queueing seasons", extra={'club': club, 'seasons': len(seasons)})
+        for season in seasons:
+            pending[pool.submit(self.scrape, club, season)] = ('season', club, season)
+
+    def _record_season(self, club: str, season: str, future):
+        self.stats['completed'] += 1
+        try:
+            success = future.result()
+        except Exception:
+            log.exception("Unexpected error in season job", extra={'club': club, 'season': season})
+            success = False
+
+        if success:
+            self.stats['successful'] += 1
+        else:
+            self.stats['failed_jobs'].append(f"{club}-{season}")
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+DATA PATHS
+==========
+Where the scraper keeps its state on the persistent disk (mounted at /data by
+render.yaml). Kept apart from the scraper module so offline tools such as
+reprocess.py can find the page archive and the HTML cache without importing
+the crawler, its FlareSolverr client or its start-up work.
+
+The scraper re-exports every name; override them there (as the benchmarks do)
+to point a run somewhere else.
+"""
+
+import os
+
+DATA_DIR = "/data"  # Persistent disk mounted by render.yaml
+JOB_DB_FILE = os.path.join(DATA_DIR, "scraper_jobs.sqlite3")
+CLUB_REGISTRY_FILE = os.path.join(DATA_DIR, "club_registry.json")  # Resolved club slugs and the club index
+HTML_CACHE_DIR = os.path.join(DATA_DIR, "html_cache")
+ARCHIVE_DIR = os.path.join(DATA_DIR, "page_archive")
+PARQUET_DIR = os.path.join(DATA_DIR, "players_parquet")
+RESULTS_DB_FILE = os.path.join(DATA_DIR, "results.sqlite3")
+METRICS_SNAPSHOT_FILE = os.path.join(DATA_DIR, "metrics.json")  # Rewritten periodically, plus metrics.prom
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+PLAYER EXTRACTOR BACKENDS
+=========================
+Pluggable engines that turn an appearances page into player records. Every
+backend must produce exactly the same records as the BeautifulSoup reference;
+tests/test_extractors.py (and benchmark_parsing.py --check) compare them
+against the golden fixtures.
+
+- bs4:         full BeautifulSoup tree via AppearancesPage (reference)
+- lxml-stream: lxml iterparse that keeps only the players <table>, discards
+               everything parsed before it and stops as soon as it closes
+"""
+
+import io
+import logging
+from typing import Callable, Dict, List, Optional
+
+from column_mapper import build_player, map_columns
+from page_parser import AppearancesPage
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+log = logging.getLogger(__name__)
+
+
+def extract_bs4(html_content: str) -> List[dict]:
+    return AppearancesPage(html_content).extract_players()
+
+
+def _text(element) -> str:
+    """Equivalent of BeautifulSoup's get_text(strip=True)"""
+    return ''.join(part.strip() for part in element.itertext())
+
+
+def _is_player_link(element) -> bool:
+    return element.tag == 'a' and '/appearances/' in (element.get('href') or '')
+
+
+def _players_from_table(table) -> List[dict]:
+    players = []
+    rows = list(table.iter('tr'))
+    if not rows:
+        return players
+    columns = map_columns([_text(cell) for cell in rows[0].iter('th', 'td')])
+    for row in rows[1:]:  # Skip header row
+        cells = list(row.iter('td', 'th'))
+        if len(cells) < 2:
+            continue
+
+        player_link = next((a for a in row.iter('a') if a.get('href') is not None), None)
+        if player_link is None or not _is_player_link(player_link):
+            continue  # Skip rows without player links
+
+        player = build_player(_text(player_link), player_link.get('href'), [_text(cell) for cell in cells], columns)
+        if player:
+            players.append(player)
+    return players
+
+
+def extract_lxml_stream(html_content: str) -> List[dict]:
+    """Stream the document and emit players from the first table holding /appearances/ links"""
+    open_tables = []
+    main_table = None
+
+    events = etree.iterparse(io.BytesIO(html_content.encode('utf-8')), events=('start', 'end'),
+                             html=True, encoding='utf-8', recover=True)
+    for event, element in events:
+        if event == 'start':
+            if element.tag == 'table':
+                open_tables.append(element)
+            continue
+
+        if element.tag == 'table':
+            open_tables.pop()
+            if element is main_table:
+                return _players_from_table(element)
+        elif main_table is None and open_tables and _is_player_link(element):
+            # The outermost open table is the first one (in document order) with a player link
+            main_table = open_tables[0]
+
+        if not open_tables:
+            # Nothing outside a table is needed: free it as we go
+            element.clear(keep_tail=False)
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+    return []
+
+
+EXTRACTORS: Dict[str, Callable[[str], List[dict]]] = {'bs4': extract_bs4}
+if etree is not None:
+    EXTRACTORS['lxml-stream'] = extract_lxml_stream
+
+DEFAULT_EXTRACTOR = 'lxml-stream' if 'lxml-stream' in EXTRACTORS else 'bs4'
+
+
+def get_extractor(name: Optional[str] = None) -> Callable[[str], List[dict]]:
+    """Extractor by name, falling back to bs4 when the requested backend is unavailable"""
+    name = name or DEFAULT_EXTRACTOR
+    if name not in EXTRACTORS:
+        log.warning("Extractor not available, using bs4", extra={'extractor': name})
+        name = 'bs4'
+    return EXTRACTORS[name]
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+FETCH FAILURE TAXONOMY
+======================
+Why a FlareSolverr page fetch failed, and how to retry it.
+
+- NotFound:          the page does not exist (404/410), never retried
+- ChallengeUnsolved: Cloudflare was not solved, retried on a fresh session
+- BackendDown:       FlareSolverr itself failed, retried on another backend
+- FetchTimeout:      the solve took too long, retried with exponential backoff
+                     and jitter
+- IncompleteSeason:  page 1 of a club-season came through but one of its
+                     pagination pages did not; the season is not written and
+                     its job stays open for the next run
+
+Each kind has its own retry budget (RETRY_BUDGETS in the main script) and its
+`kind` is what the job store records as the job's outcome.
+"""
+
+import random
+import re
+from typing import Optional
+
+# Cloudflare's interstitial, recognised by its title or the challenge's own markup; the body text is
+# not searched, since any ordinary page may mention "verify you are human"
+CHALLENGE_PATTERN = re.compile(
+    r'<title[^>]*>\s*(?:just a moment|attention required)'
+    r'|<[^>]+\b(?:id|class)\s*=\s*["\']?(?:challenge-form|cf-challenge-running|cf-browser-verification)\b',
+    re.IGNORECASE)
+
+
+class FetchFailure(Exception):
+    """Base class: a page could not be fetched"""
+
+    kind = 'error'
+    backend_fault = True  # Counts against the FlareSolverr backend's circuit breaker
+    fresh_session = True  # Rotate the FlareSolverr session before retrying
+
+    def __init__(self, message: str, backend=None):
+        super().__init__(message)
+        self.backend = backend
+
+    def retry_delay(self, retry: int) -> float:
+        """Seconds to wait before retry number `retry` (1-based)"""
+        return 5
+
+
+class NotFound(FetchFailure):
+    kind = 'not_found'
+    backend_fault = False
+    fresh_session = False
+
+
+class ChallengeUnsolved(FetchFailure):
+    kind = 'challenge'
+    backend_fault = False
+
+
+class BackendDown(FetchFailure):
+    kind = 'backend_down'
+
+
+class FetchTimeout(FetchFailure):
+    kind = 'timeout'
+
+    base_delay = 10
+    max_delay = 120
+
+    def retry_delay(self, retry: int) -> float:
+        # Exponential backoff with "equal jitter": half fixed, half random
+        delay = min(self.max_delay, self.base_delay * 2 ** (retry - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+
+class IncompleteSeason(FetchFailure):
+    kind = 'incomplete'
+    backend_fault = False  # Each failed page already counted against its own backend
+    fresh_session = False
+
+
+def is_challenge_page(html_content: str) -> bool:
+    """True for a Cloudflare challenge page (by its title or challenge form, not its text)"""
+    return CHALLENGE_PATTERN.search(html_content) is not None
+
+
+def classify_error_message(message: str, backend=None) -> FetchFailure:
+    """Failure for a FlareSolverr response with status 'error'"""
+    lowered = message.lower()
+    if 'timeout' in lowered or 'timed out' in lowered:
+        return FetchTimeout(message, backend)
+    if 'challenge' in lowered or 'cloudflare' in lowered or 'captcha' in lowered:
+        return ChallengeUnsolved(message, backend)
+    return BackendDown(message, backend)
+
+
+def classify_solution(solution: dict, backend=None) -> Optional[FetchFailure]:
+    """Failure hidden in a FlareSolverr 'ok' solution (site 404, challenge page), or None"""
+    status = solution.get('status') or 200
+    if status in (404, 410):
+        return NotFound(f"HTTP {status} for {solution.get('url', 'page')}", backend)
+    if status in (403, 503) or is_challenge_page(solution.get('response') or ''):
+        return ChallengeUnsolved(f"still on a challenge page (HTTP {status})", backend)
+    return None
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+FLARESOLVERR BACKENDS
+=====================
+Spreads page fetches over several FlareSolverr containers. Each backend has its
+own keep-alive client, outstanding-request count and circuit breaker; fetches go
+to the backend with the fewest outstanding requests whose breaker lets them in
+(ties taken in turn, so idle backends share the work evenly).
+
+Health is passive: callers record the outcome and latency of every request.
+When a backend's breaker trips it is drained (no new work, in-flight fetches
+finish) and then restarted in a background thread while the other backends keep
+serving. Its generation is bumped afterwards so sessions created before the
+restart are dropped instead of reused, and its breaker goes half-open so the
+next few real requests act as probes. A backend whose restarts all fail is out
+for good (until mark_down() retries it); once every backend is out, acquire()
+raises NoHealthyBackend at once instead of waiting for a recovery that cannot come.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, List, Optional
+from urllib.parse import urlparse
+
+from circuit_breaker import CircuitBreaker, OPEN
+from flaresolverr_client import FlareSolverrClient
+from metrics import CONTAINER_RESTARTS
+
+log = logging.getLogger(__name__)
+
+RESTART_ATTEMPTS = 3
+RESTART_RETRY_DELAY = 30  # Seconds between failed restart attempts of one backend
+
+
+class NoHealthyBackend(RuntimeError):
+    """Every FlareSolverr backend is down, restarting or beyond restarting"""
+
+
+def container_name(api_url: str) -> str:
+    """Docker container name for the FlareSolverr listening at api_url"""
+    port = urlparse(api_url).port or 8191
+    return 'flaresolverr' if port == 8191 else f'flaresolverr-{port}'
+
+
+class FlareSolverrBackend:
+    """One FlareSolverr container"""
+
+    def __init__(self, api_url: str, max_in_flight: int = 4, breaker: Optional[dict] = None):
+        self.api_url = api_url
+        self.port = urlparse(api_url).port or 8191
+        self.container = container_name(api_url)
+        self.client = FlareSolverrClient(api_url, max_in_flight=max_in_flight)
+        self.outstanding = 0
+        self.breaker = CircuitBreaker(**(breaker or {}))
+        self.generation = 0  # Bumped after every restart
+        self.requests = 0
+        self.restarts = 0
+        self.given_up = False  # Every restart attempt failed; no request will reach it again
+
+    @property
+    def healthy(self) -> bool:
+        return self.breaker.state != OPEN
+
+    def __repr__(self):
+        return f"<FlareSolverrBackend {self.api_url} outstanding={self.outstanding} {self.breaker.state}>"
+
+
+class BackendBalancer:
+    """Least-outstanding-requests balancing with per-backend drain and restart"""
+
+    def __init__(self, api_urls: List[str], restart: Callable[[FlareSolverrBackend], bool],
+                 max_in_flight: int = 4, acquire_timeout: float = 600, breaker: Optional[dict] = None):
+        self.backends = [FlareSolverrBackend(url, max_in_flight, breaker) for url in api_urls]
+        self.restart = restart
+        self.acquire_timeout = acquire_timeout
+        self._restarting = set()
+        self._turn = 0  # Round-robin position among equally busy backends
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout: Optional[float] = None,
+                avoid: Optional[FlareSolverrBackend] = None) -> FlareSolverrBackend:
+        """Reserve the least busy backend whose breaker admits a request, waiting if none does
+
+        `avoid` (e.g. the backend a retry just failed on) is only used when no other backend is available.
+        """
+        deadline = time.time() + (self.acquire_timeout if timeout is None else timeout)
+        with self._condition:
+            while True:
+                available = [backend for backend in self.backends if backend.breaker.allows_request()]
+                if available:
+                    candidates = [backend for backend in available if backend is not avoid] or available
+                    least = min(backend.outstanding for backend in candidates)
+                    tied = [backend for backend in candidates if backend.outstanding == least]
+                    backend = tied[self._turn % len(tied)]
+                    self._turn += 1
+                    backend.breaker.on_dispatch()
+                    backend.outstanding += 1
+                    backend.requests += 1
+                    return backend
+                if all(backend.given_up for backend in self.backends):
+                    raise NoHealthyBackend("every FlareSolverr backend failed to restart")
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise NoHealthyBackend("no healthy FlareSolverr backend")
+                self._condition.wait(remaining)
+
+    def release(self, backend: FlareSolverrBackend):
+        with self._condition:
+            backend.outstanding -= 1
+            backend.breaker.on_release()
+            self._maybe_restart_locked(backend)
+            self._condition.notify_all()  # A half-open probe slot may have freed up
+
+    def record(self, backend: FlareSolverrBackend, success: bool, latency: float = 0.0):
+        """Feed one request outcome into the backend's breaker, draining the backend if it trips"""
+        with self._condition:
+            if backend.breaker.record(success, latency):
+                log.warning("Circuit open, draining FlareSolverr backend before a restart",
+                            extra={'backend': backend.api_url, 'in_flight': backend.outstanding,
+                                   'error_rate': round(backend.breaker.error_rate, 2)})
+                self._maybe_restart_locked(backend)
+
+    def mark_down(self, backend: FlareSolverrBackend):
+        """Trip a backend's breaker by hand: stop routing to it and restart it once drained"""
+        with self._condition:
+            if backend.healthy:
+                backend.breaker.trip()
+                log.warning("Draining FlareSolverr backend",
+                            extra={'backend': backend.api_url, 'in_flight': backend.outstanding})
+            self._maybe_restart_locked(backend)
+
+    def wait_healthy(self, timeout: float) -> bool:
+        """Block until at least one backend is healthy (False at once if none can recover)"""
+        deadline = time.time() + timeout
+        with self._condition:
+            while not any(backend.healthy for backend in self.backends):
+                if all(backend.given_up for backend in self.backends):
+                    return False
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+    def _maybe_restart_locked(self, backend: FlareSolverrBackend):
+        if backend.healthy or backend.outstanding > 0 or backend in self._restarting:
+            return
+        self._restarting.add(backend)
+        backend.given_up = False
+        threading.Thread(target=self._restart, args=(backend,),
+                         name=f"restart-{backend.container}", daemon=True).start()
+
+    def _restart(self, backend: FlareSolverrBackend):
+        for attempt in range(RESTART_ATTEMPTS):
+            restarted = self.restart(backend)
+            CONTAINER_RESTARTS.inc(backend=backend.container, result='ok' if restarted else 'failed')
+            if restarted:
+                with self._condition:
+                    backend.generation += 1
+                    backend.restarts += 1
+                    backend.breaker.half_open()
+                    self._restarting.discard(backend)
+                    self._condition.notify_all()
+                return
+            time.sleep(RESTART_RETRY_DELAY)
+
+        log.error("FlareSolverr backend could not be restarted, leaving it out", extra={'backend': backend.api_url})
+        with self._condition:
+            self._restarting.discard(backend)
+            backend.given_up = True
+            self._condition.notify_all()  # Waiters fail fast if no backend is left
+
+    def invalidate_all(self):
+        """Forget every session on every backend (e.g. after restarting all containers)"""
+        with self._condition:
+            for backend in self.backends:
+                backend.generation += 1
+
+    def close(self):
+        for backend in self.backends:
+            backend.client.close()
+
+    def report(self):
+        """Log one line per backend"""
+        if len(self.backends) < 2 and not self.backends[0].breaker.trips:
+            return
+        for backend in self.backends:
+            log.info("FlareSolverr backend summary",
+                     extra={'backend': backend.api_url, 'fetches': backend.requests, 'trips': backend.breaker.trips,
+                            'restarts': backend.restarts, 'circuit': backend.breaker.state})
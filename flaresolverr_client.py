@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+ASYNC FLARESOLVERR CLIENT
+=========================
+asyncio client for the FlareSolverr /v1 API on aiohttp's keep-alive connection
+pool, with a timeout on every call and a cap on concurrent request.get commands
+(each one is a browser solve inside FlareSolverr).
+
+The client owns one event loop running in a background thread, so crawler
+worker threads can use the blocking wrappers (command, request_get, health...)
+while their calls still overlap on that single loop. The a* coroutines are the
+asyncio API; they must run on that loop (submit() schedules one from any thread).
+"""
+
+import asyncio
+import concurrent.futures
+import json
+import threading
+from typing import Dict, List, Optional
+
+import aiohttp
+import requests
+
+
+class FlareSolverrTimeout(requests.exceptions.Timeout):
+    """A FlareSolverr call did not finish within its timeout"""
+
+
+class FlareSolverrConnectionError(requests.exceptions.ConnectionError):
+    """FlareSolverr could not be reached, closed the connection or sent a malformed response"""
+
+
+class FlareSolverrResponse:
+    """Minimal HTTP response: status code, headers and JSON body"""
+
+    def __init__(self, status_code: int, headers: Dict[str, str], body: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = body
+
+    def json(self) -> dict:
+        return json.loads(self.content.decode('utf-8'))
+
+
+class FlareSolverrClient:
+    """Keep-alive asyncio HTTP client for one FlareSolverr endpoint"""
+
+    def __init__(self, api_url: str, max_in_flight: int = 4, pool_size: int = 16):
+        self.api_url = api_url
+        self.max_in_flight = max_in_flight
+        self.pool_size = pool_size
+        self.connections_opened = 0
+
+        self._closed = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._solve_slots: Optional[asyncio.Semaphore] = None
+
+    # ── Event loop ──────────────────────────────────────────────────────────────
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._closed:
+                # A worker still running after shutdown must not open a fresh loop and pool
+                raise FlareSolverrConnectionError("FlareSolverr client is closed")
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever,
+                                                name="flaresolverr-client", daemon=True)
+                self._thread.start()
+        return self._loop
+
+    def submit(self, coro) -> "concurrent.futures.Future":
+        """Schedule a coroutine on the client loop from any thread"""
+        try:
+            loop = self._ensure_loop()
+        except FlareSolverrConnectionError:
+            coro.close()
+            raise
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def _run(self, coro):
+        """Run a coroutine on the client loop from a (worker) thread and wait for it"""
+        return self.submit(coro).result()
+
+    def close(self):
+        """Cancel calls still in flight, close the connection pool and stop the background loop for good"""
+        with self._start_lock:
+            self._closed = True
+        if self._loop is None:
+            return
+
+        async def _close():
+            for task in asyncio.all_tasks():
+                if task is not asyncio.current_task():
+                    task.cancel()  # Their callers get CancelledError instead of waiting forever
+            if self._session is not None:
+                await self._session.close()
+                self._session = None
+
+        asyncio.run_coroutine_threadsafe(_close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
+        self._loop = None
+        self._thread = None
+        self._solve_slots = None
+
+    # ── HTTP over the pooled keep-alive connections ─────────────────────────────
+
+    def _client_session(self) -> aiohttp.ClientSession:
+        """The aiohttp session (and its connection pool), created on the client loop on first use"""
+        if self._session is None:
+            async def connection_opened(session, context, params):
+                self.connections_opened += 1
+
+            tracing = aiohttp.TraceConfig()
+            tracing.on_connection_create_end.append(connection_opened)
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.pool_size),
+                                                  trace_configs=[tracing])
+        return self._session
+
+    async def _http(self, method: str, body: bytes, timeout: float) -> FlareSolverrResponse:
+        headers = {'Content-Type': 'application/json'} if body else {}
+        try:
+            async with self._client_session().request(method, self.api_url, data=body or None, headers=headers,
+                                                      timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                content = await response.read()
+                return FlareSolverrResponse(response.status, {name.lower(): value for name, value
+                                                              in response.headers.items()}, content)
+        except asyncio.TimeoutError as e:
+            raise FlareSolverrTimeout(f"FlareSolverr call timed out after {timeout}s") from e
+        except (aiohttp.ClientError, OSError) as e:
+            raise FlareSolverrConnectionError(f"FlareSolverr connection failed: {e}") from e
+
+    # ── Async API ───────────────────────────────────────────────────────────────
+
+    async def acommand(self, payload: dict, timeout: float = 30) -> FlareSolverrResponse:
+        """POST one /v1 command"""
+        return await self._http('POST', json.dumps(payload).encode('utf-8'), timeout)
+
+    async def arequest_get(self, url: str, session: Optional[str] = None, max_timeout: int = 180000,
+                           timeout: float = 200) -> FlareSolverrResponse:
+        """request.get through FlareSolverr, waiting for a free solve slot first"""
+        payload = {"cmd": "request.get", "url": url, "maxTimeout": max_timeout}
+        if session:
+            payload["session"] = session
+        if self._solve_slots is None:
+            self._solve_slots = asyncio.Semaphore(self.max_in_flight)
+        async with self._solve_slots:
+            return await self.acommand(payload, timeout)
+
+    async def ahealth(self, timeout: float = 10) -> bool:
+        """FlareSolverr answers GET /v1 with 405 when it is up"""
+        try:
+            response = await self._http('GET', b'', timeout)
+        except requests.exceptions.RequestException:
+            return False
+        return response.status_code == 405
+
+    # ── Blocking wrappers for worker threads ────────────────────────────────────
+
+    def command(self, payload: dict, timeout: float = 30) -> FlareSolverrResponse:
+        return self._run(self.acommand(payload, timeout))
+
+    def request_get(self, url: str, session: Optional[str] = None, max_timeout: int = 180000,
+                    timeout: float = 200) -> FlareSolverrResponse:
+        return self._run(self.arequest_get(url, session, max_timeout, timeout))
+
+    def health(self, timeout: float = 10) -> bool:
+        return self._run(self.ahealth(timeout))
+
+    def create_session(self, session: str, timeout: float = 30) -> FlareSolverrResponse:
+        return self.command({"cmd": "sessions.create", "session": session}, timeout)
+
+    def destroy_session(self, session: str, timeout: float = 10) -> FlareSolverrResponse:
+        return self.command({"cmd": "sessions.destroy", "session": session}, timeout)
+
+    def list_sessions(self, timeout: float = 10) -> List[str]:
+        response = self.command({"cmd": "sessions.list"}, timeout)
+        if response.status_code == 200:
+            result = response.json()
+            if result.get('status') == 'ok':
+                return result.get('sessions', [])
+        return []
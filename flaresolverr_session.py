@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+FLARESOLVERR SESSION MANAGER
+============================
+Keeps one FlareSolverr browser session alive across many page requests so the
+Cloudflare clearance cookies solved on the first page are reused by the next
+ones, instead of creating and destroying a session for every URL.
+
+A session is rotated (destroyed and lazily re-created) after a fixed number of
+requests or whenever a request through it fails. Concurrent workers share a
+FlareSolverrSessionPool so every in-flight page gets its own browser session.
+A session lives inside one FlareSolverr container, so it is bound to the
+backend (flaresolverr_backends.py) it was created on and uses that backend's
+keep-alive client.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Optional
+
+from flaresolverr_backends import BackendBalancer, FlareSolverrBackend
+from flaresolverr_client import FlareSolverrResponse
+from metrics import SESSION_CREATE_SECONDS
+
+log = logging.getLogger(__name__)
+
+
+def report_session_stats(stats: List[Dict]):
+    """Log a summary line per FlareSolverr session"""
+    if not stats:
+        return
+    log.info("FlareSolverr sessions used", extra={'sessions': len(stats)})
+    for entry in stats:
+        log.info("FlareSolverr session summary",
+                 extra={'session': entry['session'], 'requests': entry['requests'], 'failures': entry['failures'],
+                        'avg_latency': round(entry['avg_latency'], 2), 'max_latency': round(entry['max_latency'], 2)})
+
+
+class FlareSolverrSession:
+    """Long-lived FlareSolverr session with rotation and per-session statistics"""
+
+    def __init__(self, backend: FlareSolverrBackend, max_requests: int = 50, name_prefix: str = "football_session"):
+        self.backend = backend
+        self.client = backend.client
+        self.max_requests = max_requests
+        self.name_prefix = name_prefix
+        self.session_name: Optional[str] = None
+        self.generation = 0  # Backend generation this session was created in
+        self._created = 0
+        self._current: Optional[dict] = None
+        self._history: List[dict] = []
+
+    def _create(self) -> bool:
+        """Create a new FlareSolverr session and start tracking its stats"""
+        self._created += 1
+        session_name = f"{self.name_prefix}_{int(time.time())}_{self._created}"
+        started = time.time()
+        result = 'error'
+        try:
+            response = self.client.create_session(session_name, timeout=30)
+            result = 'ok' if response.status_code == 200 else 'failed'
+        finally:
+            SESSION_CREATE_SECONDS.observe(time.time() - started, backend=self.backend.container, result=result)
+
+        if response.status_code != 200:
+            log.error("Failed to create FlareSolverr session",
+                      extra={'backend': self.backend.api_url, 'status': response.status_code})
+            return False
+
+        self.session_name = session_name
+        self._current = {
+            'session': session_name,
+            'created_at': int(started),
+            'create_time': time.time() - started,
+            'requests': 0,
+            'failures': 0,
+            'total_latency': 0.0,
+            'max_latency': 0.0
+        }
+        log.debug("FlareSolverr session created", extra={'session': session_name, 'backend': self.backend.api_url})
+        return True
+
+    def ensure(self) -> bool:
+        """Make sure a usable session exists, rotating it once it has served max_requests"""
+        if self._current and self._current['requests'] >= self.max_requests:
+            log.debug("Rotating FlareSolverr session",
+                      extra={'session': self.session_name, 'requests': self._current['requests']})
+            self.rotate()
+        if self.session_name is None:
+            return self._create()
+        return True
+
+    def request_get(self, url: str, max_timeout: int = 180000, timeout: int = 200) -> FlareSolverrResponse:
+        """Send a request.get command through the current session"""
+        if not self.ensure():
+            raise RuntimeError("could not create FlareSolverr session")
+
+        started = time.time()
+        try:
+            response = self.client.request_get(url, session=self.session_name,
+                                               max_timeout=max_timeout, timeout=timeout)
+        finally:
+            latency = time.time() - started
+            self._current['requests'] += 1
+            self._current['total_latency'] += latency
+            self._current['max_latency'] = max(self._current['max_latency'], latency)
+        return response
+
+    def record_failure(self):
+        """Count a failed request and rotate so the next attempt gets a fresh browser context"""
+        if self._current:
+            self._current['failures'] += 1
+        self.rotate()
+
+    def rotate(self):
+        """Destroy the current session; a new one is created on the next request"""
+        if self.session_name:
+            try:
+                self.client.destroy_session(self.session_name, timeout=10)
+            except Exception:
+                pass  # Don't fail if cleanup fails
+        self._retire()
+
+    def invalidate(self):
+        """Forget the current session without contacting FlareSolverr (e.g. after a container restart)"""
+        self._retire()
+
+    def close(self):
+        """Destroy the current session at the end of a run"""
+        self.rotate()
+
+    def _retire(self):
+        if self._current:
+            self._history.append(self._current)
+        self._current = None
+        self.session_name = None
+
+    def stats(self) -> List[Dict]:
+        """Per-session request counts and latency, oldest first"""
+        sessions = self._history + ([self._current] if self._current else [])
+        stats = []
+        for entry in sessions:
+            entry = dict(entry)
+            entry['avg_latency'] = entry['total_latency'] / entry['requests'] if entry['requests'] else 0.0
+            stats.append(entry)
+        return stats
+
+    def report(self):
+        """Log a summary line per session"""
+        report_session_stats(self.stats())
+
+
+class FlareSolverrSessionPool:
+    """Bounded pool of FlareSolverr sessions checked out by concurrent workers
+
+    Every checkout first picks a backend through the balancer and then reuses an
+    idle session living in that backend's container, or creates one.
+    """
+
+    def __init__(self, balancer: BackendBalancer, size: int = 1, max_requests: int = 50):
+        self.balancer = balancer
+        self.size = max(size, 1)
+        self.max_requests = max_requests
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._idle: Dict[FlareSolverrBackend, List[FlareSolverrSession]] = {
+            backend: [] for backend in balancer.backends
+        }
+        self._sessions: List[FlareSolverrSession] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def session(self, avoid: Optional[FlareSolverrBackend] = None):
+        """Check out a session for the duration of one page fetch, preferably not on `avoid`"""
+        self._slots.acquire()
+        try:
+            backend = self.balancer.acquire(avoid=avoid)
+        except Exception:
+            self._slots.release()
+            raise
+        try:
+            session = self._checkout(backend)
+            try:
+                yield session
+            finally:
+                self._checkin(session)
+        finally:
+            self.balancer.release(backend)
+            self._slots.release()
+
+    def _checkout(self, backend: FlareSolverrBackend) -> FlareSolverrSession:
+        with self._lock:
+            idle = self._idle[backend]
+            if idle:
+                return self._refresh(idle.pop())
+
+            session = FlareSolverrSession(
+                backend,
+                max_requests=self.max_requests,
+                name_prefix=f"football_session_w{len(self._sessions) + 1}"
+            )
+            session.generation = backend.generation
+            self._sessions.append(session)
+            return session
+
+    def _checkin(self, session: FlareSolverrSession):
+        with self._lock:
+            self._idle[session.backend].append(self._refresh(session))
+
+    def _refresh(self, session: FlareSolverrSession) -> FlareSolverrSession:
+        if session.generation != session.backend.generation:
+            # The backend's FlareSolverr was restarted since this session was created
+            session.invalidate()
+            session.generation = session.backend.generation
+        return session
+
+    def invalidate_all(self):
+        """Forget every session after all FlareSolverr containers have been restarted"""
+        self.balancer.invalidate_all()
+
+    def close(self):
+        """Destroy every open session at the end of a run"""
+        with self._lock:
+            for session in self._sessions:
+                if session.generation == session.backend.generation:
+                    session.close()
+
+    def stats(self) -> List[Dict]:
+        """Per-session request counts and latency for every session in the pool"""
+        stats = []
+        with self._lock:
+            for session in self._sessions:
+                stats.extend(session.stats())
+        return stats
+
+    def report(self):
+        """Log a summary line per session across all workers"""
+        report_session_stats(self.stats())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+ON-DISK HTML CACHE
+==================
+URL-keyed cache sitting in front of FlareSolverr. Each URL maps to the sha256
+of the URL (not of the page, so two URLs serving the same HTML are stored
+twice); the page is stored gzip-compressed next to a small JSON metadata file
+(url, season, fetch time, sizes).
+
+- Pages of completed seasons never expire
+- Pages of the current season (and the season index page) expire after a TTL
+- Least recently used entries are evicted once the cache exceeds max_bytes
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+SEASON_PATTERN = re.compile(r'/appearances/(\d{4}-\d{4})')
+
+
+def season_from_url(url: str) -> Optional[str]:
+    """Season encoded in an appearances URL, or None for the season index page"""
+    match = SEASON_PATTERN.search(url)
+    return match.group(1) if match else None
+
+
+class HtmlCache:
+    """Thread-safe gzip page cache keyed by URL hash"""
+
+    def __init__(self, directory: str, current_season: str, ttl: float = 24 * 3600,
+                 max_bytes: int = 1024 ** 3):
+        self.directory = directory
+        self.current_season = current_season
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.total_bytes = sum(size for _, size, _ in self._scan())
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.directory, key[:2], key)
+        return base + '.html.gz', base + '.json'
+
+    def _scan(self) -> Iterator[Tuple[str, int, float]]:
+        """(key, compressed size, last access) for every cached page"""
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.html.gz'):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    yield name[:-len('.html.gz')], stat.st_size, stat.st_mtime
+
+    def is_fresh(self, metadata: dict) -> bool:
+        """Completed seasons never expire; the current season is only valid for `ttl` seconds"""
+        season = metadata.get('season')
+        if season and season != self.current_season:
+            return True
+        return time.time() - metadata.get('fetched_at', 0) < self.ttl
+
+    def get(self, url: str) -> Optional[str]:
+        """Cached HTML for `url`, or None if missing or expired"""
+        html_content = self._read(url)
+        with self.lock:
+            if html_content is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return html_content
+
+    def _read(self, url: str) -> Optional[str]:
+        html_path, meta_path = self._paths(self.key(url))
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+            if not self.is_fresh(metadata):
+                return None
+            with gzip.open(html_path, 'rt', encoding='utf-8') as f:
+                html_content = f.read()
+            os.utime(html_path)  # Mark as recently used for LRU eviction
+        except (OSError, ValueError):
+            return None
+        return html_content
+
+    def put(self, url: str, html_content: str, metadata: Optional[Dict] = None):
+        """Store a freshly fetched page, then evict old entries if over budget"""
+        key = self.key(url)
+        html_path, meta_path = self._paths(key)
+        os.makedirs(os.path.dirname(html_path), exist_ok=True)
+
+        raw = html_content.encode('utf-8')
+        compressed = gzip.compress(raw, compresslevel=6)
+        entry = dict(metadata or {})
+        entry.update({
+            'url': url,
+            'season': season_from_url(url),
+            'fetched_at': time.time(),
+            'html_length': len(html_content),
+            'compressed_length': len(compressed),
+            'content_sha256': hashlib.sha256(raw).hexdigest()
+        })
+
+        with self.lock:
+            previous = os.path.getsize(html_path) if os.path.exists(html_path) else 0
+            tmp_path = html_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, html_path)
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            self.total_bytes += len(compressed) - previous
+
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used pages until the cache is 90% of max_bytes"""
+        target = self.max_bytes * 0.9
+        evicted = 0
+        for key, size, _ in sorted(self._scan(), key=lambda entry: entry[2]):
+            if self.total_bytes <= target:
+                break
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self.total_bytes -= size
+            evicted += 1
+        if evicted:
+            log.info("HTML cache evicted pages", extra={'evicted': evicted, 'mb_kept': round(self.total_bytes / 1024 ** 2)})
+
+    def iter_entries(self) -> Iterator[Tuple[dict, str]]:
+        """Yield (metadata, html) for every cached page, e.g. to re-run parsers offline"""
+        for key, _, _ in self._scan():
+            html_path, meta_path = self._paths(key)
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    metadata = json.load(f)
+                with gzip.open(html_path, 'rt', encoding='utf-8') as f:
+                    yield metadata, f.read()
+            except (OSError, ValueError):
+                continue
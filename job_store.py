@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+PERSISTENT JOB STORE
+====================
+SQLite table with one row per (club, season, page) crawl job so a restarted
+run picks up exactly where the previous one stopped.
+
+- Season discovery for a club is the row (club, '', 0)
+- Page 1 of a season is the season job itself: it is only marked done once the
+  season's players have been saved
+- Further pages get their own rows recording each page fetch
+- Every finished job records its outcome: 'ok', 'no_players' or the kind of
+  fetch failure (fetch_errors.py); pages that do not exist end in the
+  not_found state and are never retried
+- The negative cache remembers (club, season) pairs that turned out empty
+  (not found, no players); season '' stands for the whole club. Each entry
+  carries its own re-check time and keeps the job off the schedule until then
+- Fingerprints (hash of the extracted player table, plus the page's ETag and
+  Last-Modified when the site sends them) let an incremental run tell whether
+  a club-season changed since it was last written
+- player_jobs has one row per player_id for the player-detail stage, however
+  many club-season tables list the player, so each player page is fetched once
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+NOT_FOUND = 'not_found'
+
+DISCOVERY_SEASON = ''
+DISCOVERY_PAGE = 0
+
+
+class JobStore:
+    """Thread-safe SQLite store of crawl jobs with state, attempts and last error"""
+
+    def __init__(self, path: str, max_attempts: int = 3):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                club TEXT NOT NULL,
+                season TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                outcome TEXT,
+                updated_at INTEGER NOT NULL,
+                PRIMARY KEY (club, season, page)
+            );
+            CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state);
+            CREATE TABLE IF NOT EXISTS club_seasons (
+                club TEXT PRIMARY KEY,
+                seasons TEXT NOT NULL,
+                source_url TEXT,
+                discovered_at INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS negative_cache (
+                club TEXT NOT NULL,
+                season TEXT NOT NULL,
+                reason TEXT NOT NULL,
+                checked_at INTEGER NOT NULL,
+                recheck_after INTEGER NOT NULL,
+                PRIMARY KEY (club, season)
+            );
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                club TEXT NOT NULL,
+                season TEXT NOT NULL,
+                table_hash TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                players INTEGER NOT NULL,
+                checked_at INTEGER NOT NULL,
+                changed_at INTEGER NOT NULL,
+                PRIMARY KEY (club, season)
+            );
+            CREATE TABLE IF NOT EXISTS player_jobs (
+                player_id TEXT PRIMARY KEY,
+                player_url TEXT NOT NULL,
+                name TEXT,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                updated_at INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS player_jobs_state ON player_jobs (state);
+        """)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(jobs)")]
+        if 'outcome' not in columns:  # Job stores created before outcomes were recorded
+            self.conn.execute("ALTER TABLE jobs ADD COLUMN outcome TEXT")
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        with self.lock:
+            return self.conn.execute(sql, params).rowcount
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def add_job(self, club: str, season: str, page: int = 1):
+        """Insert a pending job unless it already exists"""
+        self._execute(
+            "INSERT OR IGNORE INTO jobs (club, season, page, state, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (club, season, page, PENDING, int(time.time()))
+        )
+
+    def add_clubs(self, clubs: Iterable[str]):
+        """Register a season-discovery job for every club"""
+        now = int(time.time())
+        with self.lock:
+            self.conn.execute("BEGIN")
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO jobs (club, season, page, state, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [(club, DISCOVERY_SEASON, DISCOVERY_PAGE, PENDING, now) for club in clubs]
+            )
+            self.conn.execute("COMMIT")
+
+    def add_seasons(self, club: str, seasons: Iterable[str]):
+        """Register page-1 jobs for each discovered season of a club"""
+        for season in seasons:
+            self.add_job(club, season, 1)
+
+    def save_seasons(self, club: str, seasons: List[str], source_url: str = ''):
+        """Remember the season list discovered for a club"""
+        self._execute(
+            "INSERT OR REPLACE INTO club_seasons (club, seasons, source_url, discovered_at) VALUES (?, ?, ?, ?)",
+            (club, json.dumps(seasons), source_url, int(time.time()))
+        )
+
+    def known_seasons(self, club: str) -> Optional[List[str]]:
+        """Season list discovered for a club by an earlier run, or None"""
+        rows = self._query("SELECT seasons FROM club_seasons WHERE club = ?", (club,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def reset_interrupted(self) -> int:
+        """Jobs (and player jobs) left running by a crashed process go back to pending"""
+        now = int(time.time())
+        return (self._execute("UPDATE jobs SET state = ?, updated_at = ? WHERE state = ?", (PENDING, now, RUNNING))
+                + self._execute("UPDATE player_jobs SET state = ?, updated_at = ? WHERE state = ?",
+                                (PENDING, now, RUNNING)))
+
+    def mark_running(self, club: str, season: str, page: int = 1):
+        self.add_job(club, season, page)
+        self._execute(
+            "UPDATE jobs SET state = ?, attempts = attempts + 1, updated_at = ? "
+            "WHERE club = ? AND season = ? AND page = ?",
+            (RUNNING, int(time.time()), club, season, page)
+        )
+
+    def mark_done(self, club: str, season: str, page: int = 1, outcome: str = 'ok'):
+        self.add_job(club, season, page)
+        self._execute(
+            "UPDATE jobs SET state = ?, last_error = NULL, outcome = ?, updated_at = ? "
+            "WHERE club = ? AND season = ? AND page = ?",
+            (DONE, outcome, int(time.time()), club, season, page)
+        )
+
+    def mark_failed(self, club: str, season: str, page: int = 1, error: str = '', outcome: str = 'error'):
+        self.add_job(club, season, page)
+        self._execute(
+            "UPDATE jobs SET state = ?, last_error = ?, outcome = ?, updated_at = ? "
+            "WHERE club = ? AND season = ? AND page = ?",
+            (FAILED, error[:500], outcome, int(time.time()), club, season, page)
+        )
+
+    def mark_not_found(self, club: str, season: str, page: int = 1, error: str = ''):
+        """The page does not exist: close the job for good"""
+        self.add_job(club, season, page)
+        self._execute(
+            "UPDATE jobs SET state = ?, last_error = ?, outcome = ?, updated_at = ? "
+            "WHERE club = ? AND season = ? AND page = ?",
+            (NOT_FOUND, error[:500], 'not_found', int(time.time()), club, season, page)
+        )
+
+    def _is_open(self, state: str, attempts: int) -> bool:
+        return state == PENDING or (state == FAILED and attempts < self.max_attempts)
+
+    def needs_discovery(self, club: str) -> bool:
+        if DISCOVERY_SEASON in self.known_empty(club):
+            return False
+        rows = self._query(
+            "SELECT state, attempts FROM jobs WHERE club = ? AND season = ? AND page = ?",
+            (club, DISCOVERY_SEASON, DISCOVERY_PAGE)
+        )
+        return not rows or self._is_open(*rows[0])
+
+    def open_seasons(self, club: str) -> List[str]:
+        """Seasons of a club whose page-1 job is still pending or failed (and retryable), minus known empty ones"""
+        empty = self.known_empty(club)
+        if DISCOVERY_SEASON in empty:
+            return []
+        rows = self._query(
+            "SELECT season, state, attempts FROM jobs WHERE club = ? AND page = 1 ORDER BY season DESC",
+            (club,)
+        )
+        return [season for season, state, attempts in rows
+                if self._is_open(state, attempts) and season not in empty]
+
+    def clubs_with_work(self, clubs: Iterable[str]) -> List[str]:
+        """Clubs from `clubs` that still need discovery or have open season jobs"""
+        return [club for club in clubs if self.needs_discovery(club) or self.open_seasons(club)]
+
+    # ── Negative cache ──────────────────────────────────────────────────────────
+
+    def remember_empty(self, club: str, season: str, reason: str, recheck_interval: float):
+        """Record that a club-season (season '' = whole club) has no data, until the re-check time"""
+        now = int(time.time())
+        self._execute(
+            "INSERT OR REPLACE INTO negative_cache (club, season, reason, checked_at, recheck_after) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (club, season, reason, now, now + int(recheck_interval))
+        )
+
+    def seed_empty_clubs(self, clubs: Iterable[str], reason: str, recheck_interval: float) -> int:
+        """Add whole-club entries from a hand-kept list; existing entries keep their re-check time"""
+        now = int(time.time())
+        with self.lock:
+            self.conn.execute("BEGIN")
+            inserted = sum(self.conn.execute(
+                "INSERT OR IGNORE INTO negative_cache (club, season, reason, checked_at, recheck_after) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (club, DISCOVERY_SEASON, reason, now, now + int(recheck_interval))
+            ).rowcount for club in clubs)
+            self.conn.execute("COMMIT")
+        return inserted
+
+    def forget_empty(self, club: str, season: str):
+        """Data was found after all: drop the entry"""
+        self._execute("DELETE FROM negative_cache WHERE club = ? AND season = ?", (club, season))
+
+    def known_empty(self, club: str) -> set:
+        """Seasons of a club (and '' for the whole club) known to be empty and not yet due a re-check"""
+        rows = self._query(
+            "SELECT season FROM negative_cache WHERE club = ? AND recheck_after > ?",
+            (club, int(time.time()))
+        )
+        return {season for (season,) in rows}
+
+    def recheck_due(self, club: str, season: str) -> bool:
+        """True when a club-season is known to be empty but due a re-check (its cached page may be stale)"""
+        return bool(self._query(
+            "SELECT 1 FROM negative_cache WHERE club = ? AND season = ? AND recheck_after <= ?",
+            (club, season, int(time.time()))
+        ))
+
+    def reopen_rechecks(self) -> int:
+        """Put the jobs behind negative-cache entries that are due a re-check back to pending"""
+        now = int(time.time())
+        with self.lock:
+            self.conn.execute("BEGIN")
+            reopened = 0
+            for club, season in self.conn.execute(
+                    "SELECT club, season FROM negative_cache WHERE recheck_after <= ?", (now,)).fetchall():
+                page = DISCOVERY_PAGE if season == DISCOVERY_SEASON else 1
+                reopened += self.conn.execute(
+                    "UPDATE jobs SET state = ?, attempts = 0, updated_at = ? "
+                    "WHERE club = ? AND season = ? AND page = ? AND state IN (?, ?)",
+                    (PENDING, now, club, season, page, FAILED, NOT_FOUND)
+                ).rowcount
+            self.conn.execute("COMMIT")
+        return reopened
+
+    # ── Fingerprints ────────────────────────────────────────────────────────────
+
+    def fingerprint(self, club: str, season: str) -> Optional[dict]:
+        """Last stored fingerprint of a club-season, or None"""
+        rows = self._query(
+            "SELECT table_hash, etag, last_modified, players, checked_at, changed_at "
+            "FROM fingerprints WHERE club = ? AND season = ?",
+            (club, season)
+        )
+        if not rows:
+            return None
+        return dict(zip(('table_hash', 'etag', 'last_modified', 'players', 'checked_at', 'changed_at'), rows[0]))
+
+    def save_fingerprint(self, club: str, season: str, table_hash: str, players: int,
+                         etag: Optional[str] = None, last_modified: Optional[str] = None, changed: bool = True):
+        """Store a club-season's fingerprint; changed_at only moves when the table changed"""
+        now = int(time.time())
+        self._execute("""
+            INSERT INTO fingerprints (club, season, table_hash, etag, last_modified, players, checked_at, changed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (club, season) DO UPDATE SET
+                table_hash = excluded.table_hash,
+                etag = excluded.etag,
+                last_modified = excluded.last_modified,
+                players = excluded.players,
+                checked_at = excluded.checked_at,
+                changed_at = CASE WHEN ? THEN excluded.changed_at ELSE fingerprints.changed_at END
+        """, (club, season, table_hash, etag, last_modified, players, now, now, int(changed)))
+
+    def fingerprint_summary(self, since: float) -> Tuple[int, int]:
+        """(club-seasons checked, club-seasons changed) since a timestamp"""
+        rows = self._query(
+            "SELECT COUNT(*), SUM(changed_at >= ?) FROM fingerprints WHERE checked_at >= ?",
+            (int(since), int(since))
+        )
+        return rows[0][0], rows[0][1] or 0
+
+    def add_players(self, players: Iterable[dict]) -> int:
+        """Register a player-detail job per player_id not seen before; returns how many were new"""
+        now = int(time.time())
+        with self.lock:
+            self.conn.execute("BEGIN")
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO player_jobs (player_id, player_url, name, state, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(player['player_id'], player['player_url'], player['name'], PENDING, now)
+                 for player in players if player.get('player_id')]
+            )
+            added = self.conn.total_changes - before
+            self.conn.execute("COMMIT")
+        return added
+
+    def open_players(self) -> List[Tuple[str, str, str]]:
+        """(player_id, player_url, name) of player jobs that still need their page fetched"""
+        return self._query(
+            "SELECT player_id, player_url, name FROM player_jobs "
+            "WHERE state = ? OR (state = ? AND attempts < ?) ORDER BY player_id",
+            (PENDING, FAILED, self.max_attempts)
+        )
+
+    def mark_player(self, player_id: str, state: str, error: str = ''):
+        """Move a player job to `state`; running counts an attempt, done clears the error"""
+        self._execute(
+            "UPDATE player_jobs SET state = ?, attempts = attempts + ?, last_error = ?, updated_at = ? "
+            "WHERE player_id = ?",
+            (state, 1 if state == RUNNING else 0, error[:500] or None, int(time.time()), player_id)
+        )
+
+    def player_summary(self) -> List[Tuple[str, int]]:
+        """Player job counts per state"""
+        return self._query("SELECT state, COUNT(*) FROM player_jobs GROUP BY state ORDER BY state")
+
+    def negative_summary(self) -> List[Tuple[str, int]]:
+        """Negative-cache entries per reason that still keep jobs off the schedule"""
+        return self._query(
+            "SELECT reason, COUNT(*) FROM negative_cache WHERE recheck_after > ? GROUP BY reason",
+            (int(time.time()),)
+        )
+
+    def summary(self) -> List[Tuple[str, int]]:
+        """Job counts per state, excluding discovery rows"""
+        return self._query(
+            "SELECT state, COUNT(*) FROM jobs WHERE page > 0 GROUP BY state ORDER BY state"
+        )
+
+    def outcomes(self) -> List[Tuple[str, int]]:
+        """Job counts per recorded outcome, excluding discovery rows"""
+        return self._query(
+            "SELECT outcome, COUNT(*) FROM jobs WHERE page > 0 AND outcome IS NOT NULL "
+            "GROUP BY outcome ORDER BY COUNT(*) DESC"
+        )
+
+    def job(self, club: str, season: str, page: int = 1) -> Optional[tuple]:
+        rows = self._query(
+            "SELECT state, attempts, last_error, outcome FROM jobs WHERE club = ? AND season = ? AND page = ?",
+            (club, season, page)
+        )
+        return rows[0] if rows else None
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+CRAWL METRICS
+=============
+In-process counters and histograms for every stage of a crawl: FlareSolverr
+session creation and solve latency, HTML size, parse time, players extracted,
+output write time, retries by failure kind and container restarts.
+
+The registry can be read three ways:
+- MetricsExporter writes a JSON snapshot (and the Prometheus text next to it)
+  every few seconds, e.g. onto the /data disk of the Render background worker
+- serve_prometheus() answers GET /metrics in the Prometheus text format
+- snapshot() / render_prometheus() for scripts such as the benchmark suite
+
+Instruments are thread-safe; the ones the scraper uses are defined at the
+bottom of this module on the default REGISTRY.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Optional, Sequence, Tuple
+
+log = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60, 120, 180)
+FAST_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+SIZE_BUCKETS = (1_000, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 500_000, 1_000_000)
+COUNT_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 200)
+
+
+def _label_text(names: Sequence[str], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    """Monotonic count per label combination"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(str(labels.get(name, '')) for name in self.labels), 0)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def snapshot(self) -> List[dict]:
+        with self._lock:
+            return [{'labels': dict(zip(self.labels, key)), 'value': value}
+                    for key, value in sorted(self._values.items())]
+
+    def prometheus_lines(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_label_text(self.labels, key)} {value:g}"
+                    for key, value in sorted(self._values.items())]
+
+
+class Histogram:
+    """Bucketed observations (count, sum, max) per label combination"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float], labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.labels = tuple(labels)
+        self._series: Dict[Tuple[str, ...], dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {'counts': [0] * len(self.buckets), 'count': 0, 'sum': 0.0,
+                                              'max': 0.0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['counts'][i] += 1
+                    break
+            series['count'] += 1
+            series['sum'] += value
+            series['max'] = max(series['max'], value)
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall-clock seconds spent in the with-block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        series = self._series.get(tuple(str(labels.get(name, '')) for name in self.labels))
+        return series['count'] if series else 0
+
+    def total(self) -> float:
+        """Sum of every observation across all label combinations"""
+        with self._lock:
+            return sum(series['sum'] for series in self._series.values())
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self) -> List[dict]:
+        with self._lock:
+            return [{'labels': dict(zip(self.labels, key)), 'count': series['count'],
+                     'sum': round(series['sum'], 6), 'max': round(series['max'], 6),
+                     'mean': round(series['sum'] / series['count'], 6) if series['count'] else 0.0,
+                     'buckets': dict(zip([f"{bound:g}" for bound in self.buckets], series['counts']))}
+                    for key, series in sorted(self._series.items())]
+
+    def prometheus_lines(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series['counts']):
+                    cumulative += count
+                    le = 'le="%g"' % bound
+                    lines.append(f"{self.name}_bucket{_label_text(self.labels, key, le)} {cumulative}")
+                le = 'le="+Inf"'
+                lines.append(f"{self.name}_bucket{_label_text(self.labels, key, le)} {series['count']}")
+                lines.append(f"{self.name}_sum{_label_text(self.labels, key)} {series['sum']:g}")
+                lines.append(f"{self.name}_count{_label_text(self.labels, key)} {series['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named instruments, rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS,
+                  labels: Sequence[str] = ()) -> Histogram:
+        return self._register(Histogram(name, help_text, buckets, labels))
+
+    def snapshot(self) -> dict:
+        """JSON-ready view of every instrument"""
+        return {
+            'timestamp': time.time(),
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'metrics': {name: {'type': metric.kind, 'help': metric.help, 'series': metric.snapshot()}
+                        for name, metric in sorted(self._metrics.items())}
+        }
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.prometheus_lines())
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Drop every recorded value (the instruments stay registered)"""
+        with self._lock:
+            for metric in self._metrics.values():
+                metric.clear()
+            self.started_at = time.time()
+
+
+class MetricsExporter:
+    """Background thread writing the registry to `path` (JSON) and `path`.prom (text) every `interval` seconds"""
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval: float = 30):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self):
+        """Write one snapshot atomically (readers never see a half-written file)"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        prometheus_path = os.path.splitext(self.path)[0] + '.prom'
+        for path, text in ((self.path, json.dumps(self.registry.snapshot(), indent=2)),
+                           (prometheus_path, self.registry.render_prometheus())):
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except OSError as e:
+                log.warning("Could not write metrics snapshot", extra={'path': self.path, 'error': str(e)})
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the thread and write a final snapshot"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self.write()
+
+
+def serve_prometheus(registry: MetricsRegistry, port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Answer GET /metrics with the Prometheus text format from a daemon thread"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/metrics', '/'):
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+REGISTRY = MetricsRegistry()
+
+SESSION_CREATE_SECONDS = REGISTRY.histogram(
+    'flaresolverr_session_create_seconds', 'Time to create a FlareSolverr browser session',
+    LATENCY_BUCKETS, labels=('backend', 'result'))
+SOLVE_SECONDS = REGISTRY.histogram(
+    'flaresolverr_solve_seconds', 'request.get latency through FlareSolverr', LATENCY_BUCKETS,
+    labels=('backend', 'outcome'))
+HTML_BYTES = REGISTRY.histogram(
+    'page_html_bytes', 'Size of fetched page HTML', SIZE_BUCKETS, labels=('source',))
+PARSE_SECONDS = REGISTRY.histogram(
+    'page_parse_seconds', 'CPU-bound parsing per page: building the tree or extracting players',
+    FAST_BUCKETS, labels=('step',))
+PLAYERS_EXTRACTED = REGISTRY.histogram(
+    'page_players_extracted', 'Players extracted per page', COUNT_BUCKETS)
+WRITE_SECONDS = REGISTRY.histogram(
+    'output_write_seconds', 'Time to hand one club-season to the output sinks', FAST_BUCKETS)
+FETCH_RETRIES = REGISTRY.counter(
+    'fetch_retries_total', 'Page fetch retries by failure kind', labels=('kind',))
+FETCH_FAILURES = REGISTRY.counter(
+    'fetch_failures_total', 'Page fetch attempts that failed, by failure kind', labels=('kind',))
+CONTAINER_RESTARTS = REGISTRY.counter(
+    'flaresolverr_restarts_total', 'FlareSolverr container restart attempts', labels=('backend', 'result'))
+FETCHES_SAVED = REGISTRY.counter(
+    'fetches_saved_total', 'Page fetches answered by an in-flight or memoized fetch of the same URL',
+    labels=('reason',))
+PIPELINE_ITEMS = REGISTRY.counter(
+    'pipeline_items_total', 'Pages fetched and parsed, club-seasons written, per pipeline stage', labels=('stage',))
+PIPELINE_BLOCKED_SECONDS = REGISTRY.counter(
+    'pipeline_blocked_seconds_total', 'Time producers waited on a full pipeline stage (backpressure)',
+    labels=('stage',))
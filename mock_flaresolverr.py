@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+MOCK FLARESOLVERR SERVER
+========================
+Local stand-in that speaks the FlareSolverr /v1 JSON protocol
+(sessions.create / sessions.list / sessions.destroy / request.get). It serves
+either generated Football Web Pages appearances and player pages or the HTML
+fixtures (equally synthetic, hand-built) replayed for any club, after a
+configurable (jittered) delay, and can inject failures: solve timeouts,
+unsolved challenges, HTTP 500s and 404 pages.
+Used to measure crawler throughput offline (benchmark_crawl.py, benchmark_suite.py).
+
+Run standalone:  python mock_flaresolverr.py --port 8191 --latency 2 --fixtures fixtures --failure-rate 0.05
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Optional, Tuple
+
+SEASONS = ["2024-2025", "2023-2024", "2022-2023", "2021-2022"]
+FAILURE_KINDS = ['timeout', 'challenge', 'http500', 'not_found']
+
+CHALLENGE_PAGE = "<html><head><title>Just a moment...</title></head><body>Verify you are human</body></html>"
+NOT_FOUND_PAGE = "<html><head><title>Page not found</title></head><body>Not found</body></html>"
+PLAYER_URL_PATTERN = re.compile(r'/appearances/\d{4}-\d{4}/(\d+)(?:[/?#]|$)')
+
+
+def parse_page_url(url: str) -> Tuple[str, Optional[str], int]:
+    """(club, season or None, page number) of an appearances URL"""
+    match = re.search(r'\.co\.uk/([^/?]+)/appearances(?:/(\d{4}-\d{4}))?', url)
+    club = match.group(1) if match else "unknown-club"
+    season = match.group(2) if match else None
+    page_match = re.search(r'[?&]page=(\d+)', url)
+    return club, season, int(page_match.group(1)) if page_match else 1
+
+
+def render_appearances_page(url: str, players: int = 25, pages: int = 1) -> str:
+    """Build a deterministic appearances page for a club/season URL (and ?page=N)"""
+    club, season, page = parse_page_url(url)
+    season = season or SEASONS[0]
+
+    options = "".join(f'<option value="{s}">{s}</option>' for s in SEASONS)
+    rows = []
+    for i in range((page - 1) * players + 1, page * players + 1):
+        player_id = str(zlib.crc32(f"{club}/{i}".encode()) % 100000)
+        rows.append(
+            f'<tr><td><a href="/{club}/appearances/{season}/{player_id}">Player {i} {club}</a></td>'
+            f'<td>{(i * 7) % 40 + 1}</td><td>{i % 5}</td><td>{i % 9}</td></tr>'
+        )
+
+    pagination = ""
+    if pages > 1:
+        links = "".join(f'<a href="/{club}/appearances/{season}?page={n}">{n}</a>' for n in range(1, pages + 1))
+        pagination = f'<div class="pagination">{links}</div>'
+
+    return (
+        f"<html><head><title>{club} appearances {season}</title></head><body>"
+        f"<h1>{club.replace('-', ' ').title()} Appearances</h1>"
+        f'<form><select name="season">{options}</select></form>'
+        f"<table><tr><th>Player</th><th>Apps</th><th>Sub</th><th>Goals</th></tr>{''.join(rows)}</table>"
+        f"{pagination}</body></html>"
+    )
+
+
+def render_player_page(url: str) -> str:
+    """Build a deterministic player page (career table) for a player URL"""
+    club, season, _ = parse_page_url(url)
+    player_id = PLAYER_URL_PATTERN.search(url).group(1)
+    seed = int(player_id)
+    start = SEASONS.index(season) if season in SEASONS else 0
+    rows = []
+    for offset, career_season in enumerate(SEASONS[start:start + 3]):
+        career_club = club if offset < 2 else f"former-club-{seed % 7}"
+        rows.append(
+            f'<tr><td>{career_season}</td>'
+            f'<td><a href="/{career_club}/appearances/{career_season}">{career_club.replace("-", " ").title()}</a></td>'
+            f'<td>{(seed + offset * 11) % 40 + 1}</td><td>{(seed + offset) % 6}</td><td>{(seed + offset) % 9}</td></tr>'
+        )
+    return (
+        f"<html><head><title>Player {player_id}</title></head><body>"
+        f"<h1>Player {player_id}</h1>"
+        f"<table><tr><th>Season</th><th>Club</th><th>Apps</th><th>Sub</th><th>Goals</th></tr>{''.join(rows)}</table>"
+        f"</body></html>"
+    )
+
+
+class FixtureLibrary:
+    """Fixture pages named <club>_appearances[_<season>][_page<N>].html, replayed for any club
+
+    An exact (club, season, page) match is served as is; other URLs get a fixture
+    page with the same page number, picked deterministically from the URL. Player
+    URLs get one of the player_<id>.html fixtures (a synthetic player page when
+    there are none).
+    """
+
+    def __init__(self, directory: str):
+        self.exact: Dict[Tuple[str, Optional[str], int], str] = {}
+        self.by_page: Dict[int, List[str]] = {}
+        self.players: List[str] = []
+        for path in sorted(glob.glob(os.path.join(directory, "player_*.html"))):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.players.append(f.read())
+        pattern = re.compile(r'^(.+)_appearances(?:_(\d{4}-\d{4}))?(?:_page(\d+))?\.html$')
+        for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+            match = pattern.match(os.path.basename(path))
+            if not match:
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                html_content = f.read()
+            page = int(match.group(3) or 1)
+            self.exact[(match.group(1), match.group(2), page)] = html_content
+            self.by_page.setdefault(page, []).append(html_content)
+        if not self.by_page:
+            raise ValueError(f"no *_appearances*.html fixtures in {directory}")
+
+    def lookup(self, url: str) -> str:
+        if PLAYER_URL_PATTERN.search(url):
+            if not self.players:
+                return render_player_page(url)
+            return self.players[zlib.crc32(url.encode()) % len(self.players)]
+        club, season, page = parse_page_url(url)
+        if (club, season, page) in self.exact:
+            return self.exact[(club, season, page)]
+        candidates = self.by_page.get(page) or self.by_page[max(self.by_page)]
+        return candidates[zlib.crc32(url.encode()) % len(candidates)]
+
+
+class InjectedHttpError(Exception):
+    """Makes the handler answer with an HTTP error status instead of JSON"""
+
+    def __init__(self, status: int):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+class MockFlareSolverr:
+    """Threaded FlareSolverr /v1 stand-in with per-command counters"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, pages: int = 1,
+                 fixtures: Optional[str] = None, jitter: float = 0.0, failure_rate: float = 0.0,
+                 failures: Optional[List[str]] = None, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.pages = pages
+        self.library = FixtureLibrary(fixtures) if fixtures else None
+        self.failure_rate = failure_rate
+        self.failures = failures or FAILURE_KINDS
+        self.random = random.Random(seed)
+        self.sessions: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.injected: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> str:
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self.url
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def handle_command(self, payload: dict) -> dict:
+        cmd = payload.get('cmd', '')
+        with self.lock:
+            self.counts[cmd] = self.counts.get(cmd, 0) + 1
+
+        if cmd == 'sessions.create':
+            session = payload.get('session') or f"mock_{len(self.sessions)}"
+            with self.lock:
+                self.sessions[session] = time.time()
+            return {'status': 'ok', 'session': session}
+        if cmd == 'sessions.list':
+            with self.lock:
+                return {'status': 'ok', 'sessions': list(self.sessions)}
+        if cmd == 'sessions.destroy':
+            with self.lock:
+                self.sessions.pop(payload.get('session'), None)
+            return {'status': 'ok'}
+        if cmd == 'request.get':
+            url = payload.get('url', '')
+            with self.lock:
+                delay = self.latency + self.random.uniform(0, self.jitter)
+                failure = self.random.choice(self.failures) if self.random.random() < self.failure_rate else None
+                if failure:
+                    self.injected[failure] = self.injected.get(failure, 0) + 1
+            if delay:
+                time.sleep(delay)
+            return self._solution(url, failure)
+        return {'status': 'error', 'message': f"Unknown command {cmd}"}
+
+    def _solution(self, url: str, failure: Optional[str]) -> dict:
+        if failure == 'http500':
+            raise InjectedHttpError(500)
+        if failure == 'timeout':
+            return {'status': 'error', 'message': 'Error: Error solving the challenge. Timeout after 60.0 seconds.'}
+        if failure == 'challenge':
+            return {'status': 'ok', 'solution': {'url': url, 'status': 403, 'response': CHALLENGE_PAGE}}
+        if failure == 'not_found':
+            return {'status': 'ok', 'solution': {'url': url, 'status': 404, 'response': NOT_FOUND_PAGE}}
+
+        if self.library:
+            html_content = self.library.lookup(url)
+        elif PLAYER_URL_PATTERN.search(url):
+            html_content = render_player_page(url)
+        else:
+            html_content = render_appearances_page(url, pages=self.pages)
+        return {
+            'status': 'ok',
+            'message': 'Challenge not detected!',
+            'solution': {'url': url, 'status': 200, 'response': html_content}
+        }
+
+    def _handler_class(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, like the real server
+
+            def do_GET(self):
+                # Real FlareSolverr answers GET /v1 with 405, which the health check expects
+                self.send_response(405)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'{}')
+                try:
+                    body = json.dumps(mock.handle_command(payload)).encode('utf-8')
+                    status = 200
+                except InjectedHttpError as e:
+                    body = json.dumps({'status': 'error', 'message': 'Internal Server Error'}).encode('utf-8')
+                    status = e.status
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock FlareSolverr /v1 server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8191)
+    parser.add_argument('--latency', type=float, default=1.0, help='seconds per request.get')
+    parser.add_argument('--pages', type=int, default=1, help='pagination pages per season (synthetic pages)')
+    parser.add_argument('--fixtures', help='directory of fixture pages to replay instead of generated ones')
+    parser.add_argument('--jitter', type=float, default=0.0, help='extra random seconds per request.get')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='share of request.get calls that fail')
+    parser.add_argument('--failures', default=','.join(FAILURE_KINDS), help='failure kinds to inject')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    mock = MockFlareSolverr(args.host, args.port, args.latency, args.pages, fixtures=args.fixtures,
+                            jitter=args.jitter, failure_rate=args.failure_rate,
+                            failures=args.failures.split(','), seed=args.seed)
+    print(f"🧪 Mock FlareSolverr listening on {mock.url}", flush=True)
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        mock.stop()
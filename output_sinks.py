@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+OUTPUT SINKS
+============
+Where extracted club-season data ends up. Every sink takes the same
+write(club, season, players, html_length) call, so the crawler can write to
+one or several of them at once. A sink's rows are on disk when write() returns,
+except for sinks marked `buffered`, whose rows only land when flush() returns:
+whoever records progress (the job store) must flush those first.
+
+- json:    the original per-club folder with <season>_data.json + <season>_players.txt
+- parquet: player rows buffered, then written as one file per club-season to a
+           season-partitioned Parquet dataset; rewriting a club-season replaces
+           its file (needs pyarrow, which is optional)
+- sqlite:  indexed results database with a query API (results_store.py), one
+           transaction per club-season that replaces all of its rows
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+log = logging.getLogger(__name__)
+
+
+class OutputSink:
+    """Base class: receives each club-season's players"""
+
+    name = 'base'
+    buffered = False  # True when write() only buffers and flush() makes the rows durable
+
+    def write(self, club: str, season: str, players: List[dict], html_length: int) -> bool:
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class JsonTxtSink(OutputSink):
+    """One pretty-printed JSON file and one text file per club-season"""
+
+    name = 'json'
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+
+    def write(self, club: str, season: str, players: List[dict], html_length: int) -> bool:
+        club_dir = os.path.join(self.output_dir, club)
+        os.makedirs(club_dir, exist_ok=True)
+
+        if not players:
+            return False
+
+        season_safe = season.replace('-', '_')
+
+        # Save simple players text file
+        players_file = os.path.join(club_dir, f"{season_safe}_players.txt")
+        with open(players_file, 'w', encoding='utf-8') as f:
+            for player in players:
+                f.write(f"{player['name']} - {player['appearances']} apps\n")
+
+        # Save simplified JSON data
+        data = {
+            'club': club,
+            'season': season,
+            'players_count': len(players),
+            'players': players,
+            'total_appearances': sum(p['appearances'] for p in players),
+            'total_goals': sum(p.get('goals') or 0 for p in players),
+            'top_appearance_maker': max(players, key=lambda x: x['appearances']),
+            'timestamp': int(time.time()),
+            'html_length': html_length
+        }
+
+        json_file = os.path.join(club_dir, f"{season_safe}_data.json")
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        return True
+
+
+class ParquetSink(OutputSink):
+    """Buffers player rows and writes each club-season to <directory>/season=<season>/<club>.parquet
+
+    A club-season written again (in the buffer or on disk) replaces its earlier rows.
+    """
+
+    name = 'parquet'
+    buffered = True
+
+    def __init__(self, directory: str, batch_size: int = 5000):
+        if pa is None:
+            raise ImportError("pyarrow is required for the parquet sink (pip install pyarrow)")
+        self.directory = directory
+        self.batch_size = batch_size
+        self.rows: Dict[Tuple[str, str], List[dict]] = {}
+        self.buffered_rows = 0
+        self.files_written = 0
+        self.lock = threading.Lock()
+        self.schema = pa.schema([
+            ('club', pa.string()),
+            ('season', pa.string()),
+            ('player_id', pa.string()),
+            ('name', pa.string()),
+            ('appearances', pa.int32()),
+            ('position', pa.string()),
+            ('sub_apps', pa.int32()),
+            ('goals', pa.int32()),
+            ('yellow_cards', pa.int32()),
+            ('red_cards', pa.int32()),
+            ('player_url', pa.string()),
+            ('timestamp', pa.int64())
+        ])
+
+    def write(self, club: str, season: str, players: List[dict], html_length: int) -> bool:
+        if not players:
+            return False
+
+        timestamp = int(time.time())
+        rows = [{
+            'club': club,
+            'season': season,
+            'player_id': player['player_id'],
+            'name': player['name'],
+            'appearances': player['appearances'],
+            'position': player.get('position'),
+            'sub_apps': player.get('sub_apps'),
+            'goals': player.get('goals'),
+            'yellow_cards': player.get('yellow_cards'),
+            'red_cards': player.get('red_cards'),
+            'player_url': player['player_url'],
+            'timestamp': timestamp
+        } for player in players]
+
+        with self.lock:
+            self.buffered_rows += len(rows) - len(self.rows.get((club, season), []))
+            self.rows[(club, season)] = rows
+            if self.buffered_rows >= self.batch_size:
+                self._flush_locked()
+        return True
+
+    def flush(self):
+        with self.lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self.rows:
+            return
+
+        for (club, season), rows in self.rows.items():
+            partition = os.path.join(self.directory, f"season={season}")
+            os.makedirs(partition, exist_ok=True)
+            table = pa.Table.from_pylist(rows, schema=self.schema)
+            # Dot-prefixed until complete: Parquet readers skip hidden files
+            tmp_path = os.path.join(partition, f".{club}.parquet.{uuid.uuid4().hex[:8]}.tmp")
+            pq.write_table(table, tmp_path, compression='zstd')
+            os.replace(tmp_path, os.path.join(partition, f"{club}.parquet"))
+            self.files_written += 1
+
+        log.info("Parquet sink flushed player rows",
+                 extra={'rows': self.buffered_rows, 'club_seasons': len(self.rows)})
+        self.rows = {}
+        self.buffered_rows = 0
+
+
+class MultiSink(OutputSink):
+    """Fans every write out to several sinks"""
+
+    name = 'multi'
+
+    def __init__(self, sinks: List[OutputSink]):
+        self.sinks = sinks
+        self.buffered = any(sink.buffered for sink in sinks)
+
+    def write(self, club: str, season: str, players: List[dict], html_length: int) -> bool:
+        results = [sink.write(club, season, players, html_length) for sink in self.sinks]
+        return any(results)
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+def build_sink(names: List[str], output_dir: str, parquet_dir: Optional[str] = None,
+               batch_size: int = 5000, results_db: Optional[str] = None) -> OutputSink:
+    """Create the configured sinks; unavailable ones are skipped with a warning"""
+    sinks: List[OutputSink] = []
+    for name in names:
+        try:
+            if name == 'json':
+                sinks.append(JsonTxtSink(output_dir))
+            elif name == 'parquet':
+                sinks.append(ParquetSink(parquet_dir or os.path.join(output_dir, 'players_parquet'), batch_size))
+            elif name == 'sqlite':
+                from results_store import ResultsStore
+                sinks.append(ResultsStore(results_db or os.path.join(output_dir, 'results.sqlite3')))
+            else:
+                log.warning("Unknown output sink ignored", extra={'sink': name})
+        except ImportError as e:
+            log.warning("Output sink unavailable", extra={'sink': name, 'error': str(e)})
+
+    if not sinks:
+        log.warning("No output sink available, falling back to json")
+        sinks.append(JsonTxtSink(output_dir))
+    return sinks[0] if len(sinks) == 1 else MultiSink(sinks)
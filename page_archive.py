@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+RAW PAGE ARCHIVE
+================
+Every page fetched through FlareSolverr is appended, compressed, to an
+append-only segment file, so extraction can be re-run later without going
+back through Cloudflare (see reprocess.py).
+
+- segment-000001.seg holds back-to-back compressed pages (zstd when the
+  zstandard package is installed, else gzip), each compressed on its own
+- segment-000001.idx has one JSON line per page: url, season, fetch time,
+  codec, offset and length in the segment, sizes and content hash
+- a new segment is started once the current one exceeds segment_bytes
+
+The index line is written after the page bytes, so a crash can only leave
+unindexed bytes at the end of a segment, which readers never look at.
+Readers mmap whole segments and slice pages out by offset.
+"""
+
+import glob
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_CODEC = 'zstd' if zstandard is not None else 'gzip'
+URL_PATTERN = re.compile(r'\.co\.uk/([^/?]+)/appearances(?:/(\d{4}-\d{4}))?(?:\?page=(\d+))?$')
+
+
+def appearances_url_parts(url: str) -> Tuple[Optional[str], Optional[str], int]:
+    """(club, season, page) of an appearances URL; season is None for the season index page
+
+    Anything else (player pages, club listings) gives (None, None, 1).
+    """
+    match = URL_PATTERN.search(url)
+    if not match:
+        return None, None, 1
+    return match.group(1), match.group(2), int(match.group(3) or 1)
+
+
+def compress(raw: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=10).compress(raw)
+    return gzip.compress(raw, compresslevel=6)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("page archived with zstd, but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class PageArchive:
+    """Thread-safe appender and mmap reader for one archive directory"""
+
+    def __init__(self, directory: str, segment_bytes: int = 256 * 1024 ** 2, codec: str = DEFAULT_CODEC):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.codec = codec
+        self.pages_written = 0
+        self.lock = threading.Lock()
+        self._segment: Optional[int] = None
+        self._data = None
+        self._index = None
+        self._maps: Dict[str, Tuple[int, mmap.mmap]] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _segment_paths(self, number: int) -> Tuple[str, str]:
+        base = os.path.join(self.directory, f"segment-{number:06d}")
+        return base + '.seg', base + '.idx'
+
+    def segments(self) -> List[int]:
+        """Numbers of the segments on disk, oldest first"""
+        numbers = []
+        for path in glob.glob(os.path.join(self.directory, "segment-*.idx")):
+            numbers.append(int(os.path.basename(path)[len('segment-'):-len('.idx')]))
+        return sorted(numbers)
+
+    # ── Writing ─────────────────────────────────────────────────────────────────
+
+    def _open_segment_locked(self):
+        existing = self.segments()
+        number = existing[-1] if existing else 1
+        data_path, _ = self._segment_paths(number)
+        if os.path.exists(data_path) and os.path.getsize(data_path) >= self.segment_bytes:
+            number += 1
+        self._roll_locked(number)
+
+    def _roll_locked(self, number: int):
+        self._close_files_locked()
+        data_path, index_path = self._segment_paths(number)
+        self._segment = number
+        self._data = open(data_path, 'ab')
+        self._index = open(index_path, 'ab')
+        if self._index.tell():
+            with open(index_path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self._index.write(b'\n')  # Finish a line torn by a crash so the next entry starts cleanly
+
+    def append(self, url: str, html_content: str, metadata: Optional[Dict] = None,
+               fetched_at: Optional[float] = None):
+        """Compress and append one fetched page (`fetched_at` defaults to now)"""
+        raw = html_content.encode('utf-8')
+        data = compress(raw, self.codec)
+        entry = dict(metadata or {})
+        entry.update({
+            'url': url,
+            'season': appearances_url_parts(url)[1],
+            'fetched_at': fetched_at or time.time(),
+            'codec': self.codec,
+            'length': len(data),
+            'html_length': len(raw),
+            'content_sha256': hashlib.sha256(raw).hexdigest()
+        })
+
+        with self.lock:
+            if self._data is None:
+                self._open_segment_locked()
+            elif self._data.tell() >= self.segment_bytes:
+                self._roll_locked(self._segment + 1)
+            entry['segment'] = self._segment
+            entry['offset'] = self._data.tell()
+            self._data.write(data)
+            self._data.flush()
+            self._index.write(json.dumps(entry).encode('utf-8') + b'\n')
+            self._index.flush()
+            self.pages_written += 1
+
+    def _close_files_locked(self):
+        for handle in (self._data, self._index):
+            if handle is not None:
+                handle.close()
+        self._data = None
+        self._index = None
+
+    # ── Reading ─────────────────────────────────────────────────────────────────
+
+    def iter_index(self, segments: Optional[List[int]] = None) -> Iterator[dict]:
+        """Index entries of the given segments (default: all), in append order"""
+        for number in segments if segments is not None else self.segments():
+            _, index_path = self._segment_paths(number)
+            with open(index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue  # Torn last line after a crash
+
+    def latest_entries(self) -> List[dict]:
+        """The most recent archived copy of every URL"""
+        latest: Dict[str, dict] = {}
+        for entry in self.iter_index():
+            previous = latest.get(entry['url'])
+            if previous is None or entry['fetched_at'] >= previous['fetched_at']:
+                latest[entry['url']] = entry
+        return list(latest.values())
+
+    def _map(self, number: int, needed: int) -> mmap.mmap:
+        data_path, _ = self._segment_paths(number)
+        cached = self._maps.get(data_path)
+        if cached is None or cached[0] < needed:
+            if cached is not None:
+                cached[1].close()
+            with open(data_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[data_path] = (size, mapped)
+            cached = self._maps[data_path]
+        return cached[1]
+
+    def read(self, entry: dict) -> str:
+        """HTML of one index entry"""
+        end = entry['offset'] + entry['length']
+        with self.lock:
+            data = self._map(entry['segment'], end)[entry['offset']:end]
+        return decompress(data, entry['codec']).decode('utf-8')
+
+    def close(self):
+        with self.lock:
+            self._close_files_locked()
+            for _, mapped in self._maps.values():
+                mapped.close()
+            self._maps.clear()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+APPEARANCES PAGE PARSER
+=======================
+Parses a Football Web Pages appearances page into a single BeautifulSoup tree
+and exposes everything the scraper needs from it: the players table, the
+pagination pages and the season options, plus merge_pages() to combine the
+players of a club-season's pages. Uses lxml when it is installed and falls back
+to the standard library html.parser.
+"""
+
+import importlib.util
+import re
+from typing import Dict, List
+
+from bs4 import BeautifulSoup
+
+from column_mapper import build_player, map_columns
+
+PARSER_FEATURES = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+SEASON_PATTERN = re.compile(r'(\d{4}-\d{4})')
+PAGINATION_SELECTORS = [
+    'a[href*="?page="]',
+    '.pagination a',
+    '.page-numbers a',
+    'a[href*="page="]'
+]
+MAX_PAGES = 10  # Reasonable limit
+
+
+class AppearancesPage:
+    """One fetched page, parsed once"""
+
+    def __init__(self, html_content: str, features: str = PARSER_FEATURES):
+        self.html_content = html_content
+        self.soup = BeautifulSoup(html_content, features)
+        self._players_table = None
+        self._players_table_searched = False
+
+    @property
+    def players_table(self):
+        """The first <table> containing player /appearances/ links, or None"""
+        if not self._players_table_searched:
+            self._players_table_searched = True
+            for table in self.soup.find_all('table'):
+                if table.find('a', href=lambda x: x and '/appearances/' in x):
+                    self._players_table = table
+                    break
+        return self._players_table
+
+    @property
+    def has_table(self) -> bool:
+        return self.soup.find('table') is not None
+
+    @property
+    def headers(self) -> List[str]:
+        """Lower-cased header cells of the players table"""
+        headers = []
+        if self.players_table:
+            header_row = self.players_table.find('tr')
+            if header_row:
+                for th in header_row.find_all(['th', 'td']):
+                    headers.append(th.get_text(strip=True).lower())
+        return headers
+
+    def extract_players(self) -> List[dict]:
+        """Player name, link, id, appearances and every other stat column (see column_mapper.py)"""
+        players = []
+        if not self.players_table:
+            return players
+
+        columns = map_columns(self.headers)
+        for row in self.players_table.find_all('tr')[1:]:  # Skip header row
+            cells = row.find_all(['td', 'th'])
+            if len(cells) < 2:
+                continue
+
+            player_link = row.find('a', href=True)
+            if not player_link or '/appearances/' not in player_link.get('href', ''):
+                continue  # Skip rows without player links
+
+            # Only players with appearances are kept
+            player = build_player(player_link.get_text(strip=True), player_link.get('href'),
+                                  [cell.get_text(strip=True) for cell in cells], columns)
+            if player:
+                players.append(player)
+
+        return players
+
+    @property
+    def pagination_pages(self) -> List[int]:
+        """Sorted page numbers (2..MAX_PAGES) linked from this page"""
+        page_numbers = set()
+
+        for selector in PAGINATION_SELECTORS:
+            for link in self.soup.select(selector):
+                href = link.get('href', '')
+                if '?page=' in href:
+                    try:
+                        page_num = int(href.split('?page=')[1].split('&')[0])
+                    except ValueError:
+                        continue
+                    if page_num <= MAX_PAGES:
+                        page_numbers.add(page_num)
+
+        # Also look for page number text
+        for link in self.soup.find_all('a', href=True):
+            text = link.get_text(strip=True)
+            if text.isdigit():
+                page_num = int(text)
+                if 1 < page_num <= MAX_PAGES:
+                    page_numbers.add(page_num)
+
+        return sorted(page_numbers)
+
+    @property
+    def seasons(self) -> List[str]:
+        """Seasons offered by the page, most recent first"""
+        seasons = []
+
+        # Look for season selector dropdown
+        season_select = self.soup.find('select')
+        if season_select:
+            for option in season_select.find_all('option'):
+                season_value = option.get('value')
+                if season_value and '-' in season_value:
+                    seasons.append(season_value)
+
+        # Fallback: look for season links in the page
+        if not seasons:
+            for link in self.soup.find_all('a', href=True):
+                href = link.get('href', '')
+                if '/appearances/' in href:
+                    match = SEASON_PATTERN.search(href)
+                    if match:
+                        seasons.append(match.group(1))
+
+        # Additional fallback: any reasonable season (2010-2030) in the page text
+        if not seasons:
+            for match in SEASON_PATTERN.findall(self.soup.get_text()):
+                if 2010 <= int(match.split('-')[0]) <= 2030:
+                    seasons.append(match)
+
+        return sorted(set(seasons), reverse=True)
+
+
+def as_page(html_or_page) -> AppearancesPage:
+    """Accept either raw HTML or an already parsed page"""
+    if isinstance(html_or_page, AppearancesPage):
+        return html_or_page
+    return AppearancesPage(html_or_page)
+
+
+def merge_pages(players_by_page: Dict[int, List[dict]]) -> List[dict]:
+    """Players of all pages of a club-season in page order, first occurrence of each name kept"""
+    unique_players = []
+    seen_names = set()
+    for number in sorted(players_by_page):
+        for player in players_by_page[number]:
+            if player['name'] not in seen_names:
+                seen_names.add(player['name'])
+                unique_players.append(player)
+    return unique_players
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+GLOBAL PLAYER INDEX
+===================
+Second crawl stage keyed by player_id. Every club-season table lists players
+with a link to their page; a player who moved clubs shows up in several tables
+but their page is fetched once (the job store's player_jobs table de-duplicates
+and remembers what reruns can skip).
+
+- parse_player_page() reads the career table(s) of a player page with the same
+  header-driven column mapper as the appearances tables: one row per season and
+  club with apps, sub apps, goals and cards. The club is the slug of the row's
+  club link (/<slug>/appearances[/<season>], club_registry.CLUB_LINK_PATTERN),
+  else the slugified cell text
+- PlayerIndex keeps them in the results database next to the players table:
+  player_index (one row per player) and player_careers (their career rows)
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+from club_registry import CLUB_LINK_PATTERN, slugify
+from column_mapper import cell_values, map_columns
+from page_parser import PARSER_FEATURES
+
+SEASON_PATTERN = re.compile(r'(\d{4}-\d{4})')
+CAREER_FIELDS = ['appearances', 'sub_apps', 'goals', 'yellow_cards', 'red_cards']
+
+
+def _career_row(row, columns: List[str]) -> Optional[dict]:
+    cells = row.find_all(['td', 'th'])
+    values = cell_values(columns, [cell.get_text(strip=True) for cell in cells])
+
+    # Club and season links are more reliable than the cell text
+    for link in row.find_all('a', href=True):
+        match = CLUB_LINK_PATTERN.match(link['href'])
+        if match:
+            values['club'] = match.group(1)
+            values['season'] = match.group(2) or values.get('season')
+            break
+    else:
+        values['club'] = slugify(values.get('club') or '') or None
+    season = SEASON_PATTERN.search(values.get('season') or '')
+    if not season or not values.get('club'):
+        return None
+
+    career = {'season': season.group(1), 'club': values['club']}
+    career.update({field: values.get(field) for field in CAREER_FIELDS})
+    return career
+
+
+def parse_player_page(html_content: str) -> dict:
+    """Name and career rows (season, club, stats) of a player page"""
+    soup = BeautifulSoup(html_content, PARSER_FEATURES)
+    heading = soup.find('h1')
+    career = []
+    for table in soup.find_all('table'):
+        rows = table.find_all('tr')
+        if not rows:
+            continue
+        columns = map_columns([cell.get_text(strip=True) for cell in rows[0].find_all(['th', 'td'])])
+        if columns is None:
+            continue  # Not a stats table
+        for row in rows[1:]:
+            entry = _career_row(row, columns)
+            if entry:
+                career.append(entry)
+    return {'name': heading.get_text(strip=True) if heading else None, 'career': career}
+
+
+class PlayerIndex:
+    """Thread-safe SQLite index: player_id -> name, page URL and career rows"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS player_index (
+                player_id TEXT PRIMARY KEY,
+                name TEXT,
+                player_url TEXT NOT NULL,
+                career_rows INTEGER NOT NULL,
+                fetched_at INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS player_careers (
+                player_id TEXT NOT NULL,
+                season TEXT NOT NULL,
+                club TEXT NOT NULL,
+                appearances INTEGER,
+                sub_apps INTEGER,
+                goals INTEGER,
+                yellow_cards INTEGER,
+                red_cards INTEGER,
+                PRIMARY KEY (player_id, season, club)
+            );
+            CREATE INDEX IF NOT EXISTS player_careers_club ON player_careers (club, season);
+        """)
+
+    def save(self, player_id: str, name: Optional[str], player_url: str, career: List[dict]):
+        """Replace a player's entry and career rows in one transaction"""
+        rows = [(player_id, entry['season'], entry['club'], *(entry[field] for field in CAREER_FIELDS))
+                for entry in career]
+        with self.lock:
+            self.conn.execute("BEGIN")
+            self.conn.execute(
+                "INSERT OR REPLACE INTO player_index (player_id, name, player_url, career_rows, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)", (player_id, name, player_url, len(rows), int(time.time())))
+            self.conn.execute("DELETE FROM player_careers WHERE player_id = ?", (player_id,))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO player_careers (player_id, season, club, appearances, sub_apps, goals, "
+                "yellow_cards, red_cards) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.conn.execute("COMMIT")
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Dict]:
+        with self.lock:
+            cursor = self.conn.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def player(self, player_id: str) -> Optional[Dict]:
+        rows = self._query("SELECT * FROM player_index WHERE player_id = ?", (player_id,))
+        return rows[0] if rows else None
+
+    def career(self, player_id: str) -> List[Dict]:
+        """Career rows from the player's page, most recent first
+
+        Players whose page had no career table fall back to the club-season rows
+        the crawl itself wrote (the sqlite sink's players table).
+        """
+        rows = self._query("SELECT season, club, appearances, sub_apps, goals, yellow_cards, red_cards "
+                           "FROM player_careers WHERE player_id = ? ORDER BY season DESC, club", (player_id,))
+        if rows:
+            return rows
+        try:
+            return self._query("SELECT season, club, appearances, sub_apps, goals, yellow_cards, red_cards "
+                               "FROM players WHERE player_id = ? ORDER BY season DESC, club", (player_id,))
+        except sqlite3.OperationalError:
+            return []  # No sqlite sink in this database
+
+    def count(self) -> int:
+        return self._query("SELECT COUNT(*) AS players FROM player_index")[0]['players']
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+PER-HOST RATE LIMITER
+=====================
+Token buckets shared by every crawl worker, so the whole process stays under a
+global requests-per-second budget for a host no matter how many workers run.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at `rate` tokens per second"""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(burst, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.waited = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> float:
+        """Block until a token is available; returns the seconds spent waiting"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.waited += waited
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class HostRateLimiter:
+    """Maps hostnames to their own token bucket; hosts without a limit pass straight through"""
+
+    def __init__(self, limits: Dict[str, float], burst: float = 1.0):
+        self.buckets = {host: TokenBucket(rate, burst) for host, rate in limits.items()}
+
+    def bucket_for(self, url: str) -> Optional[TokenBucket]:
+        return self.buckets.get(urlparse(url).hostname or '')
+
+    def acquire(self, url: str) -> float:
+        """Wait for permission to request `url`; returns the seconds spent waiting"""
+        bucket = self.bucket_for(url)
+        if bucket is None:
+            return 0.0
+        return bucket.acquire()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Re-run extraction over the raw page archive without touching the network
+
+Streams the latest archived copy of every appearances page through the current
+extractor in a pool of worker processes, merges each club-season's pages with
+the crawler's own merge_pages (recording page 1's html_length, as the crawler
+does), and writes the result to the chosen output sinks.
+
+    python reprocess.py                                  # /data/page_archive -> ./reprocessed
+    python reprocess.py --import-cache                   # first backfill the archive from the HTML cache
+    python reprocess.py --sinks json,parquet --workers 8
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from data_paths import ARCHIVE_DIR, HTML_CACHE_DIR
+from extractors import DEFAULT_EXTRACTOR, get_extractor
+from html_cache import HtmlCache
+from output_sinks import build_sink
+from page_archive import PageArchive, appearances_url_parts
+from page_parser import merge_pages
+from structured_logging import setup_logging, stop_logging
+
+CHUNK_PAGES = 200  # Pages handed to a worker process at a time
+
+log = logging.getLogger("reprocess")
+
+
+def extract_chunk(archive_dir: str, entries: List[dict], extractor_name: str) -> List[Tuple[str, List[dict]]]:
+    """Worker process: (url, players) for every entry of one chunk"""
+    archive = PageArchive(archive_dir)
+    extractor = get_extractor(extractor_name)
+    try:
+        return [(entry['url'], extractor(archive.read(entry))) for entry in entries]
+    finally:
+        archive.close()
+
+
+def chunks(entries: List[dict], size: int) -> List[List[dict]]:
+    """Split entries into chunks, keeping each chunk inside one segment so a worker maps one file"""
+    entries = sorted(entries, key=lambda entry: (entry['segment'], entry['offset']))
+    result: List[List[dict]] = []
+    for entry in entries:
+        if not result or len(result[-1]) >= size or result[-1][-1]['segment'] != entry['segment']:
+            result.append([])
+        result[-1].append(entry)
+    return result
+
+
+def import_cache(archive: PageArchive, cache_dir: str) -> int:
+    """Append every page of the HTML cache that the archive does not hold yet"""
+    archived = {entry['content_sha256'] for entry in archive.iter_index()}
+    cache = HtmlCache(cache_dir, current_season='')
+    imported = 0
+    for metadata, html_content in cache.iter_entries():
+        if metadata.get('content_sha256') in archived:
+            continue
+        archive.append(metadata['url'], html_content, fetched_at=metadata.get('fetched_at'))
+        imported += 1
+    return imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--archive', default=ARCHIVE_DIR)
+    parser.add_argument('--output-dir', default='reprocessed')
+    parser.add_argument('--sinks', default='json,sqlite', help='comma-separated: json, parquet, sqlite')
+    parser.add_argument('--extractor', default=DEFAULT_EXTRACTOR)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--import-cache', nargs='?', const=HTML_CACHE_DIR, metavar='CACHE_DIR',
+                        help='first copy pages from the HTML cache into the archive')
+    parser.add_argument('--log-level', default='INFO')
+    parser.add_argument('--log-format', default='text', choices=['json', 'text'])
+    args = parser.parse_args()
+    setup_logging(args.log_level, args.log_format)
+
+    try:
+        archive = PageArchive(args.archive)
+        if args.import_cache:
+            imported = import_cache(archive, args.import_cache)
+            log.info("Imported pages from the HTML cache", extra={'pages': imported, 'cache': args.import_cache})
+        archive.close()
+
+        # Season index pages only list seasons; every other page holds players
+        entries = [entry for entry in archive.latest_entries() if appearances_url_parts(entry['url'])[1]]
+        if not entries:
+            log.warning("No archived appearances pages", extra={'archive': args.archive})
+            return 1
+
+        started = time.time()
+        html_lengths = {entry['url']: entry['html_length'] for entry in entries}
+        pages_by_season: Dict[Tuple[str, str], Dict[int, List[dict]]] = {}
+        lengths_by_season: Dict[Tuple[str, str], int] = {}
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = [pool.submit(extract_chunk, args.archive, chunk, args.extractor)
+                       for chunk in chunks(entries, CHUNK_PAGES)]
+            for future in futures:
+                for url, players in future.result():
+                    club, season, page = appearances_url_parts(url)
+                    pages_by_season.setdefault((club, season), {})[page] = players
+                    if page == 1:
+                        lengths_by_season[(club, season)] = html_lengths[url]
+
+        os.makedirs(args.output_dir, exist_ok=True)
+        sink = build_sink(args.sinks.split(','), args.output_dir,
+                          os.path.join(args.output_dir, 'players_parquet'),
+                          results_db=os.path.join(args.output_dir, 'results.sqlite3'))
+        written = 0
+        for (club, season), pages in sorted(pages_by_season.items()):
+            if sink.write(club, season, merge_pages(pages), lengths_by_season.get((club, season), 0)):
+                written += 1
+        sink.close()
+
+        elapsed = time.time() - started
+        log.info("Reprocessed archive", extra={
+            'pages': len(entries), 'club_seasons': len(pages_by_season), 'written': written,
+            'seconds': round(elapsed, 1), 'pages_per_second': round(len(entries) / elapsed, 1),
+            'workers': args.workers, 'extractor': args.extractor, 'output_dir': args.output_dir})
+        return 0
+    finally:
+        stop_logging()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+REQUEST COALESCING
+==================
+Single-flight layer in front of the page fetch path, so concurrent callers of
+one URL cost one FlareSolverr request:
+
+- concurrent callers asking for the same normalized URL share one in-flight
+  fetch; followers block until the leader has the result (or its failure), so
+  the page they get was fetched while they waited, whatever session they hold
+- pages are not kept once the fetch is done: a later caller gets them from the
+  HTML cache on disk, or fetches again when it asked for a refresh
+- failures are shared with the callers already waiting (each raises its own
+  copy) and remembered for the run only when `remember_error` says they cannot
+  change within it (e.g. a 404); `refresh` skips that memo too
+
+URLs are normalized first: scheme and host lower-cased, default port, fragment
+and trailing slash dropped, query parameters sorted and `page=1` removed, since
+page 1 of a season is the season URL itself.
+"""
+
+import copy
+import threading
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from metrics import FETCHES_SAVED
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a page URL, so spellings of the same page share one fetch"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip('/') or '/'
+    query = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not (name == 'page' and value == '1'))
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
+class _Call:
+    """One in-flight fetch that followers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+def _fresh_error(error: BaseException) -> BaseException:
+    """A copy of `error` for one more caller, so threads never raise (and extend the traceback of) one object"""
+    try:
+        return copy.copy(error)
+    except Exception:
+        return error  # An exception type copy cannot rebuild
+
+
+class RequestCoalescer:
+    """Thread-safe single-flight fetches plus a per-run memo of permanent failures"""
+
+    def __init__(self, remember_error: Callable[[BaseException], bool] = lambda error: False):
+        self.remember_error = remember_error
+        self.failures: Dict[str, BaseException] = {}
+        self.in_flight: Dict[str, _Call] = {}
+        self.fetched = 0
+        self.saved = {'in_flight': 0, 'memo': 0}
+        self.lock = threading.Lock()
+
+    def fetch(self, url: str, fetch: Callable[[], Any], refresh: bool = False) -> Any:
+        """Result of `fetch()` for `url`, shared with every concurrent caller of the same normalized URL
+
+        `refresh` ignores a remembered failure of the URL (it still joins a fetch already in flight).
+        """
+        key = normalize_url(url)
+        with self.lock:
+            failure = None if refresh else self.failures.get(key)
+            if failure is not None:
+                self._saved_locked('memo')
+            else:
+                call = self.in_flight.get(key)
+                leader = call is None
+                if leader:
+                    call = self.in_flight[key] = _Call()
+                else:
+                    self._saved_locked('in_flight')
+
+        if failure is not None:
+            raise _fresh_error(failure) from failure
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise _fresh_error(call.error) from call.error
+            return call.result
+
+        try:
+            call.result = fetch()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            self._finish(key, call)
+        return call.result
+
+    def _saved_locked(self, reason: str):
+        self.saved[reason] += 1
+        FETCHES_SAVED.inc(reason=reason)
+
+    def _finish(self, key: str, call: _Call):
+        with self.lock:
+            del self.in_flight[key]
+            self.fetched += 1
+            if call.error is None:
+                self.failures.pop(key, None)  # A refresh that succeeded
+            elif self.remember_error(call.error):
+                self.failures[key] = call.error
+        call.done.set()
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {'fetched': self.fetched, 'saved_in_flight': self.saved['in_flight'],
+                    'saved_memo': self.saved['memo'], 'failures_remembered': len(self.failures)}
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+SQLITE RESULTS STORE
+====================
+Output sink that keeps every player row in an indexed SQLite database keyed
+on (club, season, player_id); writing a club-season replaces all of its rows,
+so a player who left the table does not linger. Plus a small query API so
+questions like "which clubs has this player appeared for?" no longer need a
+scan of the JSON output tree.
+"""
+
+import sqlite3
+import threading
+import time
+from typing import List, Dict, Optional
+
+from output_sinks import OutputSink
+
+STAT_COLUMNS = [('position', 'TEXT'), ('sub_apps', 'INTEGER'), ('goals', 'INTEGER'),
+                ('yellow_cards', 'INTEGER'), ('red_cards', 'INTEGER')]
+
+
+class ResultsStore(OutputSink):
+    """WAL-mode SQLite sink with player/club/season queries; each write is committed before it returns"""
+
+    name = 'sqlite'
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS players (
+                club TEXT NOT NULL,
+                season TEXT NOT NULL,
+                player_id TEXT NOT NULL,
+                name TEXT NOT NULL,
+                appearances INTEGER NOT NULL,
+                position TEXT,
+                sub_apps INTEGER,
+                goals INTEGER,
+                yellow_cards INTEGER,
+                red_cards INTEGER,
+                player_url TEXT,
+                updated_at INTEGER NOT NULL,
+                PRIMARY KEY (club, season, player_id)
+            );
+            CREATE INDEX IF NOT EXISTS players_player_id ON players (player_id);
+            CREATE INDEX IF NOT EXISTS players_season_apps ON players (season, appearances DESC);
+        """)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(players)")]
+        for column, column_type in STAT_COLUMNS:
+            if column not in columns:  # Results databases created before the stat columns were extracted
+                self.conn.execute(f"ALTER TABLE players ADD COLUMN {column} {column_type}")
+
+    def write(self, club: str, season: str, players: List[dict], html_length: int) -> bool:
+        """Replace one club-season's rows in a single transaction"""
+        if not players:
+            return False
+
+        now = int(time.time())
+        rows = [(club, season, player['player_id'], player['name'], player['appearances'],
+                 *(player.get(column) for column, _ in STAT_COLUMNS), player['player_url'], now)
+                for player in players]
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.execute("DELETE FROM players WHERE club = ? AND season = ?", (club, season))
+                self._upsert_locked(rows)
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+        return True
+
+    def _upsert_locked(self, rows: List[tuple]):
+        self.conn.executemany("""
+            INSERT INTO players (club, season, player_id, name, appearances, position, sub_apps, goals,
+                                 yellow_cards, red_cards, player_url, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (club, season, player_id) DO UPDATE SET
+                name = excluded.name,
+                appearances = excluded.appearances,
+                position = excluded.position,
+                sub_apps = excluded.sub_apps,
+                goals = excluded.goals,
+                yellow_cards = excluded.yellow_cards,
+                red_cards = excluded.red_cards,
+                player_url = excluded.player_url,
+                updated_at = excluded.updated_at
+        """, rows)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Dict]:
+        with self.lock:
+            cursor = self.conn.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    # ── Query API ───────────────────────────────────────────────────────────────
+
+    def players_for_club(self, club: str, season: Optional[str] = None) -> List[Dict]:
+        """Players of a club (optionally one season), most appearances first"""
+        if season:
+            return self._query(
+                "SELECT * FROM players WHERE club = ? AND season = ? ORDER BY appearances DESC",
+                (club, season)
+            )
+        return self._query(
+            "SELECT * FROM players WHERE club = ? ORDER BY season DESC, appearances DESC", (club,)
+        )
+
+    def clubs_for_player(self, player_id: str) -> List[Dict]:
+        """Every club-season a player appeared in, most recent first"""
+        return self._query(
+            "SELECT club, season, name, appearances, sub_apps, goals FROM players WHERE player_id = ? "
+            "ORDER BY season DESC",
+            (player_id,)
+        )
+
+    def top_appearances(self, season: str, limit: int = 20) -> List[Dict]:
+        """Players with the most appearances in a season across all clubs"""
+        return self._query(
+            "SELECT * FROM players WHERE season = ? ORDER BY appearances DESC LIMIT ?",
+            (season, limit)
+        )
+
+    def top_scorers(self, season: str, limit: int = 20) -> List[Dict]:
+        """Players with the most goals in a season across all clubs"""
+        return self._query(
+            "SELECT * FROM players WHERE season = ? AND goals IS NOT NULL ORDER BY goals DESC LIMIT ?",
+            (season, limit)
+        )
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+STRUCTURED LOGGING
+==================
+Leveled logging for the scraper. Worker threads only put records on a queue
+(QueueHandler); one QueueListener thread formats and writes them, so a slow
+stdout on the Render worker never blocks a crawl.
+
+- json: one JSON object per line with timestamp, level, logger, message and
+        any fields passed through `extra=` (club, season, url, kind...)
+- text: a compact human-readable line for local runs
+
+Modules log through logging.getLogger(__name__); call setup_logging() once at
+start-up and stop_logging() at exit to flush the queue; forked worker processes
+call setup_worker_logging() instead, since the queue they inherit has no
+listener. Work that only serves a debug message should be guarded with
+log.isEnabledFor(logging.DEBUG).
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+from typing import Optional
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def record_fields(record: logging.LogRecord) -> dict:
+    """The structured fields attached to a record via `extra=`"""
+    return {key: value for key, value in vars(record).items()
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_')}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage(),
+        }
+        entry.update(record_fields(record))
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Time, level, message and key=value fields on one line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = f"{time.strftime('%H:%M:%S', time.localtime(record.created))} {record.levelname:7} {record.getMessage()}"
+        fields = record_fields(record)
+        if fields:
+            line += "  " + " ".join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+def setup_logging(level: str = 'INFO', fmt: str = 'json', stream=None) -> logging.handlers.QueueListener:
+    """Route every logger through a queue to one writer thread (idempotent: reconfigures on a second call)"""
+    global _listener
+    stop_logging()
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter() if fmt == 'json' else TextFormatter())
+
+    records = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(records))
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+
+    _listener = logging.handlers.QueueListener(records, output, respect_handler_level=False)
+    _listener.start()
+    return _listener
+
+
+def setup_worker_logging():
+    """In a forked worker process, write records straight through the parent's output handler
+
+    The inherited QueueHandler feeds a copy of the queue whose listener thread only
+    exists in the parent, so without this every record logged in the child is lost.
+    """
+    global _listener
+    listener, _listener = _listener, None
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    if listener is not None:
+        for handler in listener.handlers:
+            root.addHandler(handler)
+
+
+def stop_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
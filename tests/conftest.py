@@ -0,0 +1,43 @@
+import os
+import sys
+
+import pytest
+
+# The project is a set of top-level modules, not a package: make them importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SINGLETONS = ['_balancer', '_session_pool', '_job_store', '_html_cache', '_output_sink', '_page_archive',
+              '_pipeline', '_coalescer', '_club_registry', '_player_index']
+
+
+@pytest.fixture
+def mock_flaresolverr():
+    from mock_flaresolverr import MockFlareSolverr
+
+    mock = MockFlareSolverr()
+    mock.start()
+    yield mock
+    mock.stop()
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch, mock_flaresolverr):
+    """The scraper module pointed at a mock FlareSolverr and a scratch data directory, parsing in-thread"""
+    import ultimate_football_scraper_render as scraper
+    from rate_limiter import HostRateLimiter
+
+    for name in SINGLETONS:
+        monkeypatch.setattr(scraper, name, None)
+    monkeypatch.setattr(scraper, '_prefetched_pages', {})
+    for name in ('JOB_DB_FILE', 'HTML_CACHE_DIR', 'RESULTS_DB_FILE', 'ARCHIVE_DIR', 'CLUB_REGISTRY_FILE',
+                 'PARQUET_DIR', 'METRICS_SNAPSHOT_FILE'):
+        monkeypatch.setattr(scraper, name, str(tmp_path / name.lower()))
+    monkeypatch.setattr(scraper, 'PLAYER_INDEX_DB', str(tmp_path / 'results_db_file'))
+    monkeypatch.setattr(scraper, 'OUTPUT_DIR', str(tmp_path / 'output'))
+    monkeypatch.setattr(scraper, 'OUTPUT_SINKS', ['sqlite'])
+    monkeypatch.setattr(scraper, 'FLARESOLVERR_URLS', [mock_flaresolverr.url])
+    monkeypatch.setattr(scraper, 'PARSE_WORKERS', 0)
+    monkeypatch.setattr(scraper, 'RETRY_DELAY_SCALE', 0.0)
+    monkeypatch.setattr(scraper, 'RATE_LIMITER', HostRateLimiter({'www.footballwebpages.co.uk': 1000}, burst=10))
+    yield scraper
+    scraper.shutdown()
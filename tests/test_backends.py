@@ -0,0 +1,202 @@
+"""CircuitBreaker transitions and BackendBalancer selection, draining and restarts"""
+
+import threading
+import time
+
+import pytest
+
+import flaresolverr_backends
+from circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+from flaresolverr_backends import BackendBalancer, NoHealthyBackend
+
+BREAKER = {'window': 10, 'failure_rate': 0.5, 'min_requests': 4, 'slow_call_seconds': 5.0, 'half_open_probes': 2}
+URLS = ["http://127.0.0.1:8191/v1", "http://127.0.0.1:8192/v1"]
+
+
+# ── CircuitBreaker ──────────────────────────────────────────────────────────────
+
+def test_breaker_needs_min_requests_before_tripping():
+    breaker = CircuitBreaker(**BREAKER)
+    assert not any(breaker.record(False) for _ in range(3))
+    assert breaker.state == CLOSED
+    assert breaker.record(False)
+    assert breaker.state == OPEN and breaker.trips == 1
+    assert not breaker.allows_request()
+
+
+def test_breaker_counts_slow_calls_as_failures():
+    breaker = CircuitBreaker(**BREAKER)
+    for _ in range(2):
+        breaker.record(True)
+    breaker.record(True, latency=6.0)
+    assert breaker.record(True, latency=6.0)
+    assert breaker.state == OPEN
+
+
+def test_breaker_ignores_late_results_while_open():
+    breaker = CircuitBreaker(**BREAKER)
+    breaker.trip()
+    assert not breaker.record(True)
+    assert breaker.state == OPEN
+
+
+def test_half_open_admits_probes_and_closes_after_they_pass():
+    breaker = CircuitBreaker(**BREAKER)
+    breaker.trip()
+    breaker.half_open()
+    assert breaker.state == HALF_OPEN
+    for _ in range(2):
+        assert breaker.allows_request()
+        breaker.on_dispatch()
+    assert not breaker.allows_request()  # Both probe slots taken
+
+    breaker.on_release()
+    breaker.record(True)
+    assert breaker.state == HALF_OPEN
+    breaker.on_release()
+    breaker.record(True)
+    assert breaker.state == CLOSED
+    assert breaker.allows_request()
+
+
+def test_half_open_failure_reopens():
+    breaker = CircuitBreaker(**BREAKER)
+    breaker.trip()
+    breaker.half_open()
+    breaker.on_dispatch()
+    assert breaker.record(False)
+    assert breaker.state == OPEN and breaker.trips == 2
+
+
+# ── BackendBalancer ─────────────────────────────────────────────────────────────
+
+class Restarter:
+    """restart() callable that reports success or failure and counts its calls"""
+
+    def __init__(self, succeed: bool = True):
+        self.succeed = succeed
+        self.calls = []
+
+    def __call__(self, backend) -> bool:
+        self.calls.append(backend.api_url)
+        return self.succeed
+
+
+def wait_for(condition, timeout: float = 2.0) -> bool:
+    """Poll until the restart thread has made `condition` true"""
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def balancer_factory(monkeypatch):
+    monkeypatch.setattr(flaresolverr_backends, 'RESTART_RETRY_DELAY', 0)
+    balancers = []
+
+    def make(restart=None, urls=URLS):
+        balancer = BackendBalancer(urls, restart=restart or Restarter(), breaker=BREAKER, acquire_timeout=2)
+        balancers.append(balancer)
+        return balancer
+
+    yield make
+    for balancer in balancers:
+        balancer.close()
+
+
+def test_least_outstanding_backend_is_chosen(balancer_factory):
+    balancer = balancer_factory()
+    first = balancer.acquire()
+    second = balancer.acquire()
+    assert first is not second
+    balancer.release(second)
+    assert balancer.acquire() is second  # 0 outstanding beats 1
+    balancer.release(first)
+    assert balancer.acquire() is first
+
+
+def test_ties_are_taken_in_turn(balancer_factory):
+    balancer = balancer_factory()
+    chosen = []
+    for _ in range(10):
+        backend = balancer.acquire()
+        chosen.append(backend.api_url)
+        balancer.release(backend)
+    assert chosen.count(URLS[0]) == chosen.count(URLS[1]) == 5
+
+
+def test_avoid_is_only_used_as_a_last_resort(balancer_factory):
+    balancer = balancer_factory()
+    one, two = balancer.backends
+    for _ in range(3):
+        backend = balancer.acquire(avoid=one)
+        assert backend is two
+        balancer.release(backend)
+    balancer_one = balancer_factory(urls=URLS[:1])
+    backend = balancer_one.acquire(avoid=balancer_one.backends[0])
+    assert backend is balancer_one.backends[0]
+
+
+def test_tripped_backend_drains_before_restart(balancer_factory):
+    restart = Restarter()
+    balancer = balancer_factory(restart)
+    one, two = balancer.backends
+    in_flight = balancer.acquire()
+    assert in_flight is one
+
+    balancer.mark_down(one)
+    assert not one.healthy
+    assert all(balancer.acquire() is two for _ in range(3))  # No new work reaches the tripped backend
+    assert restart.calls == []  # Still draining: one request in flight
+
+    balancer.release(in_flight)
+    assert wait_for(lambda: one.healthy)
+    assert one.breaker.state == HALF_OPEN
+    assert restart.calls == [one.api_url]
+    assert one.generation == 1 and one.restarts == 1
+
+
+def test_breaker_trip_from_recorded_failures_restarts_the_backend(balancer_factory):
+    restart = Restarter()
+    balancer = balancer_factory(restart, urls=URLS[:1])
+    for _ in range(4):
+        backend = balancer.acquire()
+        balancer.record(backend, success=False)
+        balancer.release(backend)
+        if not backend.healthy:
+            break
+    assert balancer.wait_healthy(2)
+    assert restart.calls == [URLS[0]]
+    assert balancer.backends[0].breaker.state == HALF_OPEN
+
+
+def test_backends_that_cannot_restart_fail_fast(balancer_factory):
+    balancer = balancer_factory(Restarter(succeed=False))
+    for backend in balancer.backends:
+        balancer.mark_down(backend)
+    assert not balancer.wait_healthy(5)
+    assert all(backend.given_up for backend in balancer.backends)
+    with pytest.raises(NoHealthyBackend):
+        balancer.acquire(timeout=5)
+
+
+def test_concurrent_acquire_release_keeps_counts_consistent(balancer_factory):
+    balancer = balancer_factory()
+
+    def worker():
+        for _ in range(200):
+            backend = balancer.acquire()
+            balancer.record(backend, success=True)
+            balancer.release(backend)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert [backend.outstanding for backend in balancer.backends] == [0, 0]
+    assert sum(backend.requests for backend in balancer.backends) == 1600
+    assert all(backend.healthy for backend in balancer.backends)
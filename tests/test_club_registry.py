@@ -0,0 +1,32 @@
+"""ClubRegistry: slugs confirmed or rejected by the crawl, persisted across runs"""
+
+from club_registry import ClubRegistry
+
+
+def test_confirmed_slug_is_verified_and_persisted(tmp_path):
+    path = str(tmp_path / 'registry.json')
+    registry = ClubRegistry(path)
+    assert registry.resolve_all(['Barnet', 'Barnet FC']) == ['barnet', 'barnet-fc']
+    assert registry.unverified() == ['Barnet', 'Barnet FC']
+
+    assert registry.confirm('barnet')
+    assert not registry.confirm('barnet')
+    registry.save()
+
+    assert ClubRegistry(path).unverified() == ['Barnet FC']
+
+
+def test_rejected_slug_is_skipped_until_the_index_offers_another(tmp_path):
+    path = str(tmp_path / 'registry.json')
+    registry = ClubRegistry(path)
+    registry.resolve_all(['Barnett Town'])
+    assert registry.reject('barnett-town')
+    registry.save()
+
+    registry = ClubRegistry(path)
+    assert registry.resolve_all(['Barnett Town']) == []
+    assert registry.rejected() == ['Barnett Town']
+
+    registry.index = {'barnett town': 'barnett-town-fc'}
+    assert registry.resolve_all(['Barnett Town']) == ['barnett-town-fc']
+    assert registry.rejected() == []
@@ -0,0 +1,44 @@
+"""CrawlPipeline write stage: a club-season's callbacks run only once its rows are flushed"""
+
+from crawl_pipeline import CrawlPipeline
+
+PLAYERS = [{'name': 'Sam Parker', 'appearances': 44}]
+
+
+def run_writes(write, flush=None, closed_first=False):
+    """Queue one club-season through a fresh pipeline; returns the callbacks that ran"""
+    done = []
+    pipeline = CrawlPipeline(write, flush=flush, parse_workers=0)
+    pipeline.start()
+    if closed_first:
+        pipeline.close()
+    pipeline.write('basford-united', '2023-2024', PLAYERS, 1000, on_written=lambda: done.append('done'))
+    pipeline.close()
+    return done
+
+
+def test_callback_runs_after_write_and_flush():
+    events = []
+    done = run_writes(lambda *args: events.append('write'), flush=lambda: events.append('flush'))
+    assert events == ['write', 'flush']
+    assert done == ['done']
+
+
+def test_failed_write_does_not_run_callback():
+    def failing_write(*args):
+        raise OSError("disk full")
+
+    assert run_writes(failing_write) == []
+
+
+def test_failed_flush_does_not_run_callback():
+    def failing_flush():
+        raise OSError("disk full")
+
+    assert run_writes(lambda *args: None, flush=failing_flush) == []
+
+
+def test_write_after_close_is_dropped_without_callback():
+    written = []
+    assert run_writes(lambda *args: written.append(args), closed_first=True) == []
+    assert written == []
@@ -0,0 +1,119 @@
+"""Every extractor backend against the fixtures, checked two ways
+
+The fixtures are synthetic pages (hand-built to look like Football Web Pages,
+not captured from the site), and the appearances goldens were generated with
+the bs4 backend. Comparing bs4 with them alone would be circular, so the
+appearances pages are also read by an independent oracle: the standard
+library's html.parser walking the players table cell by cell, with no
+BeautifulSoup or lxml involved.
+"""
+
+import glob
+import json
+import os
+from html.parser import HTMLParser
+
+import pytest
+
+from column_mapper import build_player, map_columns
+from extractors import EXTRACTORS
+from player_index import parse_player_page
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures")
+APPEARANCES_FIXTURES = sorted(glob.glob(os.path.join(FIXTURES_DIR, "*_appearances*.html")))
+PLAYER_FIXTURES = sorted(glob.glob(os.path.join(FIXTURES_DIR, "player_*.html")))
+
+
+class TableReader(HTMLParser):
+    """Rows of every top-level <table>: the stripped text of each cell and the first link of the row"""
+
+    def __init__(self):
+        super().__init__()
+        self.tables = []
+        self.depth = 0
+        self.row = None
+        self.cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'table':
+            self.depth += 1
+            if self.depth == 1:
+                self.tables.append([])
+        elif self.depth and tag == 'tr':
+            self.row = {'cells': [], 'link': None}
+            self.tables[-1].append(self.row)
+        elif self.row is not None and tag in ('td', 'th'):
+            self.cell = []
+            self.row['cells'].append(self.cell)
+        elif self.row is not None and tag == 'a' and self.row['link'] is None:
+            href = dict(attrs).get('href')
+            if href is not None:
+                self.row['link'] = {'href': href, 'text': []}
+
+    def handle_endtag(self, tag):
+        if tag == 'table':
+            self.depth -= 1
+            self.row = self.cell = None
+        elif tag == 'tr':
+            self.row = self.cell = None
+        elif tag in ('td', 'th'):
+            self.cell = None
+        elif tag == 'a' and self.row is not None and self.row['link'] is not None:
+            self.row['link']['closed'] = True
+
+    def handle_data(self, data):
+        if self.cell is not None:
+            self.cell.append(data.strip())
+        link = self.row['link'] if self.row is not None else None
+        if link is not None and not link.get('closed'):
+            link['text'].append(data.strip())
+
+
+def oracle_players(html_content):
+    """Player records of the first table with an /appearances/ link, read with html.parser"""
+    reader = TableReader()
+    reader.feed(html_content)
+    reader.close()
+    for rows in reader.tables:
+        if any(row['link'] and '/appearances/' in row['link']['href'] for row in rows):
+            break
+    else:
+        return []
+
+    columns = map_columns([''.join(cell) for cell in rows[0]['cells']])
+    players = []
+    for row in rows[1:]:
+        link = row['link']
+        if len(row['cells']) < 2 or link is None or '/appearances/' not in link['href']:
+            continue
+        player = build_player(''.join(link['text']), link['href'], [''.join(cell) for cell in row['cells']], columns)
+        if player:
+            players.append(player)
+    return players
+
+
+def read_fixture(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        html_content = f.read()
+    with open(path[:-len('.html')] + '.expected.json', 'r', encoding='utf-8') as f:
+        return html_content, json.load(f)
+
+
+@pytest.mark.parametrize('path', APPEARANCES_FIXTURES, ids=os.path.basename)
+def test_golden_matches_oracle(path):
+    html_content, expected = read_fixture(path)
+    assert expected, "a fixture without players checks nothing"
+    assert oracle_players(html_content) == expected
+
+
+@pytest.mark.parametrize('path', APPEARANCES_FIXTURES, ids=os.path.basename)
+@pytest.mark.parametrize('name', sorted(EXTRACTORS))
+def test_extractor_matches_golden(name, path):
+    html_content, expected = read_fixture(path)
+    assert EXTRACTORS[name](html_content) == expected
+
+
+@pytest.mark.parametrize('path', PLAYER_FIXTURES, ids=os.path.basename)
+def test_player_page_matches_golden(path):
+    html_content, expected = read_fixture(path)
+    assert parse_player_page(html_content) == expected
@@ -0,0 +1,46 @@
+"""Classification of FlareSolverr solutions and error messages into fetch failures"""
+
+import pytest
+
+from fetch_errors import (BackendDown, ChallengeUnsolved, FetchTimeout, NotFound,
+                          classify_error_message, classify_solution, is_challenge_page)
+from mock_flaresolverr import CHALLENGE_PAGE, NOT_FOUND_PAGE
+
+
+def solution(response: str, status: int = 200) -> dict:
+    return {'url': 'https://www.footballwebpages.co.uk/basford-united/appearances', 'status': status,
+            'response': response}
+
+
+@pytest.mark.parametrize('html_content', [
+    CHALLENGE_PAGE,
+    "<html><head><title>Attention Required! | Cloudflare</title></head><body></body></html>",
+    '<html><head><title>Loading</title></head><body><form id="challenge-form" action="/"></form></body></html>',
+    "<html><body><div class='cf-browser-verification'>Checking</div></body></html>",
+])
+def test_challenge_pages_are_recognised(html_content):
+    assert is_challenge_page(html_content)
+    assert isinstance(classify_solution(solution(html_content)), ChallengeUnsolved)
+
+
+def test_page_that_mentions_the_phrase_is_not_a_challenge():
+    html_content = ("<html><head><title>Basford United appearances</title></head><body>"
+                    "<p>Forum: why does the site ask me to verify you are human? Just a moment, I'll check.</p>"
+                    "<table><tr><th>Player</th></tr></table></body></html>")
+    assert not is_challenge_page(html_content)
+    assert classify_solution(solution(html_content)) is None
+
+
+def test_status_codes_decide_before_the_body():
+    assert isinstance(classify_solution(solution(NOT_FOUND_PAGE, status=404)), NotFound)
+    assert isinstance(classify_solution(solution("<html></html>", status=503)), ChallengeUnsolved)
+    assert classify_solution({'url': 'x', 'response': "<html></html>"}) is None  # No status: a 200
+
+
+@pytest.mark.parametrize('message, failure', [
+    ("Error: Error solving the challenge. Timeout after 60.0 seconds.", FetchTimeout),
+    ("Error: Cloudflare has blocked this request.", ChallengeUnsolved),
+    ("Error: Unable to process browser request. ProtocolError", BackendDown),
+])
+def test_error_messages(message, failure):
+    assert type(classify_error_message(message)) is failure
@@ -0,0 +1,184 @@
+"""JobStore against a scratch SQLite file, and the crawl steps that depend on its state"""
+
+import pytest
+
+from job_store import JobStore, DONE, FAILED, NOT_FOUND, PENDING, RUNNING
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.sqlite3'), max_attempts=2)
+    yield store
+    store.close()
+
+
+def test_running_counts_an_attempt(store):
+    store.add_seasons('basford-united', ['2023-2024', '2022-2023'])
+    assert store.open_seasons('basford-united') == ['2023-2024', '2022-2023']
+    store.mark_running('basford-united', '2023-2024')
+    assert store.job('basford-united', '2023-2024') == (RUNNING, 1, None, None)
+    assert store.open_seasons('basford-united') == ['2022-2023']
+
+
+def test_failed_season_is_retried_up_to_max_attempts(store):
+    for attempt in range(2):
+        assert store.open_seasons('basford-united') == (['2023-2024'] if attempt else [])
+        store.mark_running('basford-united', '2023-2024')
+        store.mark_failed('basford-united', '2023-2024', error='timed out', outcome='timeout')
+    assert store.job('basford-united', '2023-2024') == (FAILED, 2, 'timed out', 'timeout')
+    assert store.open_seasons('basford-united') == []  # Attempts spent
+
+
+def test_not_found_is_never_retried(store):
+    store.mark_running('basford-united', '2023-2024')
+    store.mark_not_found('basford-united', '2023-2024', error='HTTP 404')
+    assert store.job('basford-united', '2023-2024')[0] == NOT_FOUND
+    assert store.open_seasons('basford-united') == []
+
+
+def test_running_jobs_resume_after_a_crash(tmp_path):
+    path = str(tmp_path / 'jobs.sqlite3')
+    crashed = JobStore(path)
+    crashed.add_seasons('basford-united', ['2023-2024', '2022-2023'])
+    crashed.mark_running('basford-united', '2023-2024')
+    crashed.mark_done('basford-united', '2022-2023')
+    crashed.add_players([{'player_id': '7', 'player_url': '/p/7', 'name': 'A Player'}])
+    crashed.mark_player('7', RUNNING)
+    crashed.conn.close()  # No clean shutdown
+
+    store = JobStore(path)
+    assert store.open_seasons('basford-united') == []  # Still marked running
+    assert store.reset_interrupted() == 2
+    assert store.job('basford-united', '2023-2024')[:2] == (PENDING, 1)  # The attempt still counts
+    assert store.job('basford-united', '2022-2023')[0] == DONE
+    assert store.open_seasons('basford-united') == ['2023-2024']
+    assert store.open_players() == [('7', '/p/7', 'A Player')]
+    store.close()
+
+
+def test_page_rows_do_not_open_seasons(store):
+    store.add_seasons('basford-united', ['2023-2024'])
+    store.mark_done('basford-united', '2023-2024', page=2)
+    store.mark_not_found('basford-united', '2023-2024', page=3)
+    assert store.job('basford-united', '2023-2024', page=2)[0] == DONE
+    assert store.job('basford-united', '2023-2024', page=3)[0] == NOT_FOUND
+    assert store.open_seasons('basford-united') == ['2023-2024']  # Page 1 decides
+    assert dict(store.summary()) == {DONE: 1, NOT_FOUND: 1, PENDING: 1}
+
+
+def test_discovery_row_and_known_seasons(store):
+    store.add_clubs(['basford-united', 'ilkeston-town'])
+    assert store.needs_discovery('basford-united')
+    store.save_seasons('basford-united', ['2023-2024', '2022-2023'], source_url='https://example.test')
+    store.mark_done('basford-united', '', page=0)
+    assert not store.needs_discovery('basford-united')
+    assert store.known_seasons('basford-united') == ['2023-2024', '2022-2023']
+    assert store.known_seasons('ilkeston-town') is None
+    assert store.clubs_with_work(['basford-united', 'ilkeston-town']) == ['ilkeston-town']
+    assert store.summary() == []  # Discovery rows are not counted
+
+
+def test_known_empty_club_needs_no_discovery(store):
+    store.add_clubs(['basford-united'])
+    store.add_seasons('basford-united', ['2023-2024'])
+    store.remember_empty('basford-united', '', 'not_found', recheck_interval=3600)
+    assert not store.needs_discovery('basford-united')
+    assert store.open_seasons('basford-united') == []
+
+
+def test_player_jobs_are_registered_once_per_player(store):
+    players = [{'player_id': '7', 'player_url': '/p/7', 'name': 'A Player'},
+               {'player_id': '9', 'player_url': '/p/9', 'name': 'B Player'},
+               {'player_id': '', 'player_url': '', 'name': 'No Link'}]
+    assert store.add_players(players) == 2
+    assert store.add_players(players[:1]) == 0
+    store.mark_player('7', RUNNING)
+    store.mark_player('7', DONE)
+    store.mark_player('9', RUNNING)
+    store.mark_player('9', FAILED, error='timed out')
+    assert store.open_players() == [('9', '/p/9', 'B Player')]
+    store.mark_player('9', RUNNING)
+    store.mark_player('9', FAILED, error='timed out')
+    assert store.open_players() == []  # max_attempts reached
+    assert dict(store.player_summary()) == {DONE: 1, FAILED: 1}
+
+
+def test_fingerprint_changed_at_only_moves_on_change(store, monkeypatch):
+    import job_store
+
+    monkeypatch.setattr(job_store.time, 'time', lambda: 1000)
+    store.save_fingerprint('basford-united', '2023-2024', 'aaa', 20, etag='"v1"')
+    monkeypatch.setattr(job_store.time, 'time', lambda: 2000)
+    store.save_fingerprint('basford-united', '2023-2024', 'aaa', 20, etag='"v1"', changed=False)
+    assert store.fingerprint('basford-united', '2023-2024') == {
+        'table_hash': 'aaa', 'etag': '"v1"', 'last_modified': None, 'players': 20,
+        'checked_at': 2000, 'changed_at': 1000}
+    assert store.fingerprint_summary(since=1500) == (1, 0)
+    store.save_fingerprint('basford-united', '2023-2024', 'bbb', 21, changed=True)
+    assert store.fingerprint('basford-united', '2023-2024')['changed_at'] == 2000
+    assert store.fingerprint_summary(since=1500) == (1, 1)
+
+
+def test_recheck_due_only_once_the_entry_expires(store):
+    store.remember_empty('basford-united', '2019-2020', 'no_players', recheck_interval=3600)
+    assert not store.recheck_due('basford-united', '2019-2020')
+    store.remember_empty('basford-united', '2019-2020', 'no_players', recheck_interval=-1)
+    assert store.recheck_due('basford-united', '2019-2020')
+    assert not store.recheck_due('basford-united', '2018-2019')
+
+
+def test_recheck_bypasses_the_cached_empty_page(scraper):
+    """A past season cached as empty is fetched again when its negative-cache entry expires"""
+    club, season = 'basford-united', '2019-2020'
+    url = f"{scraper.BASE_URL}/{club}/appearances/{season}"
+    scraper.get_html_cache().put(url, "<html><body><table><tr><th>Player</th></tr></table></body></html>")
+    job_store = scraper.get_job_store()
+    job_store.add_job(club, season)
+    job_store.remember_empty(club, season, 'no_players', recheck_interval=-1)
+    assert job_store.reopen_rechecks() == 0  # Pending already: nothing to reopen
+
+    scraper.get_pipeline().start()
+    assert scraper.scrape_season_job(club, season)
+    scraper.get_pipeline().close()
+
+    assert job_store.job(club, season)[0] == DONE
+    assert not job_store.recheck_due(club, season)  # forget_empty dropped the entry
+
+
+def run_season_job(scraper, club: str, season: str, **kwargs) -> bool:
+    """One season job through a fresh pipeline, closed (and so flushed) before returning"""
+    scraper._pipeline = None
+    pipeline = scraper.get_pipeline()
+    pipeline.start()
+    try:
+        return scraper.scrape_season_job(club, season, **kwargs)
+    finally:
+        pipeline.close()
+
+
+def test_incremental_run_writes_only_changed_tables(scraper, monkeypatch, mock_flaresolverr):
+    club, season = 'basford-united', '2024-2025'
+    written = []
+    save = scraper.save_club_season_data
+    monkeypatch.setattr(scraper, 'save_club_season_data',
+                        lambda *args: written.append(args[:2]) or save(*args))
+    job_store = scraper.get_job_store()
+
+    assert run_season_job(scraper, club, season, incremental=True)
+    assert written == [(club, season)]
+    first = job_store.fingerprint(club, season)
+    assert first['players'] == 25
+
+    # Same table again: fetched past the cache, nothing written, the job still closes
+    assert run_season_job(scraper, club, season, incremental=True)
+    assert written == [(club, season)]
+    assert mock_flaresolverr.counts['request.get'] == 2
+    assert job_store.job(club, season)[0] == DONE
+    assert job_store.fingerprint(club, season)['table_hash'] == first['table_hash']
+
+    # A table that differs from the stored fingerprint is written again
+    job_store.save_fingerprint(club, season, 'stale', 25)
+    assert run_season_job(scraper, club, season, incremental=True)
+    assert written == [(club, season)] * 2
+    assert job_store.fingerprint(club, season)['table_hash'] == first['table_hash']
+    assert job_store.job(club, season)[0] == DONE
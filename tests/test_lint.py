@@ -0,0 +1,39 @@
+"""Keep the project modules free of pyflakes warnings (unused imports, undefined names...)
+
+pyflakes comes from requirements-dev.txt; without it this module is skipped.
+"""
+
+import glob
+import os
+
+import pytest
+
+pyflakes_api = pytest.importorskip('pyflakes.api')
+pyflakes_reporter = pytest.importorskip('pyflakes.reporter')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# test_script.py is a standalone import-by-import debugging script, not project code
+SKIPPED = {'test_script.py'}
+MODULES = sorted(path for pattern in ('*.py', os.path.join('tests', '*.py'))
+                 for path in glob.glob(os.path.join(ROOT, pattern)) if os.path.basename(path) not in SKIPPED)
+
+
+class Collector(pyflakes_reporter.Reporter):
+    def __init__(self):
+        self.messages = []
+
+    def unexpectedError(self, filename, message):
+        self.messages.append(f"{filename}: {message}")
+
+    def syntaxError(self, filename, message, lineno, offset, text):
+        self.messages.append(f"{filename}:{lineno}: {message}")
+
+    def flake(self, message):
+        self.messages.append(str(message))
+
+
+@pytest.mark.parametrize('path', MODULES, ids=lambda path: os.path.relpath(path, ROOT))
+def test_pyflakes_clean(path):
+    collector = Collector()
+    pyflakes_api.checkPath(path, collector)
+    assert collector.messages == []
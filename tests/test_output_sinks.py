@@ -0,0 +1,38 @@
+"""Output sinks: rewriting a club-season replaces its rows instead of adding to them"""
+
+import pytest
+
+from output_sinks import ParquetSink
+from results_store import ResultsStore
+
+
+def player(player_id, name, appearances):
+    return {'player_id': player_id, 'name': name, 'appearances': appearances,
+            'player_url': f"/basford-united/appearances/2023-2024/{player_id}"}
+
+
+def test_sqlite_rewrite_drops_players_who_left(tmp_path):
+    store = ResultsStore(str(tmp_path / 'results.sqlite3'))
+    store.write('basford-united', '2023-2024', [player('1', 'Sam Parker', 10), player('2', 'Lee Hart', 4)], 0)
+    store.write('basford-united', '2022-2023', [player('2', 'Lee Hart', 30)], 0)
+    store.write('basford-united', '2023-2024', [player('1', 'Sam Parker', 12)], 0)
+
+    rows = store.players_for_club('basford-united', '2023-2024')
+    assert [(row['player_id'], row['appearances']) for row in rows] == [('1', 12)]
+    assert [row['season'] for row in store.clubs_for_player('2')] == ['2022-2023']
+    store.close()
+
+
+def test_parquet_rewrite_replaces_the_club_season_file(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    sink = ParquetSink(str(tmp_path / 'parquet'))
+    sink.write('basford-united', '2023-2024', [player('1', 'Sam Parker', 10), player('2', 'Lee Hart', 4)], 0)
+    sink.flush()
+    sink.write('basford-united', '2023-2024', [player('1', 'Sam Parker', 11)], 0)
+    sink.write('basford-united', '2023-2024', [player('1', 'Sam Parker', 12)], 0)  # Replaces the buffered rows
+    sink.write('carlton-town', '2023-2024', [player('3', 'Ola Bent', 7)], 0)
+    sink.close()
+
+    rows = pq.read_table(str(tmp_path / 'parquet'), partitioning=None).to_pylist()
+    assert sorted((row['club'], row['player_id'], row['appearances']) for row in rows) == [
+        ('basford-united', '1', 12), ('carlton-town', '3', 7)]
@@ -0,0 +1,116 @@
+"""Single-flight fetches, the failure memo and URL normalization of RequestCoalescer"""
+
+import threading
+import time
+
+import pytest
+
+from fetch_errors import FetchTimeout, NotFound
+from request_coalescer import RequestCoalescer, normalize_url
+
+URL = "https://www.footballwebpages.co.uk/basford-united/appearances/2023-2024"
+
+
+class SlowFetch:
+    """fetch() callable that blocks until released, counting its calls"""
+
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def fetch_concurrently(coalescer, fetch, callers: int = 5, urls=None):
+    """Start `callers` threads on one URL (or `urls`), release the fetch once all have joined it"""
+    results, errors = [], []
+
+    def call(url):
+        try:
+            results.append(coalescer.fetch(url, fetch))
+        except Exception as error:
+            errors.append(error)
+
+    urls = urls or [URL] * callers
+    threads = [threading.Thread(target=call, args=(urls[0],))]
+    threads[0].start()
+    assert fetch.started.wait(5)
+    threads += [threading.Thread(target=call, args=(url,)) for url in urls[1:]]
+    for thread in threads[1:]:
+        thread.start()
+    while coalescer.stats()['saved_in_flight'] < len(urls) - 1:
+        time.sleep(0.01)
+    fetch.release.set()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_concurrent_callers_share_one_fetch():
+    coalescer = RequestCoalescer()
+    fetch = SlowFetch(result="<html>")
+    results, errors = fetch_concurrently(coalescer, fetch)
+    assert fetch.calls == 1
+    assert results == ["<html>"] * 5 and errors == []
+    assert coalescer.stats() == {'fetched': 1, 'saved_in_flight': 4, 'saved_memo': 0, 'failures_remembered': 0}
+
+
+def test_spellings_of_one_page_share_a_fetch():
+    coalescer = RequestCoalescer()
+    fetch = SlowFetch(result="<html>")
+    urls = [URL, URL + "/", URL + "?page=1", URL.replace("www.", "WWW.") + "#top"]
+    results, _ = fetch_concurrently(coalescer, fetch, urls=urls)
+    assert fetch.calls == 1 and len(results) == 4
+
+
+def test_waiting_callers_each_raise_their_own_copy():
+    coalescer = RequestCoalescer()
+    fetch = SlowFetch(error=FetchTimeout("solve timed out"))
+    _, errors = fetch_concurrently(coalescer, fetch, callers=3)
+    assert fetch.calls == 1
+    assert len(errors) == 3 and all(isinstance(error, FetchTimeout) for error in errors)
+    assert len({id(error) for error in errors}) == 3
+    assert coalescer.failures == {}  # Not remembered: the next caller fetches again
+
+
+def test_remembered_failure_is_raised_without_fetching():
+    coalescer = RequestCoalescer(remember_error=lambda error: isinstance(error, NotFound))
+    calls = []
+
+    def missing():
+        calls.append(1)
+        raise NotFound("HTTP 404")
+
+    with pytest.raises(NotFound):
+        coalescer.fetch(URL, missing)
+    with pytest.raises(NotFound):
+        coalescer.fetch(URL + "?page=1", missing)
+    assert len(calls) == 1
+    assert coalescer.stats()['saved_memo'] == 1
+
+    # A refresh fetches again, and its success clears the memo
+    assert coalescer.fetch(URL, lambda: "<html>", refresh=True) == "<html>"
+    assert coalescer.failures == {}
+    assert coalescer.fetch(URL, lambda: "<html again>") == "<html again>"
+
+
+def test_pages_are_not_kept_after_the_fetch():
+    coalescer = RequestCoalescer()
+    assert coalescer.fetch(URL, lambda: "first") == "first"
+    assert coalescer.fetch(URL, lambda: "second") == "second"
+    assert coalescer.stats()['fetched'] == 2
+
+
+def test_normalize_url_keeps_other_pages_apart():
+    assert normalize_url(URL + "?page=2") != normalize_url(URL)
+    assert normalize_url("HTTPS://Example.com:443/a/?b=2&a=1") == "https://example.com/a?a=1&b=2"
+    assert normalize_url("http://example.com:8080") == "http://example.com:8080/"
@@ -1,5 +1,3 @@
-import os
-os.makedirs("/data/output", exist_ok=True)
 #!/usr/bin/env python3
 """
 ULTIMATE FOOTBALL WEB PAGES SCRAPER 2025 - ENHANCED
@@ -19,32 +17,111 @@ ENHANCED FEATURES:
 import os
 import sys
 import time
-import random
 import json
+import logging
 import subprocess
-from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
-
-# Auto-install required packages
+import threading
+import hashlib
+import argparse
+import signal
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, List, Dict, Optional, Tuple
+
+# Auto-install required packages (pip name -> import name)
 def install_requirements():
-    packages = ['beautifulsoup4', 'requests']
-    for package in packages:
+    packages = {'beautifulsoup4': 'bs4', 'requests': 'requests', 'aiohttp': 'aiohttp'}
+    for package, module in packages.items():
         try:
-            __import__(package.replace('-', '_'))
+            __import__(module)
         except ImportError:
             print(f"Installing {package}...")
             os.system(f"{sys.executable} -m pip install {package}")
 
-install_requirements()
+if __name__ == "__main__":
+    install_requirements()  # Only when run as the scraper: importing this module never shells out
 
 import requests
+from urllib.parse import urljoin, urlparse
+
+from crawl_pipeline import CrawlPipeline
+from club_registry import ClubRegistry
+from crawl_scheduler import CrawlScheduler
+from data_paths import (DATA_DIR, JOB_DB_FILE, CLUB_REGISTRY_FILE, HTML_CACHE_DIR, ARCHIVE_DIR, PARQUET_DIR,
+                        RESULTS_DB_FILE, METRICS_SNAPSHOT_FILE)
+from extractors import DEFAULT_EXTRACTOR
+from fetch_errors import (FetchFailure, NotFound, BackendDown, FetchTimeout, IncompleteSeason,
+                          classify_error_message, classify_solution)
+from flaresolverr_backends import BackendBalancer, FlareSolverrBackend, NoHealthyBackend
+from flaresolverr_session import FlareSolverrSession, FlareSolverrSessionPool
+from html_cache import HtmlCache
+from page_archive import PageArchive
+from page_parser import merge_pages
+from player_index import PlayerIndex
+from request_coalescer import RequestCoalescer
+from output_sinks import OutputSink, build_sink
+from job_store import JobStore, DISCOVERY_SEASON, DISCOVERY_PAGE, RUNNING, DONE, FAILED, NOT_FOUND
+from metrics import (REGISTRY, MetricsExporter, serve_prometheus, SOLVE_SECONDS, HTML_BYTES, PARSE_SECONDS,
+                     WRITE_SECONDS, FETCH_RETRIES, FETCH_FAILURES)
+from rate_limiter import HostRateLimiter
+from structured_logging import setup_logging, stop_logging
 
 # ── CONFIGURATION ───────────────────────────────────────────────────────────────
 BASE_URL = "https://www.footballwebpages.co.uk"
-CLUBS_FILE = "step(1-4).txt"  # Using step5 file with remaining teams
+CLUB_LIST_FILES = ["step(1-4).txt", "step5list.txt", "step5(3-6).txt"]  # Crawled together, each club once
 SEASONS_FILE = "seasons.txt"
 OUTPUT_DIR = "football_data(1to4)"
-FLARESOLVERR_URL = "http://localhost:8191/v1"
+# JOB_DB_FILE, HTML_CACHE_DIR, ARCHIVE_DIR and the other paths under DATA_DIR come from data_paths.py
+CLUB_INDEX_URLS: List[str] = []  # Listing pages of /<slug>/appearances links; without one, discovery confirms slugs
+CLUB_INDEX_TTL = 30 * 24 * 3600  # Seconds before the club index is fetched again
+JOB_MAX_ATTEMPTS = 3  # Failed jobs are retried on restart until they reach this many attempts
+HTML_CACHE_TTL = 24 * 3600  # Seconds before a current-season page is fetched again
+HTML_CACHE_MAX_BYTES = 1024 ** 3  # Compressed size budget on the 5 GB disk
+ARCHIVE_PAGES = True  # Append every fetched page to the raw archive so reprocess.py can re-extract offline
+ARCHIVE_SEGMENT_BYTES = 256 * 1024 ** 2  # Start a new archive segment file past this size
+CURRENT_SEASON = "2024-2025"  # Only this season's pages can still change
+NO_DATA_CLUBS_FILE = "step5-6clubwnodata.txt"  # Hand-kept list of clubs without data, seeds the negative cache
+NEGATIVE_CACHE_RECHECK = {  # Seconds before a club-season known to be empty is tried again, per reason
+    'not_found': 30 * 24 * 3600,  # The page 404s
+    'no_players': 14 * 24 * 3600,  # The page exists but its table is empty or missing
+    'no_data_list': 30 * 24 * 3600  # Listed in NO_DATA_CLUBS_FILE
+}
+NEGATIVE_CACHE_CURRENT_SEASON_RECHECK = 2 * 24 * 3600  # The live season can fill up any day
+DERIVE_SEASONS_FROM_FIRST_PAGE = True  # Read the season list off the current season's page instead of /appearances
+EXTRACTOR_BACKEND = DEFAULT_EXTRACTOR  # 'lxml-stream' when lxml is installed, else 'bs4'
+OUTPUT_SINKS = ["json", "sqlite"]  # Any of "json", "parquet" (needs pyarrow), "sqlite"
+PLAYER_DETAILS = False  # Opt-in (--player-details): after the club-seasons, fetch every player's page once
+PLAYER_INDEX_DB = RESULTS_DB_FILE  # player_index / player_careers tables live next to the players table
+SINK_BATCH_SIZE = 5000  # Most player rows a columnar sink buffers between flushes
+FLARESOLVERR_URLS = ["http://localhost:8191/v1"]  # One container per URL, e.g. add "http://localhost:8192/v1"
+FLARESOLVERR_MAX_IN_FLIGHT = 4  # request.get commands (browser solves) FlareSolverr runs at once
+BREAKER_SETTINGS = {  # Passive health tracking per FlareSolverr backend (see circuit_breaker.py)
+    'window': 20,  # Recent requests considered
+    'failure_rate': 0.5,  # Error rate over the window that opens the circuit and restarts the container
+    'min_requests': 5,  # Never trip on fewer outcomes than this
+    'slow_call_seconds': 150.0,  # Slower solves count as failures
+    'half_open_probes': 2  # Successful requests needed after a restart to close the circuit again
+}
+RETRY_BUDGETS = {  # Retries per kind of fetch failure (see fetch_errors.py), within max_retries attempts
+    'not_found': 0,  # The season or page does not exist
+    'challenge': 2,  # Cloudflare not solved: retried on a fresh session
+    'backend_down': 2,  # FlareSolverr failed: retried on another backend
+    'timeout': 2  # Slow solve: retried with exponential backoff and jitter
+}
+RETRY_DELAY_SCALE = 1.0  # Multiplier on every retry delay (the offline benchmark shrinks it)
+SESSION_MAX_REQUESTS = 50  # Rotate the FlareSolverr session after this many pages
+CRAWL_WORKERS = 3  # Concurrent club-season jobs, each with its own FlareSolverr session
+RATE_LIMIT_PER_SECOND = 1 / 15  # Global page budget for footballwebpages.co.uk (old 10-20s pause)
+PAGE_FETCH_WORKERS = 4  # Pagination pages of one season fetched in parallel
+PARSE_WORKERS = 2  # Parser processes turning fetched HTML into player records (0 = parse on the fetching thread)
+PARSE_QUEUE_SIZE = 8  # Pages waiting for or in a parser before fetchers block
+WRITE_QUEUE_SIZE = 32  # Club-seasons waiting for the writer before parsers' callers block
+WRITE_BATCH_SIZE = 16  # Club-seasons the writer takes off its queue per wake-up
+METRICS_SNAPSHOT_INTERVAL = 30  # Seconds between metrics snapshots
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")  # DEBUG adds per-page detail (and the work it costs)
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json")  # "json" (one object per line) or "text"
+METRICS_PORT: Optional[int] = None  # Serve Prometheus text on http://0.0.0.0:<port>/metrics (None = off)
 
 # Default seasons if file doesn't exist
 DEFAULT_SEASONS = [
@@ -54,8 +131,25 @@ DEFAULT_SEASONS = [
 
 # ─────────────────────────────────────────────────────────────────────────────────
 
+_balancer: Optional[BackendBalancer] = None
+_session_pool: Optional[FlareSolverrSessionPool] = None
+_job_store: Optional[JobStore] = None
+_html_cache: Optional[HtmlCache] = None
+_output_sink: Optional[OutputSink] = None
+_page_archive: Optional[PageArchive] = None
+_pipeline: Optional[CrawlPipeline] = None
+_coalescer: Optional[RequestCoalescer] = None
+_club_registry: Optional[ClubRegistry] = None
+_player_index: Optional[PlayerIndex] = None
+_prefetched_pages: Dict[tuple, Tuple[str, dict]] = {}  # (club, season) -> page 1 (html, parsed) from discovery
+_prefetched_lock = threading.Lock()
+log = logging.getLogger("scraper")
+_init_lock = threading.Lock()  # Guards lazy creation of the shared objects above from worker threads
+RATE_LIMITER = HostRateLimiter({urlparse(BASE_URL).hostname: RATE_LIMIT_PER_SECOND})
+
 def ensure_output_dir():
     """Create output directory structure"""
+    os.makedirs(os.path.join(DATA_DIR, "output"), exist_ok=True)
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 def check_docker():
@@ -71,385 +165,479 @@ def check_docker():
         try:
             result = subprocess.run([path, '--version'], capture_output=True, text=True)
             if result.returncode == 0:
-                print(f"✅ Docker found: {result.stdout.strip()}")
+                log.debug("Docker found", extra={'docker': result.stdout.strip()})
                 return path
         except:
             continue
 
-    print("❌ Docker not found")
+    log.error("Docker not found")
     return None
 
-def setup_flaresolverr():
-    """Setup FlareSolverr using Docker"""
-    print("🔥 Setting up FlareSolverr...")
+def _start_flaresolverr_container(docker_path: str, backend: FlareSolverrBackend) -> bool:
+    """(Re)create the backend's FlareSolverr container on its own host port"""
+    # Stop and remove existing container (this kills every browser session in it)
+    subprocess.run([docker_path, 'rm', '-f', backend.container], capture_output=True)
+
+    cmd = [
+        docker_path, 'run', '-d',
+        '--name', backend.container,
+        '-p', f'{backend.port}:8191',
+        '--restart', 'unless-stopped',
+        'ghcr.io/flaresolverr/flaresolverr:latest'
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        log.error("Failed to start FlareSolverr container",
+                  extra={'container': backend.container, 'stderr': result.stderr.strip()})
+        return False
+    return True
 
-    # Check if FlareSolverr is already running
-    try:
-        response = requests.get(f"{FLARESOLVERR_URL}", timeout=5)
-        if response.status_code == 405:  # Method not allowed is expected for GET
-            print("✅ FlareSolverr already running")
+def _wait_for_backend(backend: FlareSolverrBackend, attempts: int) -> bool:
+    """Poll a backend every 2 seconds until it answers"""
+    for attempt in range(attempts):
+        if check_flaresolverr_health(backend):
             return True
-    except:
-        pass
+        time.sleep(2)
+        if attempt % 10 == 0:
+            log.info("Still waiting for FlareSolverr",
+                     extra={'container': backend.container, 'attempt': attempt + 1, 'attempts': attempts})
+    return False
+
+def setup_flaresolverr():
+    """Setup FlareSolverr using Docker: one container per configured endpoint"""
+    log.info("Setting up FlareSolverr", extra={'backends': len(FLARESOLVERR_URLS)})
+
+    # Check which FlareSolverr backends are already running
+    missing = [backend for backend in get_balancer().backends if not backend.client.health(timeout=5)]
+    if not missing:
+        log.info("FlareSolverr already running")
+        return True
 
     # Check if Docker is available
     docker_path = check_docker()
     if not docker_path:
-        print("💡 Please install Docker Desktop from: https://www.docker.com/products/docker-desktop/")
-        print("💡 Or run FlareSolverr manually:")
-        print("   docker run -d --name flaresolverr -p 8191:8191 ghcr.io/flaresolverr/flaresolverr:latest")
+        log.error("Install Docker (https://www.docker.com/products/docker-desktop/) or run FlareSolverr manually")
+        for backend in missing:
+            log.error("Start FlareSolverr by hand",
+                      extra={'command': f"docker run -d --name {backend.container} -p {backend.port}:8191 "
+                                        f"ghcr.io/flaresolverr/flaresolverr:latest"})
         return False
 
     try:
-        # Stop existing container if running
-        print("🧹 Cleaning up existing containers...")
-        subprocess.run([docker_path, 'rm', '-f', 'flaresolverr'], capture_output=True)
-
-        # Start FlareSolverr container (image should already be pulled)
-        print("🐳 Starting FlareSolverr container...")
-        cmd = [
-            docker_path, 'run', '-d',
-            '--name', 'flaresolverr',
-            '-p', '8191:8191',
-            '--restart', 'unless-stopped',
-            'ghcr.io/flaresolverr/flaresolverr:latest'
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
-            print("✅ FlareSolverr container started")
-
-            # Wait for it to be ready
-            print("⏳ Waiting for FlareSolverr to be ready...")
-            for attempt in range(60):  # Wait up to 2 minutes
-                try:
-                    response = requests.get(f"{FLARESOLVERR_URL}", timeout=3)
-                    if response.status_code == 405:  # Method not allowed is expected
-                        print("✅ FlareSolverr is ready!")
-                        print("🌐 Available at: http://localhost:8191")
-                        return True
-                except:
-                    time.sleep(2)
-                    if attempt % 10 == 0:
-                        print(f"   Still waiting... ({attempt + 1}/60)")
-
-            print("❌ FlareSolverr failed to start properly")
-            return False
-        else:
-            print(f"❌ Failed to start FlareSolverr: {result.stderr}")
-            return False
+        # Start the missing FlareSolverr containers (image should already be pulled)
+        log.info("Starting FlareSolverr containers", extra={'containers': len(missing)})
+        for backend in missing:
+            if not _start_flaresolverr_container(docker_path, backend):
+                return False
+            log.info("FlareSolverr container started", extra={'container': backend.container, 'port': backend.port})
 
-    except Exception as e:
-        print(f"❌ Error setting up FlareSolverr: {e}")
-        return False
+        # Wait for them to be ready
+        log.info("Waiting for FlareSolverr to be ready")
+        for backend in missing:
+            if not _wait_for_backend(backend, 60):  # Wait up to 2 minutes
+                log.error("FlareSolverr container failed to start properly", extra={'container': backend.container})
+                return False
+            log.info("FlareSolverr available", extra={'url': f"http://localhost:{backend.port}"})
+        log.info("FlareSolverr is ready")
+        return True
 
-def check_flaresolverr_health() -> bool:
-    """Check if FlareSolverr is healthy and responsive"""
-    try:
-        response = requests.get(f"{FLARESOLVERR_URL}", timeout=10)
-        return response.status_code == 405  # Method not allowed is expected for GET
-    except:
+    except Exception:
+        log.exception("Error setting up FlareSolverr")
         return False
 
-def restart_flaresolverr_container():
-    """Restart FlareSolverr container when it becomes unresponsive"""
-    print("🔄 Restarting FlareSolverr container...")
+def check_flaresolverr_health(backend: Optional[FlareSolverrBackend] = None) -> bool:
+    """Check if a FlareSolverr backend (default: any backend) is healthy and responsive"""
+    if backend is None:
+        return any(backend.client.health(timeout=10) for backend in get_balancer().backends)
+    return backend.client.health(timeout=10)
+
+def restart_flaresolverr_container(backend: FlareSolverrBackend) -> bool:
+    """Restart one unresponsive FlareSolverr container; the balancer calls this once it has drained"""
+    log.warning("Restarting FlareSolverr container", extra={'container': backend.container})
 
     docker_path = check_docker()
     if not docker_path:
-        print("❌ Docker not available for restart")
+        log.error("Docker not available for restart")
         return False
 
     try:
-        # Stop and remove existing container
-        subprocess.run([docker_path, 'rm', '-f', 'flaresolverr'], capture_output=True)
-        time.sleep(3)
-
-        # Start new container
-        cmd = [
-            docker_path, 'run', '-d',
-            '--name', 'flaresolverr',
-            '-p', '8191:8191',
-            '--restart', 'unless-stopped',
-            'ghcr.io/flaresolverr/flaresolverr:latest'
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
-            print("✅ FlareSolverr container restarted")
-
-            # Wait for it to be ready
-            print("⏳ Waiting for FlareSolverr to be ready...")
-            for attempt in range(30):  # Wait up to 1 minute
-                if check_flaresolverr_health():
-                    print("✅ FlareSolverr is ready after restart!")
-                    return True
-                time.sleep(2)
-
-            print("❌ FlareSolverr failed to become ready after restart")
+        if not _start_flaresolverr_container(docker_path, backend):
             return False
-        else:
-            print(f"❌ Failed to restart FlareSolverr: {result.stderr}")
-            return False
-
-    except Exception as e:
-        print(f"❌ Error restarting FlareSolverr: {e}")
-        return False
 
-def cleanup_flaresolverr_sessions():
-    """Clean up all existing FlareSolverr sessions"""
-    try:
-        # List all sessions
-        list_data = {"cmd": "sessions.list"}
-        response = requests.post(FLARESOLVERR_URL, json=list_data, timeout=10)
-
-        if response.status_code == 200:
-            result = response.json()
-            if result.get('status') == 'ok' and 'sessions' in result:
-                sessions = result['sessions']
-                print(f"    🧹 Found {len(sessions)} existing sessions to clean up")
-
-                # Destroy each session
-                for session_id in sessions:
-                    destroy_data = {
-                        "cmd": "sessions.destroy",
-                        "session": session_id
-                    }
-                    requests.post(FLARESOLVERR_URL, json=destroy_data, timeout=5)
-
-                print(f"    ✅ Cleaned up {len(sessions)} sessions")
-                return True
+        if _wait_for_backend(backend, 30):  # Wait up to 1 minute
+            log.info("FlareSolverr container ready after restart", extra={'container': backend.container})
+            return True
 
+        log.error("FlareSolverr container failed to become ready after restart", extra={'container': backend.container})
         return False
-    except Exception as e:
-        print(f"    ⚠️  Session cleanup error: {e}")
+
+    except Exception:
+        log.exception("Error restarting FlareSolverr", extra={'container': backend.container})
         return False
 
-def scrape_with_flaresolverr(url: str, max_retries: int = 3) -> Optional[str]:
-    """Use FlareSolverr to bypass Cloudflare with retry logic and health monitoring"""
+def restart_unhealthy_backends(timeout: float = 300) -> bool:
+    """Drain and restart every unresponsive backend, waiting until at least one serves again"""
+    balancer = get_balancer()
+    for backend in balancer.backends:
+        if not check_flaresolverr_health(backend):
+            balancer.mark_down(backend)
+    return balancer.wait_healthy(timeout)
 
-    for attempt in range(max_retries):
+def cleanup_flaresolverr_sessions():
+    """Clean up all existing FlareSolverr sessions on every backend"""
+    cleaned = False
+    for backend in get_balancer().backends:
         try:
-            # Check FlareSolverr health before attempting
-            if not check_flaresolverr_health():
-                print(f"    ⚠️  FlareSolverr unhealthy on attempt {attempt + 1}, restarting...")
-                if not restart_flaresolverr_container():
-                    print(f"    ❌ Failed to restart FlareSolverr on attempt {attempt + 1}")
-                    if attempt < max_retries - 1:
-                        time.sleep(10)
-                        continue
-                    else:
-                        return None
-
-            # Clean up existing sessions before creating new one
-            cleanup_flaresolverr_sessions()
-
-            # Create unique session name with timestamp
-            session_name = f"football_session_{int(time.time())}_{attempt}"
-            session_data = {
-                "cmd": "sessions.create",
-                "session": session_name
-            }
-
-            print(f"    🔥 Using FlareSolverr (attempt {attempt + 1}/{max_retries})...")
-            response = requests.post(FLARESOLVERR_URL, json=session_data, timeout=30)
-
-            if response.status_code != 200:
-                print(f"    ❌ Failed to create FlareSolverr session (attempt {attempt + 1})")
-                if attempt < max_retries - 1:
-                    time.sleep(5)
-                    continue
-                else:
-                    return None
-
-            # Request the page with increased timeout
-            request_data = {
-                "cmd": "request.get",
-                "url": url,
-                "session": session_name,
-                "maxTimeout": 180000  # 3 minutes (increased from 2)
-            }
-
-            response = requests.post(FLARESOLVERR_URL, json=request_data, timeout=200)  # Increased timeout
-
-            # Clean up session after use
-            try:
-                destroy_data = {
-                    "cmd": "sessions.destroy",
-                    "session": session_name
-                }
-                requests.post(FLARESOLVERR_URL, json=destroy_data, timeout=10)
-            except:
-                pass  # Don't fail if cleanup fails
-
-            if response.status_code == 200:
-                result = response.json()
-                if result.get('status') == 'ok':
-                    html_content = result['solution']['response']
-                    print(f"    ✅ FlareSolverr success! HTML: {len(html_content)} chars")
-                    return html_content
-                else:
-                    error_msg = result.get('message', 'Unknown error')
-                    print(f"    ❌ FlareSolverr failed (attempt {attempt + 1}): {error_msg}")
-
-                    # If it's a timeout or challenge failure, retry
-                    if 'timeout' in error_msg.lower() or 'challenge' in error_msg.lower():
-                        if attempt < max_retries - 1:
-                            delay = (attempt + 1) * 10  # Exponential backoff
-                            print(f"    ⏳ Retrying in {delay}s...")
-                            time.sleep(delay)
-                            continue
-
-                    return None
-            else:
-                print(f"    ❌ FlareSolverr request failed (attempt {attempt + 1}): {response.status_code}")
-
-                # If it's a 500 error, restart container and retry
-                if response.status_code == 500:
-                    print(f"    🔄 500 error detected, restarting FlareSolverr...")
-                    if restart_flaresolverr_container():
-                        if attempt < max_retries - 1:
-                            time.sleep(10)
-                            continue
-
-                if attempt < max_retries - 1:
-                    time.sleep(5)
-                    continue
-                else:
-                    return None
-
-        except requests.exceptions.Timeout:
-            print(f"    ⏰ Request timeout (attempt {attempt + 1})")
-            if attempt < max_retries - 1:
-                delay = (attempt + 1) * 15  # Longer delay for timeouts
-                print(f"    ⏳ Retrying in {delay}s...")
-                time.sleep(delay)
-                continue
-            else:
-                return None
+            sessions = backend.client.list_sessions(timeout=10)
+            # Destroy each session
+            for session_id in sessions:
+                backend.client.destroy_session(session_id, timeout=5)
+
+            log.info("Cleaned up leftover FlareSolverr sessions",
+                     extra={'container': backend.container, 'sessions': len(sessions)})
+            cleaned = True
         except Exception as e:
-            print(f"    ❌ FlareSolverr error (attempt {attempt + 1}): {e}")
-            if attempt < max_retries - 1:
-                time.sleep(5)
-                continue
-            else:
-                return None
-
-    print(f"    ❌ All {max_retries} attempts failed")
-    return None
+            log.warning("Session cleanup error", extra={'container': backend.container, 'error': str(e)})
+    return cleaned
+
+def get_balancer() -> BackendBalancer:
+    """Return the FlareSolverr backend balancer, creating it on first use"""
+    global _balancer
+    if _balancer is None:
+        with _init_lock:
+            if _balancer is None:
+                _balancer = BackendBalancer(FLARESOLVERR_URLS, restart=restart_flaresolverr_container,
+                                            max_in_flight=FLARESOLVERR_MAX_IN_FLIGHT,
+                                            breaker=BREAKER_SETTINGS)
+    return _balancer
+
+def get_session_pool() -> FlareSolverrSessionPool:
+    """Return the process-wide FlareSolverr session pool, creating it on first use"""
+    global _session_pool
+    if _session_pool is None:
+        _session_pool = FlareSolverrSessionPool(get_balancer(), size=CRAWL_WORKERS,
+                                                max_requests=SESSION_MAX_REQUESTS)
+    return _session_pool
+
+def get_job_store() -> JobStore:
+    """Return the persistent crawl job store, opening it on first use"""
+    global _job_store
+    if _job_store is None:
+        _job_store = JobStore(JOB_DB_FILE, max_attempts=JOB_MAX_ATTEMPTS)
+    return _job_store
+
+def get_html_cache() -> HtmlCache:
+    """Return the on-disk HTML cache, opening it on first use"""
+    global _html_cache
+    if _html_cache is None:
+        with _init_lock:
+            if _html_cache is None:
+                _html_cache = HtmlCache(HTML_CACHE_DIR, CURRENT_SEASON, ttl=HTML_CACHE_TTL,
+                                        max_bytes=HTML_CACHE_MAX_BYTES)
+    return _html_cache
+
+def get_output_sink() -> OutputSink:
+    """Return the configured output sink(s), creating them on first use"""
+    global _output_sink
+    if _output_sink is None:
+        with _init_lock:
+            if _output_sink is None:
+                _output_sink = build_sink(OUTPUT_SINKS, OUTPUT_DIR, PARQUET_DIR, SINK_BATCH_SIZE,
+                                          RESULTS_DB_FILE)
+    return _output_sink
+
+def get_page_archive() -> PageArchive:
+    """Return the raw page archive, opening it on first use"""
+    global _page_archive
+    if _page_archive is None:
+        with _init_lock:
+            if _page_archive is None:
+                _page_archive = PageArchive(ARCHIVE_DIR, segment_bytes=ARCHIVE_SEGMENT_BYTES)
+    return _page_archive
+
+def get_pipeline() -> CrawlPipeline:
+    """Return the parse / write pipeline, creating it on first use (start() launches its workers)"""
+    global _pipeline
+    if _pipeline is None:
+        with _init_lock:
+            if _pipeline is None:
+                _pipeline = CrawlPipeline(save_club_season_data, flush=lambda: get_output_sink().flush(),
+                                          parse_workers=PARSE_WORKERS,
+                                          parse_queue=PARSE_QUEUE_SIZE, write_queue=WRITE_QUEUE_SIZE,
+                                          write_batch=WRITE_BATCH_SIZE, extractor=EXTRACTOR_BACKEND)
+    return _pipeline
+
+def get_player_index() -> PlayerIndex:
+    """Return the global player index, opening it on first use"""
+    global _player_index
+    if _player_index is None:
+        with _init_lock:
+            if _player_index is None:
+                _player_index = PlayerIndex(PLAYER_INDEX_DB)
+    return _player_index
+
+def get_club_registry() -> ClubRegistry:
+    """Return the club name -> slug registry, loading it on first use"""
+    global _club_registry
+    if _club_registry is None:
+        with _init_lock:
+            if _club_registry is None:
+                _club_registry = ClubRegistry(CLUB_REGISTRY_FILE, index_ttl=CLUB_INDEX_TTL)
+    return _club_registry
+
+def get_coalescer() -> RequestCoalescer:
+    """Return the run's single-flight fetch layer, creating it on first use"""
+    global _coalescer
+    if _coalescer is None:
+        with _init_lock:
+            if _coalescer is None:
+                _coalescer = RequestCoalescer(remember_error=lambda error: isinstance(error, NotFound))
+    return _coalescer
+
+def fetch_with_flaresolverr(url: str, max_retries: int = 3, session: Optional[FlareSolverrSession] = None,
+                            refresh: bool = False, validators: Optional[Dict[str, str]] = None) -> str:
+    """Fetch a Football Web Pages URL from the HTML cache, or through FlareSolverr on a miss
+
+    `refresh` skips the cache lookup (the fresh page still replaces the cached one). A `validators`
+    dict receives the ETag / Last-Modified the site sent with a fetched page.
+    Callers asking for the same URL at once share one fetch, and a 404 is remembered for the rest of
+    the run unless `refresh` is set (see request_coalescer.py).
+    Raises the last FetchFailure once its kind's retry budget (or max_retries attempts) is spent.
+    """
+    html_content, fetched_validators = get_coalescer().fetch(
+        url, partial(_fetch_page, url, max_retries, session, refresh), refresh=refresh)
+    if validators is not None:
+        validators.update(fetched_validators)
+    return html_content
+
+def _fetch_page(url: str, max_retries: int, session: Optional[FlareSolverrSession],
+                refresh: bool) -> Tuple[str, Dict[str, str]]:
+    """(html, validators) of one URL from the HTML cache or FlareSolverr"""
+    validators: Dict[str, str] = {}
+    cacheable = url.startswith(BASE_URL)
+    if cacheable and not refresh:
+        html_content = get_html_cache().get(url)
+        if html_content:
+            log.debug("HTML cache hit", extra={'url': url, 'chars': len(html_content)})
+            HTML_BYTES.observe(len(html_content), source='cache')
+            return html_content, validators
+
+    with get_pipeline().fetching():
+        html_content = _scrape_with_retries(url, max_retries, session, validators)
+
+    if cacheable:
+        get_html_cache().put(url, html_content)
+        if ARCHIVE_PAGES:
+            get_page_archive().append(url, html_content)
+    return html_content, validators
+
+def scrape_with_flaresolverr(url: str, max_retries: int = 3,
+                             session: Optional[FlareSolverrSession] = None) -> Optional[str]:
+    """Like fetch_with_flaresolverr, but returns None instead of raising on failure"""
+    try:
+        return fetch_with_flaresolverr(url, max_retries, session)
+    except FetchFailure:
+        return None
+
+@contextmanager
+def _attempt_session(session: Optional[FlareSolverrSession], avoid: Optional[FlareSolverrBackend] = None):
+    """The caller's session, or a pooled one (on the least busy backend) for a single attempt"""
+    if session is not None:
+        yield session
+    else:
+        with get_session_pool().session(avoid=avoid) as pooled_session:
+            yield pooled_session
+
+def _scrape_with_retries(url: str, max_retries: int, session: Optional[FlareSolverrSession],
+                         validators: Optional[Dict[str, str]] = None) -> str:
+    """Use FlareSolverr to bypass Cloudflare, retrying each kind of failure within its own budget"""
+    retries: Dict[str, int] = {}
+    avoid = None
+    for attempt in range(max_retries):
+        try:
+            with _attempt_session(session, avoid) as attempt_session:
+                return _scrape_attempt(url, attempt, max_retries, attempt_session, validators)
+        except NoHealthyBackend as e:
+            failure = BackendDown(str(e))
+        except FetchFailure as e:
+            failure = e
+
+        retries[failure.kind] = retries.get(failure.kind, 0) + 1
+        if retries[failure.kind] > RETRY_BUDGETS.get(failure.kind, 0) or attempt == max_retries - 1:
+            log.warning("Giving up on page",
+                        extra={'url': url, 'attempts': attempt + 1, 'kind': failure.kind, 'error': str(failure)})
+            raise failure
+
+        # A backend failure is retried on a different backend when there is one
+        avoid = failure.backend if isinstance(failure, BackendDown) else None
+        FETCH_RETRIES.inc(kind=failure.kind)
+        delay = failure.retry_delay(retries[failure.kind]) * RETRY_DELAY_SCALE
+        log.info("Retrying page", extra={'url': url, 'kind': failure.kind, 'delay': round(delay, 1)})
+        time.sleep(delay)
+
+def _scrape_attempt(url: str, attempt: int, max_retries: int, session: FlareSolverrSession,
+                    validators: Optional[Dict[str, str]] = None) -> str:
+    """One FlareSolverr attempt: the page HTML, or a FetchFailure saying what went wrong"""
+    backend = session.backend
+    started = time.time()
+    try:
+        # Reuse the long-lived session (and its clearance cookies) for this page
+        if not session.ensure():
+            raise BackendDown("could not create a FlareSolverr session", backend)
+
+        # Stay inside the global per-host request budget shared by all workers
+        RATE_LIMITER.acquire(url)
+        started = time.time()
+        response = session.request_get(url)
+
+        if response.status_code != 200:
+            raise BackendDown(f"FlareSolverr answered HTTP {response.status_code}", backend)
+
+        result = response.json()
+        if result.get('status') != 'ok':
+            raise classify_error_message(result.get('message', 'Unknown error'), backend)
+
+        failure = classify_solution(result['solution'], backend)
+        if failure:
+            raise failure
+
+        latency = time.time() - started
+        get_balancer().record(backend, success=True, latency=latency)
+        SOLVE_SECONDS.observe(latency, backend=backend.container, outcome='ok')
+        html_content = result['solution']['response']
+        HTML_BYTES.observe(len(html_content), source='flaresolverr')
+        if validators is not None:
+            validators.update(response_validators(result['solution']))
+        log.debug("Fetched page through FlareSolverr",
+                  extra={'url': url, 'attempt': attempt + 1, 'chars': len(html_content), 'latency': round(latency, 2)})
+        return html_content
+
+    except FetchFailure as e:
+        failure = e
+        failure.backend = backend
+    except requests.exceptions.Timeout as e:
+        failure = FetchTimeout(str(e), backend)
+    except Exception as e:
+        failure = BackendDown(f"{type(e).__name__}: {e}", backend)
+
+    # Challenge pages and 404s mean the backend worked; only its own failures count against its breaker
+    latency = time.time() - started
+    get_balancer().record(backend, success=not failure.backend_fault, latency=latency)
+    SOLVE_SECONDS.observe(latency, backend=backend.container, outcome=failure.kind)
+    FETCH_FAILURES.inc(kind=failure.kind)
+    log.info("FlareSolverr attempt failed",
+             extra={'url': url, 'attempt': attempt + 1, 'max_retries': max_retries, 'kind': failure.kind,
+                    'error': str(failure), 'backend': backend.api_url})
+    if failure.fresh_session:
+        session.record_failure()
+    raise failure
+
+def response_validators(solution: dict) -> Dict[str, str]:
+    """ETag / Last-Modified of a FlareSolverr solution, when the site sent them"""
+    headers = {name.lower(): value for name, value in (solution.get('headers') or {}).items()}
+    validators = {}
+    if headers.get('etag'):
+        validators['etag'] = headers['etag']
+    if headers.get('last-modified'):
+        validators['last_modified'] = headers['last-modified']
+    return validators
+
+def refresh_club_index():
+    """Rebuild the club index from CLUB_INDEX_URLS once it is older than CLUB_INDEX_TTL"""
+    registry = get_club_registry()
+    if not CLUB_INDEX_URLS:
+        log.info("No club listing pages configured, slugs are guessed and confirmed by season discovery")
+        return
+    if not registry.index_stale():
+        return
+    pages = []
+    for url in CLUB_INDEX_URLS:
+        try:
+            pages.append(fetch_with_flaresolverr(url, refresh=True))
+        except FetchFailure as failure:
+            log.warning("Failed to fetch a club listing page", extra={'url': url, 'kind': failure.kind})
+    indexed = registry.update_index(pages, urlparse(BASE_URL).hostname)
+    if indexed:
+        log.info("Built the club index", extra={'clubs': indexed, 'pages': len(pages)})
+    else:
+        log.warning("Club index unavailable, guessing slugs for clubs not resolved before",
+                    extra={'indexed_before': len(registry.index)})
 
 def load_clubs() -> List[str]:
-    """Load clubs from step5(3-6).txt file starting from Rising Ballers Kensington"""
-    if os.path.exists(CLUBS_FILE):
-        with open(CLUBS_FILE, 'r', encoding='utf-8') as f:
-            all_lines = [line.strip() for line in f if line.strip()]
-
-        # Find the starting point (Rising Ballers Kensington)
-        start_index = -1
-        for i, line in enumerate(all_lines):
-            if line == "Rising Ballers Kensington":
-                start_index = i
-                break
-
-        if start_index == -1:
-            print("⚠️  Rising Ballers Kensington not found, starting from beginning of file")
-            start_index = 0
-
-        # Get remaining clubs (skip comment lines starting with #)
-        remaining_clubs = []
-        for line in all_lines[start_index:]:
-            if not line.startswith('#') and line.strip():
-                # Convert team name to URL format
-                club_url = line.lower().replace(' ', '-').replace('_', '-')
-                # Handle special cases
-                club_url = club_url.replace('afc', 'afc').replace('fc-', 'fc-')
-                remaining_clubs.append(club_url)
-
-        print(f"📋 Loaded {len(remaining_clubs)} remaining clubs from {CLUBS_FILE}")
-        print(f"🎯 Starting from: {all_lines[start_index] if start_index < len(all_lines) else 'Unknown'}")
-        return remaining_clubs
-    else:
-        print(f"⚠️  {CLUBS_FILE} not found, using test club")
+    """Slugs of every club in CLUB_LIST_FILES, each once; progress is tracked in the job store, not the files"""
+    registry = get_club_registry()
+    names = registry.load_lists(CLUB_LIST_FILES)
+    if not names:
+        log.warning("No club lists found, using test club", extra={'files': CLUB_LIST_FILES})
         return ["basford-united"]
 
-def discover_available_seasons(club_url: str) -> List[str]:
-    """Dynamically discover which seasons have data for a club - ENHANCED to include 2024-2025"""
-    url = f"{BASE_URL}/{club_url}/appearances"
+    clubs = registry.resolve_all(names)
+    registry.save()
+    log.info("Loaded clubs", extra={'clubs': len(clubs), 'duplicates': registry.duplicates,
+                                    'same_slug': len(names) - len(clubs),
+                                    'unverified': len(registry.unverified()), 'rejected': len(registry.rejected()),
+                                    'files': CLUB_LIST_FILES})
+    return clubs
+
+def record_club_slug(club: str, found: bool):
+    """Tell the club registry whether the club's page exists (found) or 404s, saving it when that is news"""
+    registry = get_club_registry()
+    if registry.confirm(club) if found else registry.reject(club):
+        registry.save()
+
+def load_no_data_clubs() -> List[str]:
+    """Club slugs from NO_DATA_CLUBS_FILE, skipping its headers, summary and "(has data)" lines"""
+    if not os.path.exists(NO_DATA_CLUBS_FILE):
+        return []
 
-    print(f"    🔍 Discovering available seasons for {club_url}...")
-    html_content = scrape_with_flaresolverr(url)
+    clubs = []
+    with open(NO_DATA_CLUBS_FILE, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if 'SUMMARY' in line:
+                break  # Everything after this is statistics
+            if not line or line.endswith(':') or '(has data)' in line:
+                continue
+            clubs.append(line)
+    registry = get_club_registry()
+    slugs = registry.resolve_all(clubs)
+    registry.save()
+    return slugs
+
+def remember_empty(club: str, season: str, reason: str):
+    """Put a club-season (season '' = whole club) in the negative cache with its reason's re-check interval"""
+    interval = NEGATIVE_CACHE_RECHECK.get(reason, NEGATIVE_CACHE_RECHECK['no_players'])
+    if season == CURRENT_SEASON:
+        interval = min(interval, NEGATIVE_CACHE_CURRENT_SEASON_RECHECK)
+    get_job_store().remember_empty(club, season, reason, interval)
+    log.info("Cached as empty", extra={'club': club, 'season': season or None, 'reason': reason})
+
+def discover_available_seasons(club_url: str, session: Optional[FlareSolverrSession] = None) -> List[str]:
+    """Dynamically discover which seasons have data for a club - ENHANCED to include 2024-2025
+
+    Raises FetchFailure (NotFound for an unknown club) when the club page could not be fetched.
+    """
+    url = f"{BASE_URL}/{club_url}/appearances"
 
-    if not html_content:
-        print(f"    ❌ Failed to get club page, using current season")
-        return ["2024-2025"]
+    log.debug("Discovering seasons from the season index", extra={'club': club_url})
+    html_content = fetch_with_flaresolverr(url, session=session)
+    return seasons_from_page(get_pipeline().parse(html_content))
 
+def seasons_from_page(parsed: dict) -> List[str]:
+    """Season options of a parsed appearances page, always including the current season"""
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
-        seasons = []
-
-        # Look for season selector dropdown
-        season_select = soup.find('select')
-        if season_select:
-            for option in season_select.find_all('option'):
-                season_value = option.get('value')
-                if season_value and season_value != '' and '-' in season_value:
-                    seasons.append(season_value)
-
-        # Fallback: look for season links in the page
-        if not seasons:
-            import re
-            season_pattern = r'(\d{4}-\d{4})'
-            for link in soup.find_all('a', href=True):
-                href = link.get('href', '')
-                if '/appearances/' in href:
-                    match = re.search(season_pattern, href)
-                    if match:
-                        seasons.append(match.group(1))
-
-        # Additional fallback: look for any 4-digit year patterns that could be seasons
-        if not seasons:
-            import re
-            # Look for patterns like "2024-2025", "2023-2024", etc. in the entire page text
-            season_pattern = r'(\d{4}-\d{4})'
-            page_text = soup.get_text()
-            matches = re.findall(season_pattern, page_text)
-            for match in matches:
-                # Validate it's a reasonable season (between 2010-2030)
-                start_year = int(match.split('-')[0])
-                if 2010 <= start_year <= 2030:
-                    seasons.append(match)
-
-        # Remove duplicates and sort (most recent first)
-        seasons = sorted(list(set(seasons)), reverse=True)
-
-        # ENSURE 2024-2025 SEASON IS ALWAYS INCLUDED
-        current_season = "2024-2025"
-        if current_season not in seasons:
-            print(f"    🔧 Adding current season {current_season} to ensure it's included")
-            seasons.insert(0, current_season)  # Add at the beginning (most recent)
-
-        # Also ensure we have some recent seasons if discovery failed
-        essential_seasons = ["2024-2025"]
-        for essential_season in essential_seasons:
-            if essential_season not in seasons:
-                print(f"    🔧 Adding essential season {essential_season}")
-                seasons.append(essential_season)
-
-        # Sort again after adding essential seasons
-        seasons = sorted(list(set(seasons)), reverse=True)
-
-        if seasons:
-            print(f"    ✅ Found {len(seasons)} available seasons: {', '.join(seasons[:3])}" +
-                  (f" and {len(seasons)-3} more..." if len(seasons) > 3 else ""))
-            return seasons
-        else:
-            print(f"    ⚠️  No seasons found, using default current season")
-            return ["2024-2025"]  # Fallback to current season
+        seasons = parsed['seasons']
+
+        # ENSURE CURRENT SEASON IS ALWAYS INCLUDED
+        if CURRENT_SEASON not in seasons:
+            seasons = sorted(seasons + [CURRENT_SEASON], reverse=True)
+
+        log.debug("Found seasons", extra={'seasons': len(seasons), 'latest': seasons[:3]})
+        return seasons
 
     except Exception as e:
-        print(f"    ❌ Error discovering seasons: {e}")
-        print(f"    🔧 Using essential seasons as fallback")
-        return ["2024-2025"]  # Essential seasons fallback
+        log.warning("Error discovering seasons, using the current season", extra={'error': str(e)})
+        return [CURRENT_SEASON]  # Essential seasons fallback
 
 def load_seasons() -> List[str]:
     """Load seasons from file or use defaults (kept for backward compatibility)"""
@@ -461,449 +649,503 @@ def load_seasons() -> List[str]:
                 # Skip empty lines and comments
                 if line and not line.startswith('#'):
                     seasons.append(line)
-        print(f"📋 Loaded {len(seasons)} seasons from {SEASONS_FILE}")
+        log.info("Loaded seasons", extra={'seasons': len(seasons), 'file': SEASONS_FILE})
     else:
         seasons = DEFAULT_SEASONS
-        print(f"📋 Using {len(seasons)} default seasons")
+        log.info("Using default seasons", extra={'seasons': len(seasons)})
     return seasons
 
-def extract_players_with_appearances(html_content: str) -> List[dict]:
-    """Extract player names with appearances data from Football Web Pages HTML - SIMPLIFIED"""
-    try:
-        soup = BeautifulSoup(html_content, 'html.parser')
-        players = []
-
-        # Find the main appearances table
-        tables = soup.find_all('table')
-        main_table = None
-
-        for table in tables:
-            # Look for table with player appearance links
-            if table.find('a', href=lambda x: x and '/appearances/' in x):
-                main_table = table
-                break
-
-        if not main_table:
-            print(f"    ⚠️  No appearances table found")
-            return []
-
-        # Extract table headers to understand column structure
-        headers = []
-        header_row = main_table.find('tr')
-        if header_row:
-            for th in header_row.find_all(['th', 'td']):
-                headers.append(th.get_text(strip=True).lower())
-
-        print(f"    📊 Table headers: {headers}")
-
-        # Process each player row
-        rows = main_table.find_all('tr')[1:]  # Skip header row
-
-        for row in rows:
-            cells = row.find_all(['td', 'th'])
-            if len(cells) < 2:
-                continue
+def save_club_season_data(club: str, season: str, players: List[dict], html_length: int):
+    """Save simplified data for a specific club and season - PLAYERS AND APPEARANCES ONLY
 
-            player_data = {
-                'name': '',
-                'appearances': 0,
-                'player_url': '',
-                'player_id': ''
-            }
-
-            # Extract player name and link
-            player_link = row.find('a', href=True)
-            if player_link and '/appearances/' in player_link.get('href', ''):
-                player_data['name'] = player_link.get_text(strip=True)
-                player_data['player_url'] = player_link.get('href')
-
-                # Extract player ID from URL
-                url_parts = player_data['player_url'].split('/')
-                if len(url_parts) > 0:
-                    player_data['player_id'] = url_parts[-1]
-            else:
-                continue  # Skip rows without player links
-
-            # SIMPLIFIED: Look for appearances in the second column (after player name)
-            # Skip the first cell (player name) and look for the first numeric value
-            appearances_found = False
-
-            for cell in cells[1:]:  # Start from second cell
-                text = cell.get_text(strip=True)
-                if text.isdigit():
-                    value = int(text)
-                    # Reasonable appearance range (1-50 for most players)
-                    if 1 <= value <= 50 and not appearances_found:
-                        player_data['appearances'] = value
-                        appearances_found = True
-                        break
-
-            # If no reasonable appearances found, try any numeric value
-            if not appearances_found:
-                for cell in cells[1:]:
-                    text = cell.get_text(strip=True)
-                    if text.isdigit():
-                        value = int(text)
-                        if value > 0:  # Any positive number
-                            player_data['appearances'] = value
-                            break
-
-            # Only add if we have a valid player with appearances
-            if player_data['name'] and player_data['appearances'] > 0:
-                players.append(player_data)
-
-        print(f"    👥 Extracted {len(players)} players with appearances data")
-        return players
-
-    except Exception as e:
-        print(f"    ✖ Error extracting players: {e}")
-        return []
-
-def check_for_pagination(html_content: str) -> List[int]:
-    """Check if there are additional pages and return page numbers"""
-    try:
-        soup = BeautifulSoup(html_content, 'html.parser')
-        page_numbers = []
-
-        # Look for pagination links
-        pagination_selectors = [
-            'a[href*="?page="]',
-            '.pagination a',
-            '.page-numbers a',
-            'a[href*="page="]'
-        ]
-
-        for selector in pagination_selectors:
-            links = soup.select(selector)
-            for link in links:
-                href = link.get('href', '')
-                if '?page=' in href:
-                    try:
-                        page_num = int(href.split('?page=')[1].split('&')[0])
-                        if page_num not in page_numbers and page_num <= 10:  # Reasonable limit
-                            page_numbers.append(page_num)
-                    except:
-                        continue
-
-        # Also look for "Next" or page number text
-        for link in soup.find_all('a', href=True):
-            text = link.get_text(strip=True)
-            if text.isdigit():
-                try:
-                    page_num = int(text)
-                    if page_num > 1 and page_num <= 10 and page_num not in page_numbers:
-                        page_numbers.append(page_num)
-                except:
-                    continue
-
-        page_numbers = sorted(list(set(page_numbers)))
-        if page_numbers:
-            print(f"    📄 Found pagination: pages {page_numbers}")
-
-        return page_numbers
-
-    except Exception as e:
-        print(f"    ⚠️  Error checking pagination: {e}")
-        return []
-
-def save_club_season_data(club: str, season: str, players: List[dict], html_content: str):
-    """Save simplified data for a specific club and season - PLAYERS AND APPEARANCES ONLY"""
-    club_dir = os.path.join(OUTPUT_DIR, club)
-    os.makedirs(club_dir, exist_ok=True)
-
-    # Save players list with appearances only
-    if players:
-        season_safe = season.replace('-', '_')
-
-        # Save simple players text file
-        players_file = os.path.join(club_dir, f"{season_safe}_players.txt")
-        with open(players_file, 'w', encoding='utf-8') as f:
-            for player in players:
-                f.write(f"{player['name']} - {player['appearances']} apps\n")
-
-        # Save simplified JSON data
-        data = {
-            'club': club,
-            'season': season,
-            'players_count': len(players),
-            'players': players,
-            'total_appearances': sum(p['appearances'] for p in players),
-            'top_appearance_maker': max(players, key=lambda x: x['appearances']) if players else None,
-            'timestamp': int(time.time()),
-            'html_length': len(html_content)
-        }
-
-        json_file = os.path.join(club_dir, f"{season_safe}_data.json")
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-
-        print(f"    💾 Saved {len(players)} players for {club} {season}")
-        print(f"    📊 Total appearances: {data['total_appearances']}")
-
-        if data['top_appearance_maker']:
-            top_apps = data['top_appearance_maker']
-            print(f"    🏆 Most apps: {top_apps['name']} ({top_apps['appearances']} appearances)")
-
-        return True
+    Runs on the pipeline's writer thread; queue writes with get_pipeline().write().
+    """
+    written = get_output_sink().write(club, season, players, html_length)
+    if not written:
+        return False
 
-    return False
+    if log.isEnabledFor(logging.DEBUG):
+        top_apps = max(players, key=lambda x: x['appearances'])
+        log.debug("Saved club-season", extra={'club': club, 'season': season, 'players': len(players),
+                                              'appearances': sum(p['appearances'] for p in players),
+                                              'goals': sum(p['goals'] or 0 for p in players),
+                                              'most_apps': top_apps['name']})
+    return True
 
 # Removed Selenium functions - using pure FlareSolverr approach
 
-def scrape_club_season(club: str, season: str, max_retries: int = 2) -> bool:
-    """Scrape a specific club and season using FlareSolverr with enhanced error handling"""
-    # Convert club name to URL format (lowercase, spaces to dashes)
-    club_url = club.lower().replace(' ', '-').replace('_', '-')
-    base_url = f"{BASE_URL}/{club_url}/appearances/{season}"
-
-    print(f"  🎯 {club} ({club_url}) - {season}")
-
-    # Initialize all players list
-    all_players = []
+def fetch_extra_pages(club: str, season: str, base_url: str, pages: List[int],
+                      max_retries: int, refresh: bool = False) -> Dict[int, List[dict]]:
+    """Fetch pagination pages concurrently (each on its own pooled session) and parse out their players
 
-    # Start with page 1 (no page parameter needed)
-    current_page = 1
-    url = base_url
+    Raises IncompleteSeason once every page has been tried if any of them failed: a season missing
+    a page is not written, and its job is re-queued by the next run.
+    """
+    def fetch_page(page_number: int) -> List[dict]:
+        try:
+            html_content = fetch_with_flaresolverr(f"{base_url}?page={page_number}", max_retries=max_retries,
+                                                   refresh=refresh)
+        except FetchFailure as failure:
+            log.warning("Failed on a pagination page",
+                        extra={'club': club, 'season': season, 'page': page_number, 'kind': failure.kind})
+            record_fetch_failure(club, season, page_number, failure)
+            raise
+
+        get_job_store().mark_done(club, season, page_number)
+        # Later pages only need their players: stream them out of the raw HTML
+        return get_pipeline().parse(html_content, full=False)['players']
+
+    log.debug("Fetching pagination pages", extra={'club': club, 'season': season, 'pages': pages})
+    with ThreadPoolExecutor(max_workers=min(len(pages), PAGE_FETCH_WORKERS),
+                            thread_name_prefix="page") as executor:
+        futures = {number: executor.submit(fetch_page, number) for number in pages}
+
+    failed = {number: future.exception() for number, future in futures.items()
+              if isinstance(future.exception(), FetchFailure)}
+    if failed:
+        raise IncompleteSeason(", ".join(f"page {number}: {failure.kind}" for number, failure in failed.items()))
+    return {number: future.result() for number, future in futures.items()}
+
+def players_fingerprint(players: List[dict]) -> str:
+    """Stable hash of an extracted player table"""
+    return hashlib.sha256(json.dumps(players, sort_keys=True).encode('utf-8')).hexdigest()
+
+def validators_match(previous: Optional[dict], validators: Dict[str, str]) -> bool:
+    """True when the page's ETag / Last-Modified equal the stored ones (and there is at least one)"""
+    if not previous:
+        return False
+    common = [name for name in ('etag', 'last_modified') if validators.get(name) and previous.get(name)]
+    return bool(common) and all(validators[name] == previous[name] for name in common)
+
+def scrape_club_season(club: str, season: str, max_retries: int = 2,
+                       session: Optional[FlareSolverrSession] = None,
+                       first_page: Optional[Tuple[str, dict]] = None,
+                       incremental: bool = False, on_written: Optional[Callable[[], None]] = None,
+                       recheck: bool = False) -> bool:
+    """Scrape a specific club and season using FlareSolverr with enhanced error handling
+
+    `club` is a slug from the club registry. `first_page` is an already fetched and parsed page 1
+    (html, parsed) from season discovery, used instead of fetching it again. `incremental` re-fetches
+    past the HTML cache and only writes output when the player table changed. The players are queued
+    for the pipeline's writer, which calls `on_written` once they are flushed (never when the write
+    fails or is dropped); a success that writes nothing calls it straight away. `recheck` marks a
+    club-season known to be empty and due a re-check: its pages bypass the HTML cache too, since a
+    completed season's cached empty page never expires.
+    """
+    base_url = f"{BASE_URL}/{club}/appearances/{season}"
+    refresh = incremental or recheck
+
+    log.info("Scraping club-season", extra={'club': club, 'season': season, 'recheck': recheck})
+    job_store = get_job_store()
+    previous = job_store.fingerprint(club, season)
+    validators: Dict[str, str] = {}
+
+    if first_page is None:
+        # Use FlareSolverr to bypass Cloudflare with retry logic; a FetchFailure goes to the caller
+        try:
+            html_content = fetch_with_flaresolverr(base_url, max_retries=max_retries, session=session,
+                                                   refresh=refresh, validators=validators)
+        except NotFound:
+            log.info("Season does not exist", extra={'club': club, 'season': season})
+            raise
+        except FetchFailure as failure:
+            log.warning("Failed to get page 1", extra={'club': club, 'season': season, 'kind': failure.kind})
+            raise
+
+        if incremental and validators_match(previous, validators):
+            log.info("ETag/Last-Modified unchanged since last run, nothing to do",
+                     extra={'club': club, 'season': season})
+            job_store.save_fingerprint(club, season, previous['table_hash'], previous['players'],
+                                       changed=False, **validators)
+            if on_written is not None:
+                on_written()
+            return True
 
-    while True:
-        print(f"    📄 Processing page {current_page}...")
+        # Parse the first page once for players, pagination and debug checks
+        page = get_pipeline().parse(html_content)
+    else:
+        log.debug("Reusing page 1 fetched during season discovery", extra={'club': club, 'season': season})
+        html_content, page = first_page
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Page structure", extra={'club': club, 'season': season, 'table': page['has_table'],
+                                           'player_links': page['player_links'], 'headers': page['headers']})
 
-        # Use FlareSolverr to bypass Cloudflare with retry logic
-        html_content = scrape_with_flaresolverr(url, max_retries=max_retries)
+    players_by_page = {1: page['players']}
 
-        if not html_content:
-            print(f"    ❌ Failed to get content for page {current_page} after {max_retries} attempts")
+    # Every other page linked from page 1 is fetched in parallel under the shared rate limit
+    extra_pages = [number for number in page['pagination'] if number > 1]
+    if extra_pages:
+        players_by_page.update(fetch_extra_pages(club, season, base_url, extra_pages, max_retries,
+                                                 refresh=refresh))
 
-            # If this is the first page and we failed, the season might not exist
-            if current_page == 1:
-                print(f"    ⚠️  Season {season} might not exist for {club}")
-                return False
-            else:
-                # If we failed on a later page, we still have some data
-                print(f"    ⚠️  Failed on page {current_page}, but we have data from previous pages")
-                break
-
-        # Debug: Check what's in the content
-        content_lower = html_content.lower()
-        has_table = "table" in content_lower
-        has_player_links = "/appearances/" in content_lower
-        has_club_name = club.replace('-', ' ').lower() in content_lower
-        has_appearances = "appearances" in content_lower
-
-        print(f"    🔍 Debug - Table: {has_table}, Player links: {has_player_links}, Club: {has_club_name}, Appearances: {has_appearances}")
-
-        # Extract players with appearances data
-        page_players = extract_players_with_appearances(html_content)
-        print(f"    👥 Extracted {len(page_players)} players from page {current_page}")
-
-        # Add to master list
-        all_players.extend(page_players)
-
-        # Check for more pages
-        if current_page == 1:  # Only check pagination on first page
-            next_pages = check_for_pagination(html_content)
-
-            if next_pages and max(next_pages) > current_page:
-                # Move to next page
-                current_page += 1
-                url = f"{base_url}?page={current_page}"
-                print(f"    ⏭️  Moving to page {current_page}...")
-                time.sleep(3)  # Small delay between pages
-            else:
-                # No more pages
-                break
-        else:
-            # We've already processed additional pages
-            break
+    # Merge in page order, dropping duplicates (by player name)
+    unique_players = merge_pages(players_by_page)
 
-    # Remove duplicates (by player name)
-    unique_players = []
-    seen_names = set()
+    # Save the combined data from all pages; html_length is page 1's
+    if unique_players:
+        job_store.add_players(unique_players)  # Player pages are fetched once each, after the club-seasons
+        table_hash = players_fingerprint(unique_players)
+        if incremental and previous and previous['table_hash'] == table_hash:
+            log.info("Player table unchanged since last run, nothing written",
+                     extra={'club': club, 'season': season, 'players': len(unique_players)})
+            job_store.save_fingerprint(club, season, table_hash, len(unique_players), changed=False, **validators)
+            if on_written is not None:
+                on_written()
+            return True
 
-    for player in all_players:
-        if player['name'] not in seen_names:
-            seen_names.add(player['name'])
-            unique_players.append(player)
+        def written():
+            job_store.save_fingerprint(club, season, table_hash, len(unique_players), changed=True, **validators)
+            if on_written is not None:
+                on_written()
 
-    # Save the combined data from all pages
-    if unique_players:
-        print(f"    ✅ Total unique players across all pages: {len(unique_players)}")
-        save_club_season_data(club, season, unique_players, html_content)
-        print(f"    🎉 SUCCESS! Found {len(unique_players)} players")
+        get_pipeline().write(club, season, unique_players, len(html_content), on_written=written)
+        log.info("Queued players for writing", extra={'club': club, 'season': season, 'players': len(unique_players),
+                                         'pages': len(players_by_page)})
         return True
     elif len(html_content) > 10000:
-        # Save for debugging even if no players found
-        print(f"    ⚠️  Large content but no players - saving for debug")
-        save_club_season_data(club, season, [], html_content)
-
-        # Check if we're on an error page or wrong page
-        if "not found" in content_lower or "error" in content_lower:
-            print(f"    ❌ Appears to be an error page")
-            return False
-        elif "verify you are human" in content_lower:
-            print(f"    ❌ Still on verification page - FlareSolverr couldn't solve")
-            return False
-        else:
-            print(f"    ⚠️  Unknown page content - check debug files")
-            return False
+        log.warning("Large page but no players", extra={'club': club, 'season': season, 'chars': len(html_content)})
+        get_pipeline().write(club, season, [], len(html_content))
+
+        # Scanning the whole document only serves the debug log
+        if log.isEnabledFor(logging.DEBUG):
+            content_lower = html_content.lower()
+            verdict = 'error page' if "not found" in content_lower or "error" in content_lower else 'unknown content'
+            log.debug("Page without players", extra={'club': club, 'season': season, 'verdict': verdict})
+        return False
     else:
-        print(f"    ❌ Content too small: {len(html_content)} chars")
+        log.warning("Content too small", extra={'club': club, 'season': season, 'chars': len(html_content)})
         return False
 
-def main():
-    """Simplified main scraping function - PLAYERS AND APPEARANCES ONLY"""
-    print("🚀 ULTIMATE FOOTBALL WEB PAGES SCRAPER 2025 - SIMPLIFIED")
-    print("=" * 80)
-    print("🎯 Extracting PLAYER NAMES and APPEARANCES from ALL clubs")
-    print("📄 Pagination support for multiple pages")
-    print("🔍 Dynamic season detection (only available seasons)")
-    print("📊 Simple and accurate appearances extraction (NO GOALS)")
-    print("🔥 FlareSolverr + Simplified parsing for reliability")
-
-    ensure_output_dir()
-
-    # Setup FlareSolverr with enhanced reliability
-    flaresolverr_available = setup_flaresolverr()
-    if not flaresolverr_available:
-        print("❌ FlareSolverr not available - cannot proceed")
-        return
-
-    # Clean up any existing sessions from previous runs
-    print("🧹 Cleaning up any existing sessions...")
-    cleanup_flaresolverr_sessions()
-
-    # Verify FlareSolverr is truly ready with a test request
-    print("🔍 Verifying FlareSolverr with test request...")
-    test_html = scrape_with_flaresolverr("https://httpbin.org/html", max_retries=2)
-    if not test_html or len(test_html) < 100:
-        print("⚠️  FlareSolverr test failed, restarting container...")
-        if not restart_flaresolverr_container():
-            print("❌ Failed to restart FlareSolverr - cannot proceed")
-            return
+def discover_club(club: str) -> List[str]:
+    """Crawl job for one club: discover its seasons once, then return the seasons still to scrape"""
+    job_store = get_job_store()
+
+    if not job_store.needs_discovery(club):
+        if job_store.known_seasons(club):
+            record_club_slug(club, found=True)  # Discovered by a run from before slugs were confirmed
+        seasons = job_store.open_seasons(club)
+        log.info("Seasons already discovered",
+                 extra={'club': club, 'known': len(job_store.known_seasons(club) or []), 'open': len(seasons)})
+        return seasons
+
+    # Dynamically discover available seasons for this club
+    job_store.mark_running(club, DISCOVERY_SEASON, DISCOVERY_PAGE)
+    first_page = None
+    seasons = None
+    failure = None
+    if DERIVE_SEASONS_FROM_FIRST_PAGE:
+        # The current season's page carries the same season <select> as /appearances,
+        # so one fetch serves as both the season index and the current season's data
+        url = f"{BASE_URL}/{club}/appearances/{CURRENT_SEASON}"
+        log.info("Discovering seasons", extra={'club': club, 'url': url})
+        try:
+            html_content = fetch_with_flaresolverr(url)
+            first_page = (html_content, get_pipeline().parse(html_content))
+            seasons = seasons_from_page(first_page[1])
+        except NotFound:
+            log.info("No current-season page, falling back to the season index",
+                     extra={'club': club, 'season': CURRENT_SEASON})
+        except FetchFailure as e:
+            failure = e
+
+    if seasons is None and failure is None:
+        url = f"{BASE_URL}/{club}/appearances"
+        try:
+            seasons = discover_available_seasons(club)
+        except FetchFailure as e:
+            failure = e
+
+    if isinstance(failure, NotFound):
+        log.warning("Club page not found, skipping club", extra={'club': club})
+        record_club_slug(club, found=False)
+        job_store.mark_not_found(club, DISCOVERY_SEASON, DISCOVERY_PAGE, str(failure))
+        remember_empty(club, DISCOVERY_SEASON, 'not_found')
+        return []
+    if failure is not None:
+        log.warning("Failed to get club page, using the current season until discovery succeeds",
+                    extra={'club': club, 'kind': failure.kind})
+        job_store.mark_failed(club, DISCOVERY_SEASON, DISCOVERY_PAGE, f"club page fetch failed: {failure}",
+                              outcome=failure.kind)
+        seasons = [CURRENT_SEASON]
     else:
-        print("✅ FlareSolverr test successful - ready to scrape!")
-
-    # Load clubs
-    clubs = load_clubs()
-    if not clubs:
-        print("❌ No clubs to process")
-        return
+        record_club_slug(club, found=True)
+        job_store.save_seasons(club, seasons, url)
+        job_store.mark_done(club, DISCOVERY_SEASON, DISCOVERY_PAGE)
+        job_store.forget_empty(club, DISCOVERY_SEASON)
+
+    job_store.add_seasons(club, seasons)
+    open_seasons = job_store.open_seasons(club)
+    if first_page is not None and CURRENT_SEASON in open_seasons:
+        # Handed to the current season's job so it does not fetch the page again
+        with _prefetched_lock:
+            _prefetched_pages[(club, CURRENT_SEASON)] = first_page
+    return open_seasons
+
+def refresh_club(club: str) -> List[str]:
+    """Discovery step of an incremental run: only the current season, unless it is known to be empty"""
+    empty = get_job_store().known_empty(club)
+    if DISCOVERY_SEASON in empty or CURRENT_SEASON in empty:
+        log.info("Current season known to be empty, skipping", extra={'club': club, 'season': CURRENT_SEASON})
+        return []
+    return [CURRENT_SEASON]
 
-    print(f"\n📊 Processing {len(clubs)} clubs with dynamic season detection")
+def scrape_season_job(club: str, season: str, incremental: bool = False) -> bool:
+    """Crawl job for one club-season, recording its outcome in the job store"""
+    job_store = get_job_store()
+    job_store.mark_running(club, season)
+    with _prefetched_lock:
+        first_page = _prefetched_pages.pop((club, season), None)
+    recheck = job_store.recheck_due(club, season)
 
-    # Statistics
-    total_completed = 0
-    total_successful = 0
-    failed_jobs = []
+    def finish():
+        job_store.mark_done(club, season)
+        job_store.forget_empty(club, season)
 
-    start_time = time.time()
+    try:
+        # Done only once the writer has flushed the players to the sinks
+        success = scrape_club_season(club, season, max_retries=3, first_page=first_page,  # Increased retries
+                                     incremental=incremental, on_written=finish, recheck=recheck)
+    except FetchFailure as failure:
+        record_fetch_failure(club, season, 1, failure)
+        if isinstance(failure, NotFound):
+            remember_empty(club, season, 'not_found')
+        return False
+    except Exception as e:
+        job_store.mark_failed(club, season, error=f"{type(e).__name__}: {e}")
+        raise
+
+    if not success:
+        job_store.mark_failed(club, season, error="no players extracted", outcome='no_players')
+        remember_empty(club, season, 'no_players')
+    return success
+
+def scrape_player_job(player_id: str, player_url: str, name: str) -> bool:
+    """Player-detail job: fetch one player's page and store their career rows in the player index"""
+    job_store = get_job_store()
+    job_store.mark_player(player_id, RUNNING)
+    url = urljoin(BASE_URL, player_url)
+    try:
+        html_content = fetch_with_flaresolverr(url)
+    except FetchFailure as failure:
+        log.warning("Failed to get player page", extra={'player_id': player_id, 'kind': failure.kind})
+        job_store.mark_player(player_id, NOT_FOUND if isinstance(failure, NotFound) else FAILED,
+                              f"{failure.kind}: {failure}")
+        return False
 
-    # Process each club using dynamic season detection
-    for club_idx, club in enumerate(clubs):
-        print(f"\n🏟️  Club {club_idx + 1}/{len(clubs)}: {club}")
-        print(f"{'='*60}")
+    try:
+        parsed = get_pipeline().parse_player(html_content)
+        get_player_index().save(player_id, parsed['name'] or name, url, parsed['career'])
+    except Exception as e:
+        log.exception("Error indexing player page", extra={'player_id': player_id})
+        job_store.mark_player(player_id, FAILED, f"{type(e).__name__}: {e}")
+        return False
 
-        try:
-            # Check FlareSolverr health before processing each club
-            if not check_flaresolverr_health():
-                print(f"    ⚠️  FlareSolverr unhealthy before processing {club}, restarting...")
-                if not restart_flaresolverr_container():
-                    print(f"    ❌ Failed to restart FlareSolverr for {club}, skipping...")
-                    continue
+    job_store.mark_player(player_id, DONE)
+    log.debug("Indexed player", extra={'player_id': player_id, 'career_rows': len(parsed['career'])})
+    return True
 
-                # Give it a moment to stabilize
-                time.sleep(5)
+def crawl_players() -> Dict[str, int]:
+    """Player-detail stage: every player job still open, on CRAWL_WORKERS threads"""
+    players = get_job_store().open_players()
+    if not players:
+        return {'players': 0, 'indexed': 0}
 
-            # Convert club name to URL format
-            club_url = club.lower().replace(' ', '-').replace('_', '-')
+    log.info("Fetching player pages", extra={'players': len(players), 'workers': CRAWL_WORKERS})
+    pool = ThreadPoolExecutor(max_workers=CRAWL_WORKERS, thread_name_prefix="player")
+    try:
+        indexed = sum(pool.map(lambda job: scrape_player_job(*job), players))
+    except KeyboardInterrupt:
+        log.warning("Interrupted by user, cancelling player jobs")
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+    return {'players': len(players), 'indexed': indexed}
+
+def record_fetch_failure(club: str, season: str, page: int, failure: FetchFailure):
+    """Store a page's fetch failure as the job outcome; missing pages are closed for good"""
+    if isinstance(failure, NotFound):
+        get_job_store().mark_not_found(club, season, page, str(failure))
+    else:
+        get_job_store().mark_failed(club, season, page, f"{failure.kind}: {failure}", outcome=failure.kind)
+
+def start_metrics() -> MetricsExporter:
+    """Start the periodic metrics snapshot (and the Prometheus endpoint when METRICS_PORT is set)"""
+    exporter = MetricsExporter(REGISTRY, METRICS_SNAPSHOT_FILE, interval=METRICS_SNAPSHOT_INTERVAL)
+    exporter.start()
+    log.info("Writing metrics snapshots", extra={'path': METRICS_SNAPSHOT_FILE, 'interval': METRICS_SNAPSHOT_INTERVAL})
+    if METRICS_PORT:
+        serve_prometheus(REGISTRY, METRICS_PORT)
+        log.info("Serving Prometheus metrics", extra={'url': f"http://0.0.0.0:{METRICS_PORT}/metrics"})
+    return exporter
+
+def main(incremental: bool = False, player_details: bool = PLAYER_DETAILS):
+    """Simplified main scraping function - PLAYERS AND APPEARANCES ONLY
+
+    `incremental` refreshes only CURRENT_SEASON for every club and writes only changed player tables.
+    `player_details` then fetches every player page not indexed yet (one extra request per player).
+    """
+    run_started = time.time()
+    log.info("Football Web Pages scraper starting",
+             extra={'incremental': incremental, 'club_lists': CLUB_LIST_FILES, 'backends': len(FLARESOLVERR_URLS),
+                    'workers': CRAWL_WORKERS})
 
-            # Dynamically discover available seasons for this club
-            available_seasons = discover_available_seasons(club_url)
+    ensure_output_dir()
+    metrics_exporter = None
+    try:
+        # Fork the parser processes before the FlareSolverr client, metrics and crawl threads exist
+        pipeline = get_pipeline()
+        pipeline.start()
+
+        # Setup FlareSolverr with enhanced reliability
+        flaresolverr_available = setup_flaresolverr()
+        if not flaresolverr_available:
+            log.error("FlareSolverr not available - cannot proceed")
+            return
 
-            if not available_seasons:
-                print(f"    ❌ No seasons found for {club} - skipping")
-                continue
+        # Clean up any existing sessions from previous runs
+        cleanup_flaresolverr_sessions()
+
+        # Every backend must answer before the crawl; the circuit breakers take over from here
+        if not all(check_flaresolverr_health(backend) for backend in get_balancer().backends):
+            log.warning("FlareSolverr not responding, restarting unhealthy containers")
+            if not restart_unhealthy_backends():
+                log.error("Failed to restart FlareSolverr - cannot proceed")
+                return
+        log.info("FlareSolverr ready to scrape")
+
+        # Load clubs (resolving their slugs through the club index) and resume from the job store
+        refresh_club_index()
+        clubs = load_clubs()
+        if not clubs:
+            log.error("No clubs to process")
+            return
 
-            print(f"    📅 Processing {len(available_seasons)} available seasons...")
-
-            # Process each available season for this club
-            club_successful = 0
-            club_completed = 0
-
-            for season in available_seasons:
-                try:
-                    # Periodic health check every few seasons
-                    if club_completed > 0 and club_completed % 3 == 0:
-                        if not check_flaresolverr_health():
-                            print(f"    🔄 Periodic health check failed, restarting FlareSolverr...")
-                            restart_flaresolverr_container()
-                            time.sleep(5)
-
-                    success = scrape_club_season(club, season, max_retries=3)  # Increased retries
-                    club_completed += 1
-                    total_completed += 1
-
-                    if success:
-                        club_successful += 1
-                        total_successful += 1
-                    else:
-                        failed_jobs.append(f"{club}-{season}")
-
-                    # Progress update
-                    print(f"    📈 Club progress: {club_completed}/{len(available_seasons)} seasons")
-
-                    # Delay between seasons to be respectful
-                    if season != available_seasons[-1]:  # Not the last season
-                        delay = random.uniform(10, 20)  # Increased delay for stability
-                        print(f"    ⏳ Waiting {delay:.1f}s before next season...")
-                        time.sleep(delay)
-
-                except KeyboardInterrupt:
-                    print(f"\n⚠️  Interrupted by user")
-                    return
-                except Exception as e:
-                    print(f"    ✖ Unexpected error for {club}-{season}: {e}")
-                    club_completed += 1
-                    total_completed += 1
-
-            print(f"  📊 Club {club}: {club_successful}/{len(available_seasons)} seasons successful")
-
-            # Longer delay between clubs
-            if club_idx < len(clubs) - 1:
-                delay = random.uniform(20, 40)
-                print(f"    ⏳ Waiting {delay:.1f}s before next club...")
-                time.sleep(delay)
+        job_store = get_job_store()
+        interrupted = job_store.reset_interrupted()
+        if interrupted:
+            log.info("Re-queued jobs interrupted by the previous run", extra={'jobs': interrupted})
+        job_store.add_clubs(clubs)
+        seeded = job_store.seed_empty_clubs(load_no_data_clubs(), 'no_data_list',
+                                            NEGATIVE_CACHE_RECHECK['no_data_list'])
+        if seeded:
+            log.info("Seeded the negative cache", extra={'clubs': seeded, 'file': NO_DATA_CLUBS_FILE})
+        rechecks = job_store.reopen_rechecks()
+        if rechecks:
+            log.info("Re-checking club-seasons whose negative-cache entry expired", extra={'club_seasons': rechecks})
+        skipped = job_store.negative_summary()
+        if skipped:
+            log.info("Negative cache skips", extra={'skipped': dict(skipped)})
+        if incremental:
+            log.info("Incremental refresh of the current season",
+                     extra={'season': CURRENT_SEASON, 'clubs': len(clubs), 'job_store': JOB_DB_FILE})
+            discover, scrape = refresh_club, partial(scrape_season_job, incremental=True)
+        else:
+            clubs = job_store.clubs_with_work(clubs)
+            if not clubs:
+                log.info("Every club-season in the job store is already done")
+                return
+            log.info("Processing clubs with remaining work", extra={'clubs': len(clubs), 'job_store': JOB_DB_FILE})
+            discover, scrape = discover_club, scrape_season_job
+        log.info("Crawl budget", extra={'workers': CRAWL_WORKERS,
+                                        'pages_per_minute': round(RATE_LIMIT_PER_SECOND * 60, 1)})
+
+        scheduler = CrawlScheduler(
+            discover=discover,
+            scrape=scrape,
+            workers=CRAWL_WORKERS
+        )
+        metrics_exporter = start_metrics()
+        log.info("Pipeline stages", extra={'fetchers': CRAWL_WORKERS, 'page_fetchers': PAGE_FETCH_WORKERS,
+                                           'parsers': PARSE_WORKERS, 'parse_queue': PARSE_QUEUE_SIZE,
+                                           'write_queue': WRITE_QUEUE_SIZE})
+        stats = scheduler.run(clubs)
+        player_stats = crawl_players() if player_details else None
+        pipeline.close()  # Every queued club-season is written (and its job marked done) before the summary
+        report_run(stats, player_stats, run_started)
+    except KeyboardInterrupt:  # Ctrl-C, or SIGTERM through handle_sigterm
+        log.warning("Interrupted, writing queued club-seasons before exit")
+    finally:
+        shutdown(metrics_exporter)
+
+def report_run(stats: dict, player_stats: Optional[Dict[str, int]], run_started: float):
+    """Log the end-of-run summary of the crawl and of every stage"""
+    job_store = get_job_store()
+    total_completed = stats['completed']
+    total_successful = stats['successful']
+    failed_jobs = stats['failed_jobs']
 
-        except Exception as e:
-            print(f"    ❌ Error processing club {club}: {e}")
-            continue
-    
     # Final statistics
-    elapsed = time.time() - start_time
-    print(f"\n{'='*80}")
-    print(f"🏁 ENHANCED SCRAPING COMPLETED!")
-    print(f"⏱️  Total time: {elapsed / 60:.1f} minutes")
-    print(f"📊 Total club-seasons processed: {total_completed}")
-    print(f"✅ Successful extractions: {total_successful}")
-    print(f"❌ Failed extractions: {total_completed - total_successful}")
-    print(f"📁 Data saved to: {OUTPUT_DIR}/")
+    checked, changed = job_store.fingerprint_summary(since=run_started)
+    html_cache = get_html_cache()
+    log.info("Scraping completed", extra={
+        'minutes': round(stats['elapsed'] / 60, 1),
+        'club_seasons': total_completed,
+        'successful': total_successful,
+        'failed': total_completed - total_successful,
+        'success_rate': round(total_successful / total_completed * 100, 1) if total_completed else 0.0,
+        'output_dir': OUTPUT_DIR,
+        'job_states': dict(job_store.summary()),
+        'job_outcomes': dict(job_store.outcomes()),
+        'tables_checked': checked,
+        'tables_changed': changed,
+        'cache_hits': html_cache.hits,
+        'cache_misses': html_cache.misses,
+        'cache_mb': round(html_cache.total_bytes / 1024 ** 2),
+        'solve_seconds': round(SOLVE_SECONDS.total()),
+        'parse_seconds': round(PARSE_SECONDS.total(), 1),
+        'write_seconds': round(WRITE_SECONDS.total(), 1),
+        'fetches': get_coalescer().stats(),
+        'player_pages': player_stats,
+        'player_jobs': dict(job_store.player_summary()),
+    })
+    get_session_pool().report()
+    get_balancer().report()
+    get_pipeline().report()
 
     if failed_jobs:
-        print(f"\n❌ Failed jobs ({len(failed_jobs)}):")
-        for job in failed_jobs[:10]:  # Show first 10
-            print(f"   • {job}")
-        if len(failed_jobs) > 10:
-            print(f"   ... and {len(failed_jobs) - 10} more")
-
-    if total_successful > 0:
-        success_rate = (total_successful / total_completed * 100) if total_completed > 0 else 0
-        print(f"\n🎉 SUCCESS! Extracted player data from {total_successful} club-seasons")
-        print(f"� Success rate: {success_rate:.1f}%")
-        print(f"�💡 Check {OUTPUT_DIR}/ for all player names and appearances data")
-        print(f"🔧 Features used: Dynamic seasons, Pagination, Simplified appearances extraction")
-        print(f"📊 Data format: Player Name - X apps (simple and reliable)")
-    else:
-        print(f"\n❌ No data extracted. Check your clubs.txt and network connection.")
+        log.warning("Failed jobs", extra={'count': len(failed_jobs), 'first': failed_jobs[:10]})
+    if not total_successful:
+        log.error("No data extracted. Check the clubs file and network connection.")
+
+def shutdown(metrics_exporter: Optional[MetricsExporter] = None):
+    """Close whatever this run opened, in dependency order, on every exit path
+
+    The pipeline goes first: draining it writes the queued club-seasons and runs their job store
+    callbacks, which need the sink and the job store still open.
+    """
+    if _pipeline is not None:
+        _pipeline.close()
+    if _output_sink is not None:
+        _output_sink.close()
+    if _session_pool is not None:
+        _session_pool.close()
+    if _balancer is not None:
+        _balancer.close()
+    if metrics_exporter is not None:
+        metrics_exporter.stop()
+    if _page_archive is not None:
+        _page_archive.close()
+    if _player_index is not None:
+        _player_index.close()
+    if _job_store is not None:
+        _job_store.close()
+
+def handle_sigterm(signum, frame):
+    """Turn SIGTERM (a Render deploy or restart) into the KeyboardInterrupt path that drains the pipeline"""
+    raise KeyboardInterrupt
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Football Web Pages players and appearances scraper")
+    parser.add_argument('--incremental', action='store_true',
+                        help=f"refresh only {CURRENT_SEASON} and write only club-seasons whose player table changed")
+    parser.add_argument('--player-details', action='store_true', default=PLAYER_DETAILS,
+                        help="after the club-seasons, fetch each player's page once and index their career")
+    parser.add_argument('--log-level', default=LOG_LEVEL, help="DEBUG enables per-page detail (default: %(default)s)")
+    parser.add_argument('--log-format', default=LOG_FORMAT, choices=['json', 'text'])
+    args = parser.parse_args()
+    setup_logging(args.log_level, args.log_format)
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    try:
+        main(incremental=args.incremental, player_details=args.player_details)
+    finally:
+        stop_logging()